@@ -0,0 +1,53 @@
+"""
+Run the benchmarks.
+
+    python -m benchmarks [--quick] [--only NAME ...] [--save PATH]
+                         [--compare PATH] [--max-ratio RATIO]
+
+With --compare, exits with status 1 if any operation is more than --max-ratio times
+slower than in the saved baseline.
+"""
+
+import argparse
+import sys
+
+from benchmarks.cases import CASES
+from benchmarks.runner import DEFAULT_MAX_RATIO, load, regressions, run, save
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--quick", action="store_true", help="use smaller sizes")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="cases to run")
+    parser.add_argument("--save", metavar="PATH", help="save results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to compare with")
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=DEFAULT_MAX_RATIO,
+        help="slowdown relative to the baseline that counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    cases = CASES
+    if args.only:
+        unknown = set(args.only) - {case.name for case in CASES}
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+        cases = [case for case in CASES if case.name in args.only]
+
+    results = run(cases, quick=args.quick)
+    if args.save:
+        save(results, args.save)
+
+    if args.compare:
+        found = regressions(load(args.compare), results, args.max_ratio)
+        for name, size, ratio in found:
+            print(f"REGRESSION {name} size {size}: {ratio:.2f}x slower than baseline")
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import random
+from typing import Callable
+
+from twistribution.binomial import Binomial
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+from twistribution.poisson_binomial import PoissonBinomial
+from twistribution.uniform import Uniform
+
+
+class Case:
+    """
+    An operation to time at a range of input sizes.
+
+    setup(size) does any preparation that shouldn't be timed and returns the
+    zero-argument callable that is timed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        setup: Callable[[int], Callable[[], object]],
+        sizes: list[int],
+        quick_sizes: list[int],
+    ):
+        self.name = name
+        self.setup = setup
+        self.sizes = sizes
+        self.quick_sizes = quick_sizes
+
+
+def _uniform_discrete(size: int) -> Discrete:
+    return Discrete({k: 1 / size for k in range(size)})
+
+
+def _random_discrete(size: int, seed: int) -> Discrete:
+    rng = random.Random(seed)
+    values = sorted(rng.random() * size for _ in range(size))
+    return Discrete({v: 1 / size for v in values})
+
+
+def _discrete_add_lattice(size: int):
+    d = _uniform_discrete(size)
+    return lambda: d + d
+
+
+def _discrete_add_general(size: int):
+    d1 = _random_discrete(size, 1)
+    d2 = _random_discrete(size, 2)
+    return lambda: d1 + d2
+
+
+def _discrete_compare(size: int):
+    d1 = _random_discrete(size, 1)
+    d2 = _random_discrete(size, 2)
+    return lambda: (d1 < d2, d1 <= d2)
+
+
+def _discrete_construct(size: int):
+    probabilities = {k: 1 / size for k in range(size)}
+    return lambda: Discrete(probabilities)
+
+
+def _poisson_cdf(size: int):
+    # a new instance each time, so the cost of building its table is included
+    return lambda: Poisson(size).cdf(size)
+
+
+def _poisson_to_discrete(size: int):
+    return lambda: Poisson(size).to_discrete()
+
+
+def _binomial_cdf(size: int):
+    # a new instance each time, so the cost of building its table is included
+    return lambda: Binomial(size, 0.3).cdf(0.3 * size)
+
+
+def _poisson_binomial_cdf(size: int):
+    rng = random.Random(1)
+    probabilities = [rng.random() for _ in range(size)]
+    return lambda: PoissonBinomial(probabilities).cdf(size / 2)
+
+
+def _normal_compare(size: int):
+    pairs = [(Normal(i, 1 + i % 3), Normal(-i, 2)) for i in range(size)]
+    return lambda: [a < b for a, b in pairs]
+
+
+def _uniform_compare(size: int):
+    pairs = [(Uniform(0, 1 + i), Uniform(i % 5, 10)) for i in range(size)]
+    return lambda: [a < b for a, b in pairs]
+
+
+CASES = [
+    Case(
+        "discrete_add_lattice",
+        _discrete_add_lattice,
+        sizes=[1000, 4000, 16000],
+        quick_sizes=[250, 1000],
+    ),
+    Case(
+        "discrete_add_general",
+        _discrete_add_general,
+        sizes=[50, 100, 200, 400],
+        quick_sizes=[25, 50],
+    ),
+    Case(
+        "discrete_compare",
+        _discrete_compare,
+        sizes=[1000, 10000, 100000],
+        quick_sizes=[1000, 4000],
+    ),
+    Case(
+        "discrete_construct",
+        _discrete_construct,
+        sizes=[1000, 10000, 100000],
+        quick_sizes=[1000, 4000],
+    ),
+    Case(
+        "poisson_cdf",
+        _poisson_cdf,
+        sizes=[100, 10000, 1000000],
+        quick_sizes=[100, 10000],
+    ),
+    Case(
+        "poisson_to_discrete",
+        _poisson_to_discrete,
+        sizes=[100, 10000, 1000000],
+        quick_sizes=[100, 10000],
+    ),
+    Case(
+        "binomial_cdf",
+        _binomial_cdf,
+        sizes=[100, 10000, 1000000],
+        quick_sizes=[100, 10000],
+    ),
+    Case(
+        "poisson_binomial_cdf",
+        _poisson_binomial_cdf,
+        sizes=[100, 1000, 10000],
+        quick_sizes=[100, 1000],
+    ),
+    Case(
+        "normal_compare",
+        _normal_compare,
+        sizes=[100, 1000, 10000],
+        quick_sizes=[100, 1000],
+    ),
+    Case(
+        "uniform_compare",
+        _uniform_compare,
+        sizes=[100, 1000, 10000],
+        quick_sizes=[100, 1000],
+    ),
+]
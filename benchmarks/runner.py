@@ -0,0 +1,84 @@
+import json
+import math
+import platform
+import timeit
+from typing import Callable
+
+from benchmarks.cases import Case
+
+DEFAULT_MAX_RATIO = 1.5
+"""How many times slower than its baseline an operation may get before failing."""
+
+
+def time_call(function: Callable[[], object], repeat: int = 3) -> float:
+    """Best time in seconds for one call of the function, over several repeats."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def fit_exponent(sizes: list[int], seconds: list[float]) -> float | None:
+    """
+    The exponent k of the best fit of seconds = c * size**k, by least squares on a
+    log-log scale, or None if there are fewer than two sizes.
+    """
+    if len(sizes) < 2:
+        return None
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(s, 1e-12)) for s in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def run(cases: list[Case], quick: bool = False, report=print) -> dict:
+    """Time every case at each of its sizes, and fit its complexity exponent."""
+    results = {}
+    for case in cases:
+        sizes = case.quick_sizes if quick else case.sizes
+        seconds = []
+        for size in sizes:
+            seconds.append(time_call(case.setup(size)))
+            report(f"{case.name:<24} size {size:>9}: {seconds[-1]:.3e}s")
+        exponent = fit_exponent(sizes, seconds)
+        if exponent is not None:
+            report(f"{case.name:<24} exponent {exponent:.2f}")
+        results[case.name] = {
+            "sizes": sizes,
+            "seconds": seconds,
+            "exponent": exponent,
+        }
+    return {"python": platform.python_version(), "results": results}
+
+
+def save(results: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def regressions(
+    baseline: dict, results: dict, max_ratio: float = DEFAULT_MAX_RATIO
+) -> list[tuple[str, int, float]]:
+    """
+    (case, size, ratio) for every measurement that is more than max_ratio times
+    slower than the baseline's measurement of the same case and size.
+    """
+    found = []
+    for name, result in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        previous_seconds = dict(zip(previous["sizes"], previous["seconds"]))
+        for size, seconds in zip(result["sizes"], result["seconds"]):
+            if size in previous_seconds:
+                ratio = seconds / previous_seconds[size]
+                if ratio > max_ratio:
+                    found.append((name, size, ratio))
+    return found
@@ -0,0 +1,135 @@
+import pytest
+
+from tests.utils_for_testing import close
+from twistribution.approximation import (
+    approximation,
+    berry_esseen_bound,
+    error_budget,
+    set_error_budget,
+)
+from twistribution.binomial import Binomial
+from twistribution.cache import caching
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+from twistribution.poisson_binomial import PoissonBinomial
+from twistribution.profiling import record
+
+DIE = Discrete({k: 1 / 6 for k in range(1, 7)})
+
+
+def paths(recording):
+    return {
+        path for stats in recording.operations.values() for path in stats.paths.keys()
+    }
+
+
+def test_budget_switch():
+    assert error_budget() is None
+    with approximation(0.01):
+        assert error_budget() == 0.01
+    assert error_budget() is None
+    with pytest.raises(ValueError):
+        set_error_budget(-0.1)
+    with pytest.raises(ValueError):
+        set_error_budget(2)
+
+
+def test_berry_esseen_bound():
+    # a fair coin has variance 1/4 and third absolute central moment 1/8
+    assert close(berry_esseen_bound(100 / 4, 100 / 8), 0.56 * 0.1)
+    assert berry_esseen_bound(0, 0) == float("inf")
+    assert berry_esseen_bound(1, 10) == 1.0
+
+
+def test_exact_without_budget():
+    assert isinstance(DIE.sum_iid(100), Discrete)
+    with record() as recording:
+        Poisson(1000) < Poisson(1010)
+    assert "normal approximation" not in paths(recording)
+
+
+def test_sum_iid_within_budget_is_normal():
+    exact = DIE.sum_iid(1000)
+    with approximation(0.03), record() as recording:
+        approximate = DIE.sum_iid(1000)
+    assert "normal approximation" in paths(recording)
+    assert approximate == Normal(3500, (1000 * 35 / 12) ** 0.5)
+    for x in range(3300, 3700, 10):
+        assert abs((exact <= x).p - approximate.cdf(x + 0.5)) < 0.03
+
+
+def test_sum_iid_outside_budget_is_exact():
+    with approximation(0.01):
+        assert isinstance(DIE.sum_iid(1000), Discrete)
+        assert isinstance(DIE.sum_iid(10), Discrete)
+
+
+def test_repeated_addition_switches_once_enough_terms_are_added():
+    with approximation(0.05):
+        total = DIE
+        terms = 1
+        while isinstance(total, Discrete):
+            total = total + DIE
+            terms += 1
+    # the bound for n dice is 0.56 * 1.28 / sqrt(n)
+    assert 200 < terms < 230
+    assert close(total.mean, 3.5 * terms)
+
+
+def test_comparisons_within_budget():
+    # with a zero budget, sums are exact but remember how many terms went into them
+    with approximation(0):
+        dice = DIE.sum_iid(800)
+    cases = [
+        (Poisson(10_000), Poisson(10_100)),
+        (Binomial(100_000, 0.3), Binomial(100_000, 0.301)),
+        (
+            PoissonBinomial([0.2, 0.7] * 5000),
+            PoissonBinomial([0.4, 0.5] * 5000),
+        ),
+        (dice, dice + 5),
+    ]
+    for a, b in cases:
+        exact = [(a < b).p, (a <= b).p]
+        with approximation(0.02), record() as recording:
+            approximate = [(a < b).p, (a <= b).p]
+        assert "normal approximation" in paths(recording)
+        for e, p in zip(exact, approximate):
+            assert abs(e - p) < 0.02
+
+
+def test_comparisons_with_numbers_within_budget():
+    for distribution, x in (
+        (Poisson(1e6), 1_000_500),
+        (Binomial(10**7, 0.3), 3_000_000),
+        (PoissonBinomial([0.5] * 10_000), 5000),
+    ):
+        exact = [(distribution < x).p, (distribution <= x).p, (distribution > x).p]
+        with approximation(0.01), record() as recording:
+            approximate = [
+                (distribution < x).p,
+                (distribution <= x).p,
+                (distribution > x).p,
+            ]
+        assert "normal approximation" in paths(recording)
+        for e, p in zip(exact, approximate):
+            assert abs(e - p) < 0.01
+
+
+def test_comparisons_outside_budget_are_exact():
+    with approximation(0.001), record() as recording:
+        Poisson(2) < Poisson(3)
+        Binomial(10, 0.5) < 5
+        DIE < DIE
+        DIE.sum_iid(800) < DIE.sum_iid(800)
+    assert "normal approximation" not in paths(recording)
+
+
+def test_cached_results_depend_on_budget():
+    with caching():
+        exact = Poisson(10_000) < Poisson(10_100)
+        with approximation(0.02):
+            approximate = Poisson(10_000) < Poisson(10_100)
+        assert exact.p != approximate.p
+        assert (Poisson(10_000) < Poisson(10_100)).p == exact.p
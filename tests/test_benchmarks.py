@@ -0,0 +1,30 @@
+from benchmarks.cases import CASES
+from benchmarks.runner import fit_exponent, regressions, run
+from tests.utils_for_testing import close
+
+
+def test_fit_exponent():
+    sizes = [10, 100, 1000]
+    assert close(fit_exponent(sizes, [2e-6 * n**2 for n in sizes]), 2)
+    assert close(fit_exponent(sizes, [5e-3 * n for n in sizes]), 1)
+    assert fit_exponent([10], [1.0]) is None
+
+
+def test_regressions():
+    baseline = {"results": {"a": {"sizes": [10, 100], "seconds": [1.0, 10.0]}}}
+    results = {
+        "results": {
+            "a": {"sizes": [10, 100, 1000], "seconds": [1.2, 20.0, 100.0]},
+            "b": {"sizes": [10], "seconds": [5.0]},
+        }
+    }
+    assert regressions(baseline, results, max_ratio=1.5) == [("a", 100, 2.0)]
+    assert regressions(baseline, results, max_ratio=2.5) == []
+
+
+def test_cases_run():
+    for case in CASES:
+        case.setup(case.quick_sizes[0])()
+    results = run(CASES[:1], quick=True, report=lambda line: None)
+    result = results["results"][CASES[0].name]
+    assert len(result["seconds"]) == len(CASES[0].quick_sizes)
@@ -1,5 +1,12 @@
+import random
+
+import pytest
+
+from tests.utils_for_testing import close
 from twistribution.bernoulli import Bernoulli
+from twistribution.binomial import Binomial
 from twistribution.constant import Constant
+from twistribution.discrete import Discrete
 
 
 def test_bernoulli_mean_variance():
@@ -42,3 +49,45 @@ def test_less_than_or_equal_scalar():
     # Test P(X <= 2) = 1 for Bernoulli(p)
     assert (Bernoulli(0.7) <= 2) == Bernoulli(1), str(Bernoulli(0.7) <= 2)
     assert (Bernoulli(0.3) <= 2) == Bernoulli(1), str(Bernoulli(0.3) <= 2)
+
+
+def test_sum_iid():
+    three = Bernoulli(0.5).sum_iid(3)
+    assert three == Binomial(3, 0.5)
+    assert all(
+        close(three.pmf(k), p) for k, p in enumerate([0.125, 0.375, 0.375, 0.125])
+    )
+    ten = Bernoulli(0.3).sum_iid(10)
+    assert ten.to_discrete(0) == Discrete({0: 0.7, 1: 0.3}).sum_iid(10)
+    assert Bernoulli(0).sum_iid(5).pmf(0) == 1.0
+    assert Bernoulli(1).sum_iid(5).pmf(5) == 1.0
+    with pytest.raises(ValueError):
+        Bernoulli(0.5).sum_iid(0)
+
+
+def test_sum_iid_large_n():
+    total = Bernoulli(0.01).sum_iid(10**9)
+    assert isinstance(total, Binomial)
+    assert close(total.mean(), 10**7, tolerance=1e-6)
+    assert close(total.cdf(total.mean()), 0.5, tolerance=1e-3)
+
+
+def test_prob_lt_many_and_prob_le_many():
+    b = Bernoulli(0.3)
+    thresholds = [-1, 0, 0.5, 1, 2]
+    assert list(b.prob_lt_many(thresholds)) == [0, 0, 0.7, 0.7, 1]
+    assert list(b.prob_le_many(thresholds)) == [0, 0.7, 0.7, 1, 1]
+
+
+def test_sample():
+    draws = Bernoulli(0.3).sample(10_000, random.Random(42))
+    assert set(draws) == {0.0, 1.0}
+    assert abs(sum(draws) / len(draws) - 0.3) < 0.02
+
+
+def test_quantile():
+    b = Bernoulli(0.3)
+    assert b.quantile(0) == 0
+    assert b.quantile(0.7) == 0
+    assert b.quantile(0.71) == 1
+    assert list(b.quantile_many([0.9, 0.1])) == [1, 0]
@@ -0,0 +1,144 @@
+import math
+
+import pytest
+
+from tests.utils_for_testing import close
+from twistribution.bernoulli import Bernoulli
+from twistribution.binomial import Binomial
+from twistribution.poisson_binomial import PoissonBinomial
+
+
+def exact_pmf(n, p, k):
+    return math.comb(n, k) * p**k * (1 - p) ** (n - k)
+
+
+def test_creation():
+    b = Binomial(10, 0.3)
+    assert b.parameters() == (10, 0.3)
+    assert str(b) == "Binomial(10, 0.3)"
+    assert Binomial(5, 1 + 1e-12).p == 1.0
+
+    with pytest.raises(ValueError):
+        Binomial(0, 0.5)
+    with pytest.raises(ValueError):
+        Binomial(2.5, 0.5)
+    with pytest.raises(ValueError):
+        Binomial(10, 1.5)
+    with pytest.raises(ValueError):
+        Binomial(10, -0.1)
+
+
+def test_mean_and_variance():
+    b = Binomial(20, 0.25)
+    assert b.mean() == 5
+    assert b.variance() == 3.75
+
+
+def test_pmf_and_cdf_match_exact_values():
+    for n, p in ((1, 0.5), (10, 0.3), (50, 0.9), (200, 0.02)):
+        b = Binomial(n, p)
+        total = 0.0
+        for k in range(n + 1):
+            expected = exact_pmf(n, p, k)
+            total += expected
+            assert close(b.pmf(k), expected, 1e-13)
+            assert close(b.cdf(k), total, 1e-13)
+        assert b.pmf(-1) == b.pmf(0.5) == b.pmf(n + 1) == 0.0
+        assert b.cdf(-0.5) == 0.0
+        assert b.cdf(n) == b.cdf(math.inf) == 1.0
+
+
+def test_far_tails():
+    # 700 is about 13 standard deviations below the mean, beyond the cdf table
+    b = Binomial(2000, 0.5)
+    below = sum(math.comb(2000, k) for k in range(701)) / 2**2000
+    assert close(b.cdf(700) / below, 1, 1e-12)
+    assert close(b.pmf(700) / (math.comb(2000, 700) / 2**2000), 1, 1e-12)
+
+
+def test_degenerate_probabilities():
+    assert Binomial(5, 0).cdf(0) == 1.0
+    assert Binomial(5, 0).pmf(1) == 0.0
+    assert Binomial(5, 1).cdf(4) == 0.0
+    assert Binomial(5, 1).pmf(5) == 1.0
+    assert Binomial(5, 1).quantile(0.5) == 5
+
+
+def test_millions_of_trials():
+    b = Binomial(5_000_000, 0.37)
+    assert b.quantile(0.5) == 1_850_000
+    # the normal approximation is good to a few parts in 10^4 here
+    assert abs((b < 1_850_000).p - 0.4998) < 1e-3
+    assert close((b <= 1_860_000).p, 1, 1e-12)
+    assert len(b._cumulative_table()[1]) < 30_000
+
+
+def test_astronomically_many_trials():
+    n = 10**200
+    b = Binomial(n, 0.5)
+    assert close(b.pmf(n // 2) / math.sqrt(2 / (math.pi * n)), 1, 1e-12)
+
+
+def test_quantile():
+    b = Binomial(10, 0.3)
+    for q in (0, 0.01, 0.3, 0.5, 0.9, 0.999, 1):
+        k = b.quantile(q)
+        assert b.cdf(k) >= q
+        assert k == 0 or b.cdf(k - 1) < q
+
+
+def test_quantile_far_below_the_cdf_table():
+    # levels below the table are found by binary search, not one value at a time
+    b = Binomial(10**7, 0.3)
+    assert b.quantile(0) == 0
+    assert Binomial(5, 1).quantile(0) == 5
+    for q in [1e-300, 5e-324]:
+        k = b.quantile(q)
+        assert b.cdf(k) >= q
+        assert b.cdf(k - 1) < q
+
+
+def test_comparison_with_numbers():
+    b = Binomial(2, 0.5)
+    assert close((b < 1).p, 0.25)
+    assert close((b <= 1).p, 0.75)
+    assert close((b > 1).p, 0.25)
+    assert close((b >= 1).p, 0.75)
+    assert close((b < 1.5).p, 0.75)
+    assert all(
+        close(a, e) for a, e in zip(b.prob_lt_many([0, 1, 1.5, 3]), [0, 0.25, 0.75, 1])
+    )
+    assert all(close(a, e) for a, e in zip(b.prob_le_many([-1, 0, 2]), [0, 0.25, 1]))
+
+
+def test_comparison_with_binomial():
+    a = Binomial(30, 0.4)
+    b = Binomial(20, 0.55)
+    da, db = a.to_discrete(0), b.to_discrete(0)
+    assert close((a < b).p, (da < db).p)
+    assert close((a <= b).p, (da <= db).p)
+    assert close((a > b).p, (da > db).p)
+    assert close((a >= b).p, (da >= db).p)
+
+
+def test_addition():
+    assert Bernoulli(0.3) + Bernoulli(0.3) == Binomial(2, 0.3)
+    assert Binomial(3, 0.3) + Bernoulli(0.3) == Binomial(4, 0.3)
+    assert Bernoulli(0.3) + Binomial(3, 0.3) == Binomial(4, 0.3)
+    assert Binomial(3, 0.3) + Binomial(4, 0.3) == Binomial(7, 0.3)
+    assert Binomial(10**6, 0.3) + Binomial(10**6, 0.3) == Binomial(2 * 10**6, 0.3)
+    assert Binomial(2, 0.3).sum_iid(5) == Binomial(10, 0.3)
+
+    mixed = Binomial(2, 0.3) + Binomial(1, 0.5)
+    assert mixed == PoissonBinomial([0.3, 0.3, 0.5])
+    assert Binomial(2, 0.3) + Bernoulli(0.5) == mixed
+    assert PoissonBinomial([0.5]) + Binomial(2, 0.3) == PoissonBinomial([0.5, 0.3, 0.3])
+
+
+def test_to_discrete_and_sample():
+    b = Binomial(100, 0.2)
+    d = b.to_discrete()
+    assert close(d.mean(), 20, 1e-6)
+    assert b.to_discrete() is d
+    samples = b.sample(10_000)
+    assert abs(sum(samples) / len(samples) - 20) < 0.2
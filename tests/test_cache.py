@@ -0,0 +1,59 @@
+import pytest
+
+from twistribution import cache
+from twistribution.bernoulli import Bernoulli
+from twistribution.cache import ResultCache, caching
+from twistribution.compaction import Compaction
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+
+
+def test_cache_key_is_tolerance_aware():
+    assert Poisson(2.0).cache_key() == Poisson(2.0 + 1e-12).cache_key()
+    assert Poisson(2.0).cache_key() != Poisson(2.1).cache_key()
+    assert Normal(0, 1).cache_key() == Normal(0.0, 1.0).cache_key()
+    assert Normal(0, 1).cache_key() != Poisson(1).cache_key()
+    hash(Normal(0, 1).cache_key())
+
+
+def test_discrete_cache_key():
+    d1 = Discrete({0: 0.5, 1: 0.5})
+    d2 = Discrete({0: 0.5 + 1e-12, 1: 0.5 - 1e-12})
+    assert d1.cache_key() == d2.cache_key()
+    assert d1.cache_key() != Discrete({0: 0.25, 1: 0.75}).cache_key()
+    compacted = Discrete({0: 0.5, 1: 0.5}, compaction=Compaction(max_points=1))
+    assert d1.cache_key() != compacted.cache_key()
+
+
+def test_lru_eviction_and_statistics():
+    results = ResultCache(maxsize=2)
+    assert results.get_or_compute("a", lambda: 1) == 1
+    assert results.get_or_compute("b", lambda: 2) == 2
+    assert results.get_or_compute("a", lambda: 3) == 1
+    assert results.get_or_compute("c", lambda: 4) == 4
+    # "b" was the least recently used
+    assert results.get_or_compute("b", lambda: 5) == 5
+    assert (results.hits, results.misses, len(results)) == (1, 4, 2)
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=0)
+
+
+def test_operations_are_cached_only_inside_context():
+    d = Discrete({0: 0.5, 1: 0.5})
+    assert d + d is not d + d
+    with caching(maxsize=16) as results:
+        first = d + d
+        assert Discrete({0: 0.5, 1: 0.5}) + d is first
+        assert (d < first) is (d < first)
+        assert (Poisson(3.0) <= 2) is (Poisson(3.0) <= 2)
+        assert (Poisson(3.0) < 2) == Bernoulli(Poisson(3.0).cdf(1))
+    assert results.hits == 3
+    assert cache._active_cache is None
+
+
+def test_uncachable_arguments_are_computed():
+    with caching() as results:
+        with pytest.raises(TypeError):
+            _ = Discrete({0: 1.0}) + "not a number"
+    assert results.hits == results.misses == 0
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from tests.utils_for_testing import close
+from twistribution.compaction import Compaction
+from twistribution.discrete import Discrete
+
+
+def moments(d):
+    mean = d.mean()
+    variance = sum((k - mean) ** 2 * p for k, p in d.probabilities.items())
+    return mean, variance
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        Compaction(max_points=0)
+    with pytest.raises(ValueError):
+        Compaction(tail_mass=0.5)
+
+
+def test_trim_tails_keeps_mass():
+    d = Discrete({0: 0.01, 1: 0.02, 2: 0.47, 3: 0.47, 4: 0.02, 5: 0.01})
+    compacted = d.compact(Compaction(tail_mass=0.03))
+    assert compacted == Discrete({2: 0.5, 3: 0.5})
+
+
+def test_trim_tails_stops_before_threshold():
+    d = Discrete({0: 0.01, 1: 0.03, 2: 0.96})
+    compacted = d.compact(Compaction(tail_mass=0.03))
+    assert compacted == Discrete({1: 0.04, 2: 0.96})
+
+
+def test_rebin_preserves_mean():
+    random.seed(42)
+    values = sorted(random.uniform(0, 100) for _ in range(1000))
+    d = Discrete({v: 1 / 1000 for v in values})
+    compacted = d.compact(Compaction(max_points=50))
+    assert len(compacted.probabilities) <= 50
+    assert close(compacted.mean(), d.mean())
+    assert moments(compacted)[1] < moments(d)[1]
+
+
+def test_rebin_preserves_moments():
+    random.seed(42)
+    values = sorted(random.uniform(0, 100) for _ in range(1000))
+    d = Discrete({v: 1 / 1000 for v in values})
+    compacted = d.compact(Compaction(max_points=10, preserve_moments=True))
+    assert len(compacted.probabilities) <= 10
+    for expected, actual in zip(moments(d), moments(compacted)):
+        assert close(expected, actual, tolerance=1e-6)
+
+
+def test_compaction_applies_after_each_operation():
+    random.seed(42)
+    compaction = Compaction(max_points=100, tail_mass=1e-12)
+    values = sorted(random.random() for _ in range(4))
+    d = Discrete({v: 0.25 for v in values}, compaction=compaction)
+    total = d
+    for _ in range(10):
+        total = total + d
+        assert len(total.probabilities) <= 100
+        assert total.compaction is compaction
+    assert close(total.mean(), 11 * d.mean(), tolerance=1e-9)
+
+
+def test_compaction_only_on_request():
+    d = Discrete({0: 0.5, 0.1: 0.5})
+    with pytest.raises(ValueError):
+        d.compact()
+    assert (d + d).compaction is None
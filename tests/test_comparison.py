@@ -0,0 +1,62 @@
+import pytest
+
+import twistribution
+from twistribution.bernoulli import Bernoulli
+from twistribution.constant import Constant
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+from twistribution.uniform import Uniform
+
+FUNCTIONS = {
+    "<": (twistribution.prob_lt, lambda a, b: a < b),
+    "<=": (twistribution.prob_le, lambda a, b: a <= b),
+    ">": (twistribution.prob_gt, lambda a, b: a > b),
+    ">=": (twistribution.prob_ge, lambda a, b: a >= b),
+}
+
+PAIRS = [
+    (Normal(0, 1), Normal(1, 2)),
+    (Normal(0, 1), 0.5),
+    (0.5, Normal(0, 1)),
+    (Uniform(0, 2), Uniform(1, 3)),
+    (Uniform(0, 1) + Uniform(0, 1), 1.5),
+    (Discrete({0: 0.25, 1: 0.5, 2: 0.25}), 1),
+    (1, Discrete({0: 0.25, 1: 0.5, 2: 0.25})),
+    (Discrete({0: 0.5, 1: 0.5}), Discrete({1: 0.5, 2: 0.5})),
+    (Poisson(3), Poisson(4)),
+    (Poisson(3), 3),
+    (Bernoulli(0.3), Bernoulli(0.6)),
+    (Bernoulli(0.3), 0.5),
+    (Normal(0, 1) + Discrete({0: 0.5, 5: 0.5}), 2.5),
+]
+
+
+@pytest.mark.parametrize("a, b", PAIRS)
+@pytest.mark.parametrize("op", FUNCTIONS)
+def test_functions_agree_with_operators(a, b, op):
+    function, operator = FUNCTIONS[op]
+    p = function(a, b)
+    assert isinstance(p, float)
+    assert p == operator(a, b).p
+
+
+def test_numbers_and_constants():
+    assert twistribution.prob_lt(1, 2) == 1.0
+    assert twistribution.prob_ge(1, 2) == 0.0
+    assert twistribution.prob_le(Constant(2), 2) == 1.0
+    assert (Constant(2) > 1) == Constant(1)
+    assert (Constant(2) >= Constant(3)) == Constant(0)
+
+
+def test_certain_bernoulli_comparisons():
+    assert (Bernoulli(0.3) < 2) == Constant(1)
+    assert (Bernoulli(0.3) > -1) == Bernoulli(1)
+    assert (Bernoulli(0.3) >= 2) == Bernoulli(0)
+
+
+def test_unsupported_comparison():
+    with pytest.raises(TypeError):
+        twistribution.prob_lt(Poisson(3), Normal(0, 1))
+    with pytest.raises(TypeError):
+        twistribution.prob_gt("a", 1)
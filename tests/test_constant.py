@@ -1,3 +1,5 @@
+from array import array
+
 from twistribution.constant import Constant
 
 
@@ -92,3 +94,25 @@ def test_constant_truediv_scalar():
     assert (c / 1.5) == Constant(2 / 1.5), f"{c / 1.5}"
     assert (c / 1) == Constant(2), f"{c / 1}"
     assert (c / 0.5) == Constant(2 / 0.5), f"{c / 0.5}"
+
+
+def test_constant_pmf_many_and_cdf_many():
+    c = Constant(1)
+    assert c.pmf_many([0, 1, 2]) == array("d", [0, 1, 0])
+    assert c.cdf_many(range(3)) == array("d", [0, 1, 1])
+
+
+def test_constant_prob_lt_many_and_prob_le_many():
+    c = Constant(1)
+    assert c.prob_lt_many([0, 1, 2]) == array("d", [0, 0, 1])
+    assert c.prob_le_many([0, 1, 2]) == array("d", [0, 1, 1])
+
+
+def test_constant_sample():
+    assert Constant(2).sample(3) == array("d", [2, 2, 2])
+
+
+def test_quantile():
+    c = Constant(4)
+    assert c.quantile(0) == c.quantile(0.5) == c.quantile(1) == 4
+    assert c.quantile_many([0.1, 0.9]) == array("d", [4, 4])
@@ -0,0 +1,43 @@
+import random
+
+from tests.utils_for_testing import close
+from twistribution.convolution import convolve, convolve_integers
+
+
+def direct_convolution(a, b):
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            result[i + j] += x * y
+    return result
+
+
+def test_convolve_integers():
+    assert convolve_integers([1, 2, 3], [4, 5]) == [4, 13, 22, 15]
+    assert convolve_integers([1, 0, 1], [1, 1]) == [1, 1, 1, 1]
+    assert convolve_integers([0, 0], [7]) == [0, 0]
+    assert convolve_integers([], [1]) == []
+
+
+def test_convolve_integers_large_values():
+    random.seed(42)
+    a = [random.getrandbits(100) for _ in range(50)]
+    b = [random.getrandbits(80) for _ in range(70)]
+    assert convolve_integers(a, b) == direct_convolution(a, b)
+
+
+def test_convolve_floats():
+    random.seed(42)
+    a = [random.random() for _ in range(300)]
+    b = [random.random() for _ in range(200)]
+    for x, y in zip(convolve(a, b), direct_convolution(a, b), strict=True):
+        assert close(x, y, tolerance=1e-12)
+
+
+def test_convolve_probabilities_keeps_small_values():
+    a = [1e-6, 1 - 1e-6]
+    b = [1e-7, 1 - 1e-7]
+    result = convolve(a, b)
+    assert close(result[0], 1e-13, tolerance=1e-18)
+    for x, y in zip(result, direct_convolution(a, b), strict=True):
+        assert close(x, y, tolerance=1e-15)
@@ -1,9 +1,15 @@
+import random
+from array import array
+
 import pytest
 
 from tests.utils_for_testing import close
 from twistribution.bernoulli import Bernoulli
+from twistribution.binomial import Binomial
 from twistribution.discrete import Discrete
 from twistribution.normal import normal_pdf
+from twistribution.poisson import Poisson
+from twistribution.poisson_binomial import PoissonBinomial
 
 
 def test_keys_not_in_order():
@@ -22,6 +28,19 @@ def test_add_scalar():
     assert updated == Discrete({2.5: 0.25, 3.5: 0.25, 5.5: 0.25, 6.5: 0.25})
 
 
+def test_add_other_discrete_distributions():
+    coin = Discrete({0: 0.5, 1: 0.5})
+    expected = Discrete({0: 0.125, 1: 0.375, 2: 0.375, 3: 0.125})
+    # Discrete defers to their __radd__ rather than refusing them
+    assert coin + Binomial(2, 0.5) == expected
+    assert coin + PoissonBinomial([0.5, 0.5]) == expected
+    total = coin + Poisson(3)
+    assert isinstance(total, Discrete)
+    assert close(total.mean(), 3.5, 1e-6)
+    with pytest.raises(TypeError):
+        _ = coin + "not a distribution"
+
+
 def test_comparison_with_two_discrete():
     d1 = Discrete({1: 0.25, 2: 0.25, 3: 0.25, 4: 0.25})
     d2 = Discrete({1: 0.25, 2: 0.25, 3: 0.25, 4: 0.25})
@@ -131,3 +150,203 @@ class TestFairDice:
 
         assert (two_dice > 1) == Bernoulli(1.0)
         assert (two_dice > 12) == Bernoulli(0.0)
+
+
+def test_comparison_with_interleaved_supports():
+    d1 = Discrete({0.5: 0.1, 1: 0.2, 2.5: 0.3, 4: 0.4})
+    d2 = Discrete({1: 0.5, 2: 0.25, 4: 0.25})
+    expected_lt = sum(
+        v1 * v2
+        for k1, v1 in d1.probabilities.items()
+        for k2, v2 in d2.probabilities.items()
+        if k1 < k2
+    )
+    expected_le = sum(
+        v1 * v2
+        for k1, v1 in d1.probabilities.items()
+        for k2, v2 in d2.probabilities.items()
+        if k1 <= k2
+    )
+    assert close((d1 < d2).p, expected_lt)
+    assert close((d1 <= d2).p, expected_le)
+    assert close((d1 > d2).p, 1 - expected_le)
+    assert close((d1 >= d2).p, 1 - expected_lt)
+
+
+def test_comparison_with_scalar():
+    d = Discrete({1: 0.25, 2: 0.25, 4: 0.25, 5: 0.25})
+    assert (d < 0) == Bernoulli(0.0)
+    assert (d < 2) == Bernoulli(0.25)
+    assert (d <= 2) == Bernoulli(0.5)
+    assert (d < 3) == Bernoulli(0.5)
+    assert (d <= 5) == Bernoulli(1.0)
+    assert (d < 6) == Bernoulli(1.0)
+
+
+def direct_sum(d1, d2):
+    probabilities = {}
+    for k1, v1 in d1.probabilities.items():
+        for k2, v2 in d2.probabilities.items():
+            probabilities[k1 + k2] = probabilities.get(k1 + k2, 0.0) + v1 * v2
+    return Discrete(dict(sorted(probabilities.items())))
+
+
+def random_discrete(keys):
+    weights = [random.random() for _ in keys]
+    total = sum(weights)
+    return Discrete({k: w / total for k, w in zip(keys, weights)})
+
+
+def test_sum_on_dense_integer_lattice():
+    random.seed(42)
+    d1 = random_discrete(range(-50, 250))
+    d2 = random_discrete(range(10, 210))
+    assert d1._common_lattice_step(d2) == 1
+    assert d1 + d2 == direct_sum(d1, d2)
+
+
+def test_sum_on_sparse_integer_lattice():
+    random.seed(42)
+    d1 = random_discrete(sorted(random.sample(range(0, 3000, 3), 300)))
+    d2 = random_discrete(sorted(random.sample(range(6, 1500, 6), 150)))
+    assert d1._common_lattice_step(d2) == 3
+    total = d1 + d2
+    assert total == direct_sum(d1, d2)
+    assert all(k % 3 == 0 for k in total.probabilities)
+
+
+def test_sum_on_float_lattice():
+    random.seed(42)
+    d1 = random_discrete([0.5 + 0.25 * i for i in range(200)])
+    d2 = random_discrete([1.0 + 0.25 * i for i in range(100)])
+    assert d1._common_lattice_step(d2) == 0.25
+    assert d1 + d2 == direct_sum(d1, d2)
+
+
+def test_sum_on_decimal_float_lattice_keeps_direct_keys():
+    random.seed(42)
+    d1 = random_discrete([round(0.1 * i, 10) for i in range(80)])
+    d2 = random_discrete([round(0.1 * i, 10) for i in range(60)])
+    total = d1 + d2
+    direct = direct_sum(d1, d2)
+    # the direct sum can split one lattice point into keys a rounding error apart,
+    # such as 0.1 + 0.2 and 0.0 + 0.3, so compare each key with the mass near it
+    assert len(total.probabilities) == 139
+    for k, p in total.probabilities.items():
+        assert k in direct.probabilities
+        nearby = [v for j, v in direct.probabilities.items() if abs(j - k) < 0.05]
+        assert close(p, sum(nearby))
+
+
+@pytest.mark.parametrize("size", [150, 200])
+def test_sum_on_float_lattice_agrees_with_direct_sum_between_support_points(size):
+    # 150 of 200 lattice points leaves gaps, so the sparse path is taken
+    random.seed(3)
+    d1, d2 = (
+        random_discrete(
+            [round(0.1 * i, 10) for i in sorted(random.sample(range(200), size))]
+        )
+        for _ in range(2)
+    )
+    total = d1 + d2
+    direct = direct_sum(d1, d2)
+    assert all(k in direct.probabilities for k in total.probabilities)
+    thresholds = [0.1 * i + 0.05 for i in range(-1, 400)]
+    for lattice, pairwise in zip(
+        total.prob_lt_many(thresholds), direct.prob_lt_many(thresholds)
+    ):
+        assert close(lattice, pairwise, 1e-12)
+
+
+def test_sum_off_lattice():
+    random.seed(42)
+    d1 = random_discrete(sorted(random.random() for _ in range(100)))
+    d2 = random_discrete(sorted(random.random() for _ in range(100)))
+    assert d1._common_lattice_step(d2) is None
+    assert d1 + d2 == direct_sum(d1, d2)
+
+
+def test_probabilities_view():
+    d = Discrete({1: 0.25, 2.5: 0.25, 4: 0.5})
+    assert len(d.probabilities) == 3
+    assert list(d.probabilities) == [1, 2.5, 4]
+    assert list(d.probabilities.values()) == [0.25, 0.25, 0.5]
+    assert list(d.probabilities.items()) == [(1, 0.25), (2.5, 0.25), (4, 0.5)]
+    assert d.probabilities[2.5] == 0.25
+    assert 4 in d.probabilities
+    assert 3 not in d.probabilities
+    with pytest.raises(KeyError):
+        _ = d.probabilities[3]
+    assert d.probabilities == {1: 0.25, 2.5: 0.25, 4: 0.5}
+
+
+def test_integer_values_stay_integers():
+    d = Discrete({1: 0.5, 2: 0.5})
+    assert all(type(k) is int for k in d.probabilities)
+    assert str(d) == "Discrete({1: 0.5, 2: 0.5}, 1e-09)"
+    assert all(type(k) is float for k in (d + 0.5).probabilities)
+
+
+def test_no_instance_dict():
+    d = Discrete({1: 0.5, 2: 0.5})
+    assert not hasattr(d, "__dict__")
+    with pytest.raises(AttributeError):
+        d.probabilities = {1: 1.0}
+
+
+def test_sum_iid():
+    d6 = Discrete({1: 1 / 6, 2: 1 / 6, 3: 1 / 6, 4: 1 / 6, 5: 1 / 6, 6: 1 / 6})
+    assert d6.sum_iid(1) is d6
+    assert d6.sum_iid(2) == d6 + d6
+    repeated = d6
+    for _ in range(12):
+        repeated += d6
+    assert d6.sum_iid(13) == repeated
+    with pytest.raises(ValueError):
+        d6.sum_iid(0)
+
+
+def test_sum_iid_many_copies():
+    cost = Discrete({0: 0.5, 2: 0.3, 5: 0.2})
+    total = cost.sum_iid(1000)
+    assert close(total.mean(), 1000 * cost.mean(), tolerance=1e-6)
+    assert list(total.probabilities)[0] == 0
+    assert list(total.probabilities)[-1] == 5000
+
+
+def test_prob_lt_many_and_prob_le_many():
+    d = Discrete({1: 0.25, 2: 0.25, 4: 0.25, 5: 0.25})
+    thresholds = [6, 2, 0, 4.5, 1, 5, 2]
+    assert list(d.prob_lt_many(thresholds)) == [(d < t).p for t in thresholds]
+    assert list(d.prob_le_many(thresholds)) == [(d <= t).p for t in thresholds]
+
+
+def test_sample():
+    d = Discrete({1: 0.1, 2: 0.2, 5: 0.7})
+    draws = d.sample(100_000, random.Random(42))
+    assert len(draws) == 100_000
+    for value, probability in d.probabilities.items():
+        assert close(draws.count(value) / len(draws), probability, tolerance=0.01)
+    assert d.sample(0) == array("d")
+    with pytest.raises(ValueError):
+        d.sample(-1)
+
+
+def test_sample_is_reproducible():
+    d = Discrete({k: 1 / 1000 for k in range(1000)})
+    assert d.sample(100, random.Random(1)) == d.sample(100, random.Random(1))
+
+
+def test_quantile():
+    d = Discrete({1: 0.25, 2: 0.25, 5: 0.5})
+    assert d.quantile(0) == 1
+    assert d.quantile(0.25) == 1
+    assert d.quantile(0.26) == 2
+    assert d.quantile(0.5) == 2
+    assert d.quantile(0.99) == 5
+    assert d.quantile(1) == 5
+    assert list(d.quantile_many([0.99, 0.1, 0.4])) == [5, 1, 2]
+    with pytest.raises(ValueError):
+        d.quantile(1.5)
+    with pytest.raises(ValueError):
+        d.quantile_many([0.5, -0.1])
@@ -0,0 +1,78 @@
+import math
+
+from tests.utils_for_testing import close
+from twistribution.approximation import approximation
+from twistribution.bernoulli import Bernoulli
+from twistribution.constant import Constant
+from twistribution.discrete import Discrete
+from twistribution.lazy import Lazy, lazy
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+
+
+def test_operators_build_expressions():
+    expression = lazy(Normal(0, 1)) + Normal(1, 1) < 3
+    assert isinstance(expression, Lazy)
+    assert expression.op == "lt"
+
+
+def test_normal_sum_matches_eager():
+    a, b, c = Normal(0, 1), Normal(2, 3), Normal(-1, 2)
+    assert (lazy(a) + b + c).evaluate() == a + b + c
+    assert ((lazy(a) + b + c) < (lazy(a) + b)).evaluate() == ((a + b + c) < (a + b))
+
+
+def test_constant_folding():
+    expression = lazy(Constant(1)) + 2 + Constant(3) + Normal(0, 1) + 4
+    assert expression.evaluate() == Normal(10, 1)
+    assert (lazy(Constant(1)) + Constant(2)).evaluate() == Constant(3)
+    assert (lazy(1) + 2).evaluate() == 3
+
+
+def test_poisson_sum():
+    expression = lazy(Poisson(1.0)) + Poisson(2.0) + Poisson(3.5)
+    assert expression.evaluate() == Poisson(6.5)
+
+
+def test_discrete_sum_matches_eager():
+    coin = Discrete({0: 0.5, 1: 0.5})
+    d6 = Discrete({i: 1 / 6 for i in range(1, 7)})
+    expression = lazy(d6) + coin + 10 + d6 + coin
+    assert expression.evaluate() == d6 + coin + 10 + d6 + coin
+
+
+def test_shared_subexpressions_are_evaluated_once(monkeypatch):
+    d6 = Discrete({i: 1 / 6 for i in range(1, 7)})
+    calls = []
+    add = Discrete.__add__
+
+    def counting_add(self, other):
+        calls.append(other)
+        return add(self, other)
+
+    monkeypatch.setattr(Discrete, "__add__", counting_add)
+    shared = lazy(d6) + d6
+    result = (shared < shared + 1).evaluate()
+    # one addition for the shared sum, and one to shift it
+    assert len(calls) == 2
+    assert result == ((d6 + d6) < (d6 + d6 + 1))
+
+
+def test_mixed_comparison():
+    a = Normal(1, 2)
+    expression = (lazy(a) - Normal(0, 1)) * 2 > 0
+    result = expression.evaluate()
+    assert close(result.p, ((a - Normal(0, 1)) * 2 > 0).p)
+    assert close(result.p, 0.5 + 0.5 * math.erf(1 / math.sqrt(5) / math.sqrt(2)))
+
+
+def test_discrete_sum_under_approximation():
+    die = Discrete({i: 1 / 6 for i in range(1, 7)})
+    with approximation(0.06):
+        p0, p1, p2, p3 = (die.sum_iid(40) for _ in range(4))
+        eager = p0 + p1 + p2 + p3
+        result = (lazy(p0) + p1 + p2 + p3).evaluate()
+    assert isinstance(eager, Normal)
+    assert isinstance(result, Normal)
+    assert close(result.mean, 560)
+    assert close(result.stddev, eager.stddev)
@@ -0,0 +1,124 @@
+import random
+from math import erf, sqrt
+
+import pytest
+
+from tests.utils_for_testing import close
+from twistribution.approximation import approximation
+from twistribution.discrete import Discrete
+from twistribution.mixture import Mixture
+from twistribution.normal import Normal
+from twistribution.piecewise import PiecewisePolynomial
+from twistribution.uniform import Uniform
+
+
+def naive_cdf(component, offsets, x):
+    return sum(p * component.cdf(x - d) for d, p in offsets.probabilities.items())
+
+
+def test_adding_continuous_and_discrete_gives_mixture():
+    offsets = Discrete({0: 0.5, 10: 0.5})
+    for mixture in (Normal(0, 1) + offsets, offsets + Normal(0, 1)):
+        assert isinstance(mixture, Mixture)
+        assert mixture.component == Normal(0, 1)
+        assert mixture.offsets == offsets
+    assert isinstance(Uniform(0, 1) + offsets, Mixture)
+    assert isinstance(Uniform(0, 1) + Uniform(0, 1) + offsets, Mixture)
+
+
+def test_cdf_matches_naive_evaluation():
+    offsets = Discrete({-3: 0.2, 0: 0.3, 0.5: 0.1, 4: 0.4})
+    for component in (Normal(1, 2), Uniform(-1, 1), Uniform(0, 1) + Uniform(0, 1)):
+        mixture = Mixture(component, offsets)
+        xs = [-40, -4, -2.5, -1, 0, 0.25, 1, 1.5, 3.9, 4, 5, 6.5, 40]
+        for x in xs:
+            assert close(mixture.cdf(x), naive_cdf(component, offsets, x), 1e-12)
+        assert list(mixture.cdf_many(reversed(xs))) == [
+            mixture.cdf(x) for x in reversed(xs)
+        ]
+
+
+def test_pdf():
+    mixture = Uniform(0, 1) + Discrete({0: 0.5, 2: 0.5})
+    assert close(mixture.pdf(0.5), 0.5)
+    assert close(mixture.pdf(1.5), 0)
+    assert close(mixture.pdf(2.5), 0.5)
+    normal_mixture = Normal(0, 1) + Discrete({0: 0.5, 1: 0.5})
+    assert close(normal_mixture.pdf(0.5), Normal(0, 1).pdf(0.5))
+
+
+def test_many_centres():
+    rng = random.Random(0)
+    centres = sorted(rng.uniform(0, 1000) for _ in range(10_000))
+    offsets = Discrete({c: 1 / len(centres) for c in centres})
+    mixture = Mixture(Normal(0, 0.5), offsets)
+    for x in (-10, 1.0, 500.25, 999.5, 1010):
+        assert close(mixture.cdf(x), naive_cdf(Normal(0, 0.5), offsets, x), 1e-12)
+
+
+def test_comparisons():
+    mixture = Normal(0, 1) + Discrete({0: 0.5, 10: 0.5})
+    assert close((mixture < 5).p, 0.5, 1e-6)
+    assert close((mixture > 10).p, 0.25)
+    assert close((mixture < Discrete({5: 1.0})).p, 0.5, 1e-6)
+    assert close((Discrete({5: 1.0}) > mixture).p, 0.5, 1e-6)
+    # X + D < Y: with D = 0 this is Normal(0, sqrt 2) < 0, otherwise almost surely not
+    assert close((mixture < Normal(0, 1)).p, 0.25)
+    assert close((Normal(0, 1) > mixture).p, 0.25)
+    other = Normal(1, 1) + Discrete({0: 1.0})
+    expected = 0.5 * (1 + erf(1 / sqrt(2) / sqrt(2))) / 2
+    assert close((mixture < other).p, expected)
+
+
+def test_arithmetic():
+    mixture = Normal(0, 1) + Discrete({0: 0.5, 10: 0.5})
+    assert (mixture + 1).offsets == Discrete({1: 0.5, 11: 0.5})
+    assert (mixture + Normal(0, 1)).component == Normal(0, sqrt(2))
+    assert (mixture + Discrete({0: 0.5, 1: 0.5})).offsets == Discrete(
+        {0: 0.25, 1: 0.25, 10: 0.25, 11: 0.25}
+    )
+    negated = mixture * -2
+    assert negated.component == Normal(0, 2)
+    assert negated.offsets == Discrete({-20: 0.5, 0: 0.5})
+    assert isinstance((Uniform(0, 1) + Discrete({0: 1.0})) + Uniform(0, 1), Mixture)
+    assert isinstance(
+        ((Uniform(0, 1) + Discrete({0: 1.0})) + Uniform(0, 1)).component,
+        PiecewisePolynomial,
+    )
+
+
+def test_offsets_approximated_under_error_budget():
+    die = Discrete({i: 1 / 6 for i in range(1, 7)})
+    with approximation(0.06):
+        total = (Normal(0, 1) + die.sum_iid(100)) + die.sum_iid(100)
+    assert isinstance(total, Normal)
+    assert close(total.mean, 700)
+    assert close(total.cdf(700), 0.5)
+
+
+def test_sample():
+    mixture = Uniform(0, 1) + Discrete({0: 0.5, 10: 0.5})
+    values = mixture.sample(10_000, random.Random(3))
+    assert all(0 <= x <= 1 or 10 <= x <= 11 for x in values)
+    assert close(sum(x > 5 for x in values) / len(values), 0.5, 0.03)
+
+
+def test_unsupported_component():
+    with pytest.raises(TypeError):
+        Mixture(Discrete({0: 1.0}), Discrete({0: 1.0}))
+
+
+def test_to_discrete():
+    mixture = Normal(0, 1) + Discrete({0: 0.5, 100: 0.5})
+    d = mixture.to_discrete(max_points=64, lattice=1)
+    assert len(d.probabilities) <= 64
+    assert close(d.mean(), 50, 1e-6)
+    assert close((d < 50).p, 0.5, 1e-9)
+
+
+def test_quantile():
+    mixture = Uniform(0, 1) + Discrete({0: 0.5, 10: 0.5})
+    assert close(mixture.quantile(0.25), 0.5)
+    assert close(mixture.quantile(0.75), 10.5)
+    assert close(mixture.quantile(0), 0)
+    assert close(mixture.quantile(1), 11)
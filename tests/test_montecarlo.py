@@ -0,0 +1,73 @@
+import pytest
+
+from twistribution import montecarlo
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+from twistribution.uniform import Uniform
+from tests.utils_for_testing import close
+
+
+def test_compare_normal_with_uniform():
+    # by symmetry about 0
+    result = montecarlo.compare(
+        Normal(0, 1), "<", Uniform(-1, 1), precision=0.005, workers=1
+    )
+    assert close(result.p, 0.5, 0.01)
+
+
+def test_compare_stops_early_for_certain_outcomes():
+    result = montecarlo.compare(
+        Uniform(0, 1), "<", 2, precision=1e-3, batch_size=10_000, workers=1
+    )
+    assert result.p == 1
+    assert montecarlo.compare(Uniform(0, 1), ">=", 2, workers=1).p == 0
+
+
+def test_compare_is_reproducible_across_worker_counts():
+    kwargs = dict(precision=0.005, batch_size=20_000, seed=7)
+    serial = montecarlo.compare(Normal(0, 1), ">", Uniform(0, 1), workers=1, **kwargs)
+    parallel = montecarlo.compare(Normal(0, 1), ">", Uniform(0, 1), workers=2, **kwargs)
+    assert serial.p == parallel.p
+    other_seed = montecarlo.compare(
+        Normal(0, 1), ">", Uniform(0, 1), workers=1, **{**kwargs, "seed": 8}
+    )
+    assert other_seed.p != serial.p
+
+
+def test_runs_in_process_by_default(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+
+    monkeypatch.setattr(montecarlo, "ProcessPoolExecutor", no_pool)
+    result = montecarlo.compare(Normal(0, 1), "<", 0, precision=0.01)
+    assert close(result.p, 0.5, 0.05)
+    combined = montecarlo.combine(Uniform(0, 1), "+", 1, bins=10, precision=0.01)
+    assert close(combined.mean(), 1.5, 0.01)
+
+
+def test_combine_uniforms():
+    result = montecarlo.combine(
+        Uniform(0, 1), "+", Uniform(0, 1), bins=50, precision=0.002, workers=1
+    )
+    assert isinstance(result, Discrete)
+    assert len(result.probabilities) <= 50
+    assert close(result.mean(), 1, 0.01)
+    # triangular distribution
+    assert close((result < 0.5).p, 0.125, 0.02)
+
+
+def test_combine_poisson_with_discrete():
+    result = montecarlo.combine(
+        Poisson(3), "+", Discrete({0: 0.5, 10: 0.5}), precision=0.005, workers=1
+    )
+    assert close(result.mean(), 8, 0.05)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        montecarlo.compare(Normal(0, 1), "==", Normal(0, 1))
+    with pytest.raises(ValueError):
+        montecarlo.combine(Normal(0, 1), "%", Normal(0, 1))
+    with pytest.raises(ValueError):
+        montecarlo.compare(Normal(0, 1), "<", Normal(0, 1), confidence=1)
@@ -1,4 +1,7 @@
+from array import array
 import math
+import random
+import statistics
 
 from twistribution.bernoulli import Bernoulli
 from twistribution.normal import Normal
@@ -95,3 +98,62 @@ def test_normal_gt_scalar2():
     result = a > 0
     assert isinstance(result, Bernoulli)
     assert result == Bernoulli(0.5)
+
+
+def test_normal_cdf():
+    a = Normal(1, 2)
+    assert a.cdf(1) == 0.5
+    assert 0.841 < a.cdf(3) < 0.842
+    assert a.cdf(-1) == 1 - a.cdf(3)
+
+
+def test_normal_pdf_many_and_cdf_many():
+    a = Normal(1, 2)
+    xs = [-3.0, 0.0, 1.0, 2.5, 10.0]
+    pdfs = a.pdf_many(xs)
+    cdfs = a.cdf_many(array("d", xs))
+    assert isinstance(pdfs, array) and pdfs.typecode == "d"
+    for x, pdf, cdf in zip(xs, pdfs, cdfs, strict=True):
+        assert math.isclose(pdf, a.pdf(x), rel_tol=1e-12)
+        assert math.isclose(cdf, a.cdf(x), rel_tol=1e-12)
+
+
+def test_sample():
+    draws = Normal(3, 2).sample(100_001, random.Random(42))
+    assert len(draws) == 100_001
+    assert abs(statistics.mean(draws) - 3) < 0.05
+    assert abs(statistics.stdev(draws) - 2) < 0.05
+
+
+def test_to_discrete():
+    a = Normal(2, 3)
+    d = a.to_discrete(max_points=128)
+    assert len(d.probabilities) <= 128
+    assert math.isclose(sum(d.probabilities.values()), 1)
+    assert abs(d.mean() - 2) < 1e-6
+    assert abs((d < 2).p - 0.5) < 0.01
+    assert a.to_discrete(max_points=128) is d
+    assert a.to_discrete(max_points=64) is not d
+
+
+def test_to_discrete_on_lattice():
+    d = Normal(0, 10).to_discrete(max_points=50, lattice=1)
+    support = list(d.probabilities)
+    assert len(support) <= 50
+    assert all(type(k) is int for k in support)
+    step = support[1] - support[0]
+    assert all(b - a == step for a, b in zip(support, support[1:]))
+    assert math.isclose(d.probabilities[0], Normal(0, 10).cdf(step / 2) * 2 - 1)
+    assert abs(((d + d) < 0.5).p - 0.5) < 0.05
+
+
+def test_quantile():
+    a = Normal(3, 2)
+    assert a.quantile(0.5) == 3
+    assert math.isclose(a.quantile(0.975), 3 + 2 * 1.959963984540054, rel_tol=1e-15)
+    for q in [1e-300, 1e-12, 0.01, 0.3, 0.7, 0.99, 1 - 1e-12]:
+        assert math.isclose(
+            Normal(0, 1).quantile(q), statistics.NormalDist().inv_cdf(q), rel_tol=1e-14
+        )
+    assert a.quantile(0) == -math.inf and a.quantile(1) == math.inf
+    assert list(a.quantile_many([0.975, 0.5])) == [a.quantile(0.975), 3]
@@ -0,0 +1,101 @@
+import random
+from math import factorial
+
+import pytest
+
+from tests.utils_for_testing import close
+from twistribution.piecewise import PiecewisePolynomial
+from twistribution.uniform import Uniform
+
+
+def irwin_hall(n):
+    total = Uniform(0, 1)
+    for _ in range(n - 1):
+        total = total + Uniform(0, 1)
+    return total
+
+
+def test_sum_of_two_uniforms_is_triangular():
+    triangular = Uniform(0, 1) + Uniform(0, 1)
+    assert isinstance(triangular, PiecewisePolynomial)
+    assert triangular.breakpoints == (0, 1, 2)
+    assert close(triangular.pdf(0.5), 0.5)
+    assert close(triangular.pdf(1), 1)
+    assert close(triangular.cdf(0.5), 0.125)
+    assert close(triangular.cdf(1.5), 0.875)
+    assert triangular.pdf(-1) == 0 and triangular.pdf(3) == 0
+    assert triangular.cdf(-1) == 0 and triangular.cdf(3) == 1
+
+
+def test_irwin_hall():
+    for n in range(2, 13):
+        distribution = irwin_hall(n)
+        assert len(distribution.pieces) == n
+        assert close(distribution.cdf(n / 2), 0.5, 1e-12)
+        # the cdf on [0, 1] is x**n / n!
+        assert close(distribution.cdf(1), 1 / factorial(n), 1e-12)
+
+
+def test_sum_of_uniforms_with_different_widths():
+    trapezoid = Uniform(0, 1) + Uniform(0, 2)
+    assert trapezoid.breakpoints == (0, 1, 2, 3)
+    assert close(trapezoid.pdf(1.5), 0.5)
+    assert close(trapezoid.cdf(1.5), 0.5)
+    assert close(trapezoid.cdf(0.5), 0.0625)
+
+
+def test_scalar_arithmetic():
+    triangular = Uniform(0, 1) + Uniform(0, 1)
+    assert (triangular + 1).breakpoints == (1, 2, 3)
+    assert close((triangular - 1).cdf(0), 0.5)
+    doubled = triangular * 2
+    assert close(doubled.cdf(1), 0.125)
+    assert close(doubled.pdf(2), 0.5)
+    reflected = (Uniform(0, 1) + Uniform(0, 2)) * -1
+    assert reflected.breakpoints == (-3, -2, -1, 0)
+    assert close(reflected.cdf(-2.5), 1 - 0.9375)
+    assert close((triangular / 2).cdf(0.5), 0.5)
+    # as for Uniform and Mixture, a distribution with no spread can't be built
+    with pytest.raises(ValueError):
+        triangular * 0
+    with pytest.raises(ValueError):
+        Uniform(0, 1) * 0
+    with pytest.raises(ZeroDivisionError):
+        triangular / 0
+
+
+def test_comparisons():
+    triangular = Uniform(0, 1) + Uniform(0, 1)
+    assert close((triangular < 0.5).p, 0.125)
+    assert close((triangular > 0.5).p, 0.875)
+    # the sum of three uniforms against a fourth is symmetric about 1.5 - 0.5
+    assert close((irwin_hall(3) < Uniform(1, 2)).p, 0.5)
+    assert close((Uniform(1, 2) > irwin_hall(3)).p, 0.5)
+    assert close((triangular - Uniform(0, 1) < 0).p, 1 / 6)
+
+
+def test_sample():
+    values = irwin_hall(3).sample(20_000, random.Random(1))
+    assert all(0 <= x <= 3 for x in values)
+    assert close(sum(values) / len(values), 1.5, 0.02)
+    assert close(sum(x < 1 for x in values) / len(values), 1 / 6, 0.01)
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        PiecewisePolynomial([0, 1], [[1], [1]])
+    with pytest.raises(ValueError):
+        PiecewisePolynomial([1, 0], [[1]])
+    with pytest.raises(ValueError):
+        PiecewisePolynomial([0, 1], [[2]])
+
+
+def test_quantile():
+    triangular = Uniform(0, 1) + Uniform(0, 1)
+    assert close(triangular.quantile(0.5), 1)
+    assert close(triangular.quantile(0.125), 0.5)
+    assert close(triangular.quantile(0), 0)
+    assert close(triangular.quantile(1), 2)
+    levels = [0.01, 0.9, 0.5]
+    for q, x in zip(levels, irwin_hall(4).quantile_many(levels)):
+        assert close(irwin_hall(4).cdf(x), q, 1e-12)
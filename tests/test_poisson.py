@@ -1,10 +1,13 @@
+from array import array
 import pytest
 import random
 import math
 
 from tests.utils_for_testing import close, estimate_probability
 from twistribution.bernoulli import Bernoulli
+from twistribution.cache import caching
 from twistribution.poisson import Poisson
+from twistribution.profiling import record
 
 
 def test_poisson_creation():
@@ -144,3 +147,158 @@ def test_poisson_comparison_by_sampling():
     assert close(
         calculated.p, sampled, tolerance=1e-3
     ), f"Expected {sampled}, got {calculated.p}"
+
+
+def test_poisson_pmf_and_cdf_match_direct_sum():
+    p = Poisson(7.5)
+    total = 0.0
+    for k in range(60):
+        expected_pmf = 7.5**k * math.exp(-7.5) / math.factorial(k)
+        total += expected_pmf
+        assert close(p.pmf(k), expected_pmf, tolerance=1e-12)
+        assert close(p.cdf(k), total, tolerance=1e-12)
+        assert close(p.cdf(k + 0.5), total, tolerance=1e-12)
+
+
+def test_poisson_large_mean():
+    p = Poisson(1e6)
+    # normal approximation with continuity correction: Phi(0.5005)
+    assert close(p.cdf(1_000_500), 0.69168, tolerance=1e-4)
+    assert close(p.cdf(999_999) + p.pmf(1_000_000), p.cdf(1_000_000), tolerance=1e-12)
+    assert 0 < p.cdf(990_000) < 1e-20
+    assert p.cdf(0) == 0.0
+    assert p.cdf(10**9) == 1.0
+    assert p.pmf(10**9) == 0.0
+
+
+def test_poisson_astronomically_large_values():
+    p = Poisson(5)
+    assert p.pmf(1e160) == 0.0
+    assert p.cdf(1e160) == 1.0
+    assert (p < 1e160).p == 1.0
+    assert (p >= 1e300).p == 0.0
+
+
+def test_poisson_deep_tails():
+    p = Poisson(100)
+
+    # P(X <= 30) and P(X > 200) are far outside the cached table
+    def log_space_pmf(k):
+        return math.exp(k * math.log(100) - 100 - math.lgamma(k + 1))
+
+    lower = sum(log_space_pmf(k) for k in range(31))
+    upper = sum(log_space_pmf(k) for k in range(201, 400))
+    assert close(p.cdf(30) / lower, 1, tolerance=1e-12)
+    assert close(p._upper_tail(200) / upper, 1, tolerance=1e-12)
+    assert close(p.cdf(200), 1.0, tolerance=1e-12)
+
+
+@pytest.mark.parametrize("mean", [0.01, 2.0, 100.0, 1e3, 1e5])
+def test_poisson_to_discrete_excludes_tail_mass(mean):
+    p = Poisson(mean)
+    d = p.to_discrete(tail_mass=1e-10)
+    support = list(d.probabilities)
+    low, high = support[0], support[-1]
+    assert support == list(range(low, high + 1))
+    assert low == 0 or p.cdf(low - 1) <= 1e-10 < p.cdf(low)
+    assert p._upper_tail(high) <= 1e-10 < p._upper_tail(high - 1)
+    assert close(d.mean(), mean, tolerance=1e-6 * mean)
+
+
+def test_poisson_to_discrete_is_cached():
+    p = Poisson(1000)
+    assert p.to_discrete() is p.to_discrete()
+    assert p.to_discrete(tail_mass=1e-6) is not p.to_discrete()
+    assert len(p.to_discrete(tail_mass=1e-6).probabilities) < len(
+        p.to_discrete().probabilities
+    )
+
+
+def test_poisson_to_discrete_min_probability_is_deprecated():
+    p = Poisson(50)
+    with pytest.warns(DeprecationWarning, match="tail_mass") as warnings:
+        d = p.to_discrete(min_probability=1e-6)
+    assert warnings[0].filename == __file__
+    assert d is p.to_discrete(tail_mass=1e-6)
+    # the warning points at the caller whatever wraps the computation
+    with record(), caching(), pytest.warns(DeprecationWarning) as warnings:
+        p.to_discrete(min_probability=1e-6)
+    assert warnings[0].filename == __file__
+
+
+@pytest.mark.parametrize(
+    "mean1, mean2",
+    [(2.0, 3.0), (2.0, 2.0), (0.1, 50.0), (50.0, 0.1), (1000.0, 1010.0), (3000, 2900)],
+)
+def test_poisson_comparison_matches_discrete(mean1, mean2):
+    p1 = Poisson(mean1)
+    p2 = Poisson(mean2)
+    d1 = p1.to_discrete(tail_mass=1e-15)
+    d2 = p2.to_discrete(tail_mass=1e-15)
+    assert close((p1 < p2).p, (d1 < d2).p, tolerance=1e-12)
+    assert close((p1 <= p2).p, (d1 <= d2).p, tolerance=1e-12)
+    assert close((p1 > p2).p, (d1 > d2).p, tolerance=1e-12)
+    assert close((p1 >= p2).p, (d1 >= d2).p, tolerance=1e-12)
+
+
+def test_poisson_comparison_with_large_means():
+    p1 = Poisson(1e6)
+    p2 = Poisson(1e6 + 1000)
+    # X - Y is approximately Normal(-1000, sqrt(2e6))
+    assert close((p1 < p2).p, 0.7601, tolerance=1e-4)
+    assert close((p1 <= p2).p - (p1 < p2).p, 2.197e-4, tolerance=1e-6)
+
+
+def test_poisson_sum_iid():
+    assert Poisson(2.5).sum_iid(4) == Poisson(10.0)
+    with pytest.raises(ValueError):
+        Poisson(2.5).sum_iid(0)
+
+
+def test_poisson_pmf_many_and_cdf_many():
+    for p in [Poisson(2.5), Poisson(100.0), Poisson(1e6)]:
+        xs = [-1, 0, 0.5, 1, 3, 20, 50, 99.5, 130, 250, 1e6, 1e6 + 1e4, float("inf")]
+        xs = xs + [30, 5, 200, 80]
+        pmfs = p.pmf_many(array("d", xs))
+        cdfs = p.cdf_many(memoryview(array("d", xs)))
+        assert isinstance(cdfs, array) and cdfs.typecode == "d"
+        for x, pmf, cdf in zip(xs, pmfs, cdfs, strict=True):
+            assert close(pmf, p.pmf(x), tolerance=1e-15)
+            assert close(cdf, p.cdf(x), tolerance=1e-14)
+
+
+def test_poisson_prob_lt_many_and_prob_le_many():
+    p = Poisson(40.0)
+    thresholds = [float("inf"), 40, -1, 39.5, 0, 10, 120, 41]
+    for t, lt, le in zip(
+        thresholds, p.prob_lt_many(thresholds), p.prob_le_many(thresholds), strict=True
+    ):
+        assert close(lt, (p < t).p, tolerance=1e-14)
+        assert close(le, (p <= t).p, tolerance=1e-14)
+
+
+def test_poisson_sample():
+    draws = Poisson(50.0).sample(50_000, random.Random(42))
+    assert abs(sum(draws) / len(draws) - 50) < 0.2
+    assert all(d.is_integer() for d in draws)
+
+
+@pytest.mark.parametrize("mean", [0.5, 4, 1000])
+def test_quantile(mean):
+    p = Poisson(mean)
+    levels = [0, 1e-30, 0.001, 0.05, 0.5, 0.95, 0.999, 1 - 1e-15]
+    for q, k in zip(levels, p.quantile_many(levels)):
+        assert k == p.quantile(q)
+        assert p.cdf(k) >= q
+        assert k == 0 or p.cdf(k - 1) < q
+    assert p.quantile(1) == math.inf
+
+
+def test_quantile_far_below_the_cdf_table():
+    # levels below the table are found by binary search, not one value at a time
+    p = Poisson(1e6)
+    assert p.quantile(0) == 0
+    for q in [1e-300, 5e-324]:
+        k = p.quantile(q)
+        assert p.cdf(k) >= q
+        assert p.cdf(k - 1) < q
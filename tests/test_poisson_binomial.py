@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from tests.utils_for_testing import close
+from twistribution.bernoulli import Bernoulli
+from twistribution.discrete import Discrete
+from twistribution.poisson_binomial import PoissonBinomial
+
+
+def naive_pmf(probabilities):
+    pmf = [1.0]
+    for p in probabilities:
+        new = [0.0] * (len(pmf) + 1)
+        for k, v in enumerate(pmf):
+            new[k] += v * (1 - p)
+            new[k + 1] += v * p
+        pmf = new
+    return pmf
+
+
+def test_creation():
+    d = PoissonBinomial([Bernoulli(0.2), 0.5, Bernoulli(0.9)])
+    assert d.parameters() == ((0.2, 0.5, 0.9),)
+    assert PoissonBinomial([1 + 1e-12]).probabilities[0] == 1.0
+
+    with pytest.raises(ValueError):
+        PoissonBinomial([])
+    with pytest.raises(ValueError):
+        PoissonBinomial([0.5, 1.5])
+    with pytest.raises(ValueError):
+        PoissonBinomial([-0.1])
+
+
+def test_mean_and_variance():
+    probabilities = [0.1, 0.5, 0.7, 1.0]
+    d = PoissonBinomial(probabilities)
+    assert close(d.mean(), 2.3)
+    assert close(d.variance(), 0.09 + 0.25 + 0.21)
+
+
+def test_pmf_matches_naive_product():
+    rng = random.Random(0)
+    # long enough that the top of the product tree uses fast convolution
+    probabilities = [rng.random() for _ in range(500)]
+    d = PoissonBinomial(probabilities)
+    expected = naive_pmf(probabilities)
+    assert all(close(d.pmf(k), p, 1e-14) for k, p in enumerate(expected))
+    assert d.pmf(-1) == d.pmf(0.5) == d.pmf(501) == 0.0
+
+
+def test_cdf_and_quantile():
+    d = PoissonBinomial([0.5, 0.5])
+    assert d.cdf(-1) == 0.0
+    assert close(d.cdf(0), 0.25)
+    assert close(d.cdf(1.5), 0.75)
+    assert d.cdf(2) == 1.0
+    assert d.cdf(float("inf")) == 1.0
+    assert list(d.cdf_many([0, 1, 2])) == [d.cdf(0), d.cdf(1), d.cdf(2)]
+    assert [d.quantile(q) for q in (0, 0.25, 0.26, 0.75, 0.8, 1)] == [0, 0, 1, 1, 2, 2]
+
+
+def test_certain_events():
+    d = PoissonBinomial([1.0, 1.0, 0.0, 0.5])
+    assert close(d.pmf(2), 0.5)
+    assert close(d.pmf(3), 0.5)
+    assert d.pmf(1) == 0.0
+    assert d.to_discrete() == Discrete({2: 0.5, 3: 0.5})
+
+
+def test_comparison_with_numbers():
+    d = PoissonBinomial([0.5, 0.5])
+    assert close((d < 1).p, 0.25)
+    assert close((d <= 1).p, 0.75)
+    assert close((d > 1).p, 0.25)
+    assert close((d >= 1).p, 0.75)
+    assert close((d < 0.5).p, 0.25)
+    assert close(d.prob_lt_many([0, 1, 1.5, 3])[2], 0.75)
+    assert list(d.prob_le_many([-1, 0, 1, 2])) == [0.0, 0.25, 0.75, 1.0]
+
+
+def test_comparison_with_other_distributions():
+    a = PoissonBinomial([0.2, 0.6, 0.9])
+    b = PoissonBinomial([0.3, 0.5])
+    da, db = a.to_discrete(), b.to_discrete()
+    assert close((a < b).p, (da < db).p)
+    assert close((a <= b).p, (da <= db).p)
+    assert close((a > b).p, (da > db).p)
+    assert close((a < db).p, (da < db).p)
+    assert close((db < a).p, (db < da).p)
+
+
+def test_addition():
+    a = Bernoulli(0.2) + Bernoulli(0.7)
+    assert isinstance(a, PoissonBinomial)
+    assert a == PoissonBinomial([0.2, 0.7])
+    assert a + Bernoulli(0.4) == PoissonBinomial([0.2, 0.7, 0.4])
+    assert Bernoulli(0.4) + a == PoissonBinomial([0.2, 0.7, 0.4])
+    assert a + a == PoissonBinomial([0.2, 0.7, 0.2, 0.7])
+    assert a + 1 == Discrete({1: 0.24, 2: 0.62, 3: 0.14})
+
+
+def test_sample():
+    d = PoissonBinomial([0.1, 0.5, 0.9])
+    samples = d.sample(100_000, random.Random(0))
+    assert set(samples) <= {0, 1, 2, 3}
+    assert abs(sum(samples) / len(samples) - d.mean()) < 0.01
+
+
+def test_ten_thousand_events():
+    rng = random.Random(1)
+    d = PoissonBinomial([rng.random() for _ in range(10_000)])
+    assert 0.4 < (d < d.mean()).p < 0.6
+    assert close(sum(d._pmf_table()), 1, 1e-12)
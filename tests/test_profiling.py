@@ -0,0 +1,64 @@
+import json
+
+from twistribution import profiling
+from twistribution.cache import caching
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+from twistribution.profiling import record
+
+
+def test_nothing_recorded_outside_context():
+    d = Discrete({0: 0.5, 1: 0.5})
+    with record() as recording:
+        pass
+    _ = d + d
+    assert recording.operations == {}
+    assert profiling._recording is None
+
+
+def test_calls_sizes_and_paths():
+    d = Discrete({k: 1 / 100 for k in range(100)})
+    with record() as recording:
+        _ = d + d
+        _ = d + d + 0.5
+        _ = d < 50
+        _ = Poisson(4.0) <= Poisson(5.0)
+        _ = Normal(0, 1) > 1
+
+    add = recording.operations[("Discrete.__add__", "Discrete", "Discrete")]
+    assert add.calls == 2
+    assert add.seconds > 0
+    assert add.paths == {"lattice": 2}
+    assert add.input_sizes == {64: 4}
+    assert add.output_sizes == {128: 2}
+
+    shift = recording.operations[("Discrete.__add__", "Discrete", "float")]
+    assert shift.paths == {"shift": 1}
+    assert recording.operations[("Discrete.__lt__", "Discrete", "int")].paths == {
+        "bisect": 1
+    }
+    assert recording.operations[("Poisson.__le__", "Poisson", "Poisson")].paths == {
+        "skellam": 1
+    }
+    assert ("ContinuousDistribution.__gt__", "Normal", "int") in recording.operations
+
+
+def test_cache_hits_are_recorded():
+    d = Discrete({0: 0.5, 1: 0.5})
+    with caching(), record() as recording:
+        _ = d + d
+        _ = d + d
+    add = recording.operations[("Discrete.__add__", "Discrete", "Discrete")]
+    assert add.paths == {"cache miss": 1, "cache hit": 1, "pairwise": 1}
+
+
+def test_exports():
+    d = Discrete({0: 0.5, 1: 0.5})
+    with record() as recording:
+        _ = d + d
+    exported = json.loads(recording.to_json())
+    assert exported["Discrete.__add__ Discrete Discrete"]["calls"] == 1
+    table = recording.table().splitlines()
+    assert table[0].startswith("operation")
+    assert table[1].startswith("Discrete.__add__ Discrete Discrete")
@@ -1,3 +1,4 @@
+from array import array
 import random
 from tests.utils_for_testing import estimate_probability
 from twistribution.bernoulli import Bernoulli
@@ -93,3 +94,44 @@ def test_comparison_against_uniform_random_pairs():
         # Compare the analytical result with the sampling result
         prob = compare_uniforms(u1, u2)
         assert_close_probability(u1 < u2, Bernoulli(prob))
+
+
+def test_pdf_many_and_cdf_many():
+    u = Uniform(1, 3)
+    xs = [0, 1, 1.5, 3, 4]
+    assert u.pdf_many(xs) == array("d", [0, 0.5, 0.5, 0.5, 0])
+    assert u.cdf_many(memoryview(array("d", xs))) == array("d", [0, 0, 0.25, 1, 1])
+    # a strided view can't be cast, so it is copied value by value
+    assert u.cdf_many(memoryview(array("d", xs))[::2]) == array("d", [0, 0.25, 1])
+
+
+def test_prob_lt_many_and_prob_le_many():
+    u = Uniform(1, 3)
+    thresholds = [4, 1.5, 0]
+    assert list(u.prob_lt_many(thresholds)) == [(u < t).p for t in thresholds]
+    assert u.prob_le_many(thresholds) == u.prob_lt_many(thresholds)
+
+
+def test_sample():
+    draws = Uniform(1, 3).sample(10_000, random.Random(42))
+    assert len(draws) == 10_000
+    assert 1 <= min(draws) and max(draws) < 3
+    assert abs(sum(draws) / len(draws) - 2) < 0.05
+
+
+def test_to_discrete():
+    d = Uniform(0, 1).to_discrete(max_points=4, tail_mass=0)
+    assert list(d.probabilities) == [0.125, 0.375, 0.625, 0.875]
+    assert all(abs(p - 0.25) < 1e-12 for p in d.probabilities.values())
+    d = Uniform(0, 10).to_discrete(max_points=11, tail_mass=0, lattice=1)
+    assert list(d.probabilities) == list(range(11))
+    assert abs(d.probabilities[0] - 0.05) < 1e-12
+    assert abs(d.probabilities[5] - 0.1) < 1e-12
+
+
+def test_quantile():
+    u = Uniform(1, 3)
+    assert u.quantile(0) == 1
+    assert u.quantile(0.25) == 1.5
+    assert u.quantile(1) == 3
+    assert u.quantile_many([0.5, 0.75]) == array("d", [2, 2.5])
@@ -0,0 +1,81 @@
+from array import array
+
+import pytest
+
+from twistribution.bernoulli import Bernoulli
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+from twistribution.uniform import Uniform
+from twistribution.validation import (
+    full_validation,
+    full_validation_enabled,
+    set_full_validation,
+)
+
+
+def test_switch():
+    assert not full_validation_enabled()
+    with full_validation():
+        assert full_validation_enabled()
+    assert not full_validation_enabled()
+    set_full_validation(True)
+    try:
+        assert full_validation_enabled()
+    finally:
+        set_full_validation(False)
+
+
+def test_trusted_construction_skips_validation_unless_switched_on():
+    unsorted = Discrete._trusted(array("q", [2, 1]), array("d", [0.5, 0.5]))
+    assert list(unsorted.probabilities.values()) == [0.5, 0.5]
+    assert Bernoulli._trusted(2).p == 2
+    with full_validation():
+        with pytest.raises(ValueError):
+            Discrete._trusted(array("q", [2, 1]), array("d", [0.5, 0.5]))
+        with pytest.raises(ValueError):
+            Discrete._trusted(array("q", [1, 2]), array("d", [0.5, 0.6]))
+        with pytest.raises(ValueError):
+            Bernoulli._trusted(2)
+        with pytest.raises(ValueError):
+            Poisson._trusted(-1)
+        with pytest.raises(ValueError):
+            Normal._trusted(0, -1)
+        with pytest.raises(ValueError):
+            Uniform._trusted(1, 0)
+
+
+def test_operator_results_are_the_same_either_way():
+    d = Discrete({0: 0.25, 1: 0.5, 3: 0.25})
+    lattice = Discrete({k: 1 / 100 for k in range(100)})
+
+    def results():
+        return [
+            d + 1,
+            d + 0.5,
+            d + d,
+            lattice + lattice,
+            d < 1,
+            d.sum_iid(5),
+            Bernoulli(0.3).sum_iid(4),
+            Poisson(2) + Poisson(3),
+            Poisson(2).to_discrete(),
+            Normal(0, 1) + Normal(1, 2),
+            Normal(0, 1) < 1,
+            Uniform(0, 1) * 2,
+        ]
+
+    trusted = results()
+    with full_validation():
+        validated = results()
+    for a, b in zip(trusted, validated, strict=True):
+        assert type(a) is type(b)
+        assert a == b
+    assert (d + 1)._support.typecode == "q"
+    assert (d + 0.5)._support.typecode == "d"
+
+
+def test_uniform_scaled_by_negative_number():
+    assert Uniform(1, 2) * -2 == Uniform(-4, -2)
+    with pytest.raises(ValueError):
+        Uniform(1, 2) * 0
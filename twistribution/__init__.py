@@ -0,0 +1 @@
+from twistribution.comparison import prob_ge, prob_gt, prob_le, prob_lt
@@ -0,0 +1,131 @@
+"""
+Normal approximations of sums and comparisons, used only when they are provably
+accurate enough.
+
+By the central limit theorem, a sum of many independent terms is close to a Normal
+with the same mean and variance, and the Berry–Esseen theorem bounds how close: for
+independent terms with variances s_i and third absolute central moments r_i, the cdf
+of the sum differs from the Normal cdf by at most C sum(r_i) / sum(s_i) ** 1.5 at
+every point, with C = 0.56.
+
+Exact sums and comparisons of large discrete distributions take time proportional to
+their supports, or worse, whereas the Normal approximation takes microseconds. With an
+error budget set, operations that support it use the approximation whenever its bound
+is within the budget, and record the "normal approximation" path. By default there is
+no budget and every operation is exact. The budget bounds the error of each operation;
+errors of successive approximate operations add up.
+"""
+
+from contextlib import contextmanager
+from math import ceil, erfc, floor, fsum, inf, isfinite, sqrt
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from twistribution.profiling import note_path
+
+_BERRY_ESSEEN_CONSTANT = 0.56
+"""Shevtsova's (2010) constant, which holds for non-identically distributed terms."""
+
+_error_budget = None
+
+
+class Moments(NamedTuple):
+    """
+    What the Berry–Esseen bound needs to know about a distribution: its mean and
+    variance, the total third absolute central moment of the independent terms it is
+    known to be a sum of (or else its own third absolute central moment), and whether
+    it only takes integer values.
+    """
+
+    mean: float
+    variance: float
+    third: float
+    integer: bool
+
+
+def set_error_budget(budget: float | None):
+    """
+    Approximate operations whose error is at most budget, or make every operation exact
+    with None.
+    """
+    global _error_budget
+    if budget is not None and not 0 <= budget <= 1:
+        raise ValueError(f"Error budget must be in the range [0, 1]; got {budget}")
+    _error_budget = budget
+
+
+def error_budget() -> float | None:
+    return _error_budget
+
+
+@contextmanager
+def approximation(budget: float) -> Iterator[None]:
+    """Approximate operations whose error is at most budget within the context."""
+    previous = _error_budget
+    set_error_budget(budget)
+    try:
+        yield
+    finally:
+        set_error_budget(previous)
+
+
+def berry_esseen_bound(variance: float, third: float) -> float:
+    """
+    The largest possible difference between the cdf of a sum of independent terms and
+    the cdf of its Normal approximation, given the totals of the terms' variances and
+    third absolute central moments.
+    """
+    if variance <= 0:
+        return inf
+    return min(1.0, _BERRY_ESSEEN_CONSTANT * third / variance**1.5)
+
+
+def approximate_sum(terms: Iterable[Any], copies: int = 1):
+    """
+    The Normal approximation of the sum of the given number of independent copies of
+    each of the terms, or None if its error isn't within the budget.
+    """
+    budget = _error_budget
+    if budget is None:
+        return None
+    moments = [term._clt_moments() for term in terms]
+    variance = copies * fsum(m.variance for m in moments)
+    if berry_esseen_bound(variance, copies * fsum(m.third for m in moments)) > budget:
+        return None
+    # avoid cyclic dependency by importing here
+    from twistribution.normal import Normal
+
+    note_path("normal approximation")
+    return Normal._trusted(copies * fsum(m.mean for m in moments), sqrt(variance))
+
+
+def approximate_below(x: Any, y: Any, inclusive: bool) -> float | None:
+    """
+    P(X < Y), or P(X <= Y) if inclusive, from the Normal approximation of X - Y, or
+    None if its error isn't within the budget. Y may be a number.
+
+    When X - Y only takes integer values, the threshold is moved half way to the next
+    value excluded (a continuity correction). The cdf of X - Y is flat over that half
+    step, so the bound still applies, and the estimate is usually much better.
+    """
+    budget = _error_budget
+    if budget is None:
+        return None
+    first = x._clt_moments()
+    if isinstance(y, (int, float)):
+        if not isfinite(y):
+            return None
+        mean, variance, third, integer = first
+        threshold = y
+    else:
+        second = y._clt_moments()
+        mean = first.mean - second.mean
+        variance = first.variance + second.variance
+        third = first.third + second.third
+        integer = first.integer and second.integer
+        threshold = 0
+    if berry_esseen_bound(variance, third) > budget:
+        return None
+    if integer:
+        threshold = floor(threshold) + 0.5 if inclusive else ceil(threshold) - 0.5
+    note_path("normal approximation")
+    return erfc((mean - threshold) / sqrt(2 * variance)) / 2
@@ -1,11 +1,23 @@
-from typing import Any
+import random
+from array import array
+from typing import Any, Iterable
 
 from twistribution.constant import Constant
 from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
-from twistribution.distribution import DiscreteDistribution
+from twistribution.distribution import (
+    DiscreteDistribution,
+    as_bernoulli,
+    as_float_array,
+    check_level,
+    uniform_source,
+)
+from twistribution.profiling import profiled
+from twistribution.validation import full_validation_enabled
 
 
 class Bernoulli(DiscreteDistribution):
+    __slots__ = ("p",)
+
     def __init__(
         self, p: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
     ):
@@ -23,38 +35,117 @@ class Bernoulli(DiscreteDistribution):
             else:
                 raise ValueError(f"Probability p must be in the range [0, 1]; got {p}.")
 
+    @classmethod
+    def _trusted(
+        cls, p: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
+    ) -> "Bernoulli":
+        """
+        A Bernoulli built without validation, for results computed by operations.
+        With full validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(p, equality_tolerance)
+        result = cls.__new__(cls)
+        result.equality_tolerance = equality_tolerance
+        result.p = p
+        return result
+
     def parameters(self) -> tuple[Any, ...]:
         return (self.p,)
 
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        uniform = uniform_source(n, rng)
+        p = self.p
+        return array("d", [uniform() < p for _ in range(n)])
+
     def mean(self):
         return self.p
 
+    def quantile(self, q: float) -> int:
+        check_level(q)
+        return 0 if q <= 1 - self.p else 1
+
     def variance(self):
         return self.p * (1 - self.p)
 
-    def __lt__(self, other):
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        q = 1 - self.p
+        return array(
+            "d",
+            [
+                0.0 if t <= 0 else q if t <= 1 else 1.0
+                for t in as_float_array(thresholds)
+            ],
+        )
+
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        q = 1 - self.p
+        return array(
+            "d",
+            [0.0 if t < 0 else q if t < 1 else 1.0 for t in as_float_array(thresholds)],
+        )
+
+    def _prob_lt(self, other) -> float:
         if isinstance(other, (float, int)):
             if other <= 0:
-                return Constant(0)
+                return 0.0
             elif other > 1:
-                return Constant(1)
+                return 1.0
             else:
-                return Bernoulli(1 - self.p)
+                return 1 - self.p
         elif isinstance(other, Bernoulli):
             this_0_and_other_1 = (1 - self.p) * other.p
-            return Bernoulli(this_0_and_other_1)
+            return this_0_and_other_1
         return NotImplemented
 
-    def __le__(self, other):
+    def _prob_le(self, other) -> float:
         if isinstance(other, (float, int)):
             if other < 0:
-                return Constant(0)
+                return 0.0
             elif other >= 1:
-                return Bernoulli(1)
+                return 1.0
             else:
-                return Bernoulli(1 - self.p)
+                return 1 - self.p
         elif isinstance(other, Bernoulli):
             this_0 = 1 - self.p
             this_1_and_other_1 = self.p * other.p
-            return Bernoulli(this_0 + this_1_and_other_1)
+            return this_0 + this_1_and_other_1
         return NotImplemented
+
+    @profiled
+    def __lt__(self, other):
+        # certain outcomes against scalars are Constants
+        if isinstance(other, (float, int)) and (other <= 0 or other > 1):
+            return Constant._trusted(int(other > 1))
+        return as_bernoulli(self._prob_lt(other))
+
+    @profiled
+    def __le__(self, other):
+        if isinstance(other, (float, int)) and other < 0:
+            return Constant._trusted(0)
+        return as_bernoulli(self._prob_le(other))
+
+    @profiled
+    def __add__(self, other):
+        if isinstance(other, Bernoulli):
+            # avoid cyclic dependency by importing here
+            from twistribution.binomial import Binomial
+            from twistribution.poisson_binomial import PoissonBinomial
+
+            if self.approximately_equal(self.p, other.p):
+                return Binomial._trusted(2, self.p)
+            return PoissonBinomial._trusted(
+                array("d", [min(max(b.p, 0.0), 1.0) for b in (self, other)]),
+                self.equality_tolerance,
+            )
+        return NotImplemented
+
+    @profiled
+    def sum_iid(self, n: int):
+        """Distribution of the number of successes in n independent trials."""
+        # avoid cyclic dependency by importing here
+        from twistribution.binomial import Binomial
+
+        if n < 1:
+            raise ValueError(f"Number of copies must be at least 1; got {n}")
+        return Binomial._trusted(n, min(max(self.p, 0.0), 1.0), self.equality_tolerance)
@@ -0,0 +1,368 @@
+import math
+import random
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable
+
+from twistribution.approximation import Moments, approximate_below
+from twistribution.bernoulli import Bernoulli
+from twistribution.cache import cached
+from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
+from twistribution.discrete import Discrete
+from twistribution.distribution import (
+    DiscreteDistribution,
+    as_bernoulli,
+    as_float_array,
+    check_level,
+)
+from twistribution.poisson import _deviance, _search_lower_tail, _stirling_error
+from twistribution.poisson_binomial import PoissonBinomial
+from twistribution.profiling import note_path, profiled
+from twistribution.validation import full_validation_enabled
+
+_TABLE_HALF_WIDTH = 10
+"""Standard deviations either side of the mean covered by the cached cdf table."""
+
+_TAIL_PRECISION = 1e-17
+"""Relative size of the term at which tail sums outside the cdf table stop."""
+
+
+class Binomial(DiscreteDistribution):
+    """
+    The number of successes in n independent trials that each succeed with
+    probability p.
+
+    Nothing proportional to n is ever stored: the pmf comes from Loader's saddle point
+    expansion, and the cdf from a cached table covering the values within a few
+    standard deviations of the mean, so n can run into the millions.
+    """
+
+    __slots__ = ("n", "p", "_table_start", "_cumulative", "_discrete")
+
+    def __init__(
+        self, n: int, p: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
+    ):
+        super().__init__(equality_tolerance)
+        if not isinstance(n, int) or n < 1:
+            raise ValueError(f"Number of trials must be a positive integer; got {n}")
+        if p < 0:
+            if p < -equality_tolerance:
+                raise ValueError(f"Probability p must be in the range [0, 1]; got {p}")
+            p = 0.0
+        elif p > 1:
+            if p > 1 + equality_tolerance:
+                raise ValueError(f"Probability p must be in the range [0, 1]; got {p}")
+            p = 1.0
+        self.n = n
+        self.p = p
+        self._table_start = None
+        self._cumulative = None
+        self._discrete = {}
+
+    @classmethod
+    def _trusted(
+        cls, n: int, p: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
+    ) -> "Binomial":
+        """
+        A Binomial built without validation, for results computed by operations. With
+        full validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(n, p, equality_tolerance)
+        result = cls.__new__(cls)
+        result.equality_tolerance = equality_tolerance
+        result.n = n
+        result.p = p
+        result._table_start = None
+        result._cumulative = None
+        result._discrete = {}
+        return result
+
+    def parameters(self) -> tuple[Any, ...]:
+        return self.n, self.p
+
+    def mean(self) -> float:
+        return self.n * self.p
+
+    def variance(self) -> float:
+        return self.n * self.p * (1 - self.p)
+
+    def _clt_moments(self) -> Moments:
+        # each trial's third absolute central moment is p q (p^2 + q^2)
+        p, q = self.p, 1 - self.p
+        return Moments(
+            self.mean(), self.variance(), self.n * p * q * (p * p + q * q), True
+        )
+
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        """n independent draws, made from the cached to_discrete() materialisation."""
+        return self.to_discrete().sample(n, rng)
+
+    def pmf(self, x: float | int) -> float:
+        if not float(x).is_integer() or not 0 <= x <= self.n:
+            return 0.0
+        return self._pmf(int(x))
+
+    def _pmf(self, k: int) -> float:
+        """
+        Probability of exactly k successes, computed in log space so it never
+        underflows early, using Loader's saddle point expansion.
+        """
+        n, p = self.n, self.p
+        if p == 0 or p == 1:
+            return float(k == n * p)
+        if k == 0:
+            return math.exp(n * math.log1p(-p))
+        if k == n:
+            return math.exp(n * math.log(p))
+        log_pmf = (
+            _stirling_error(n)
+            - _stirling_error(k)
+            - _stirling_error(n - k)
+            - _deviance(k, n * p)
+            - _deviance(n - k, n * (1 - p))
+        )
+        return math.exp(log_pmf) / math.sqrt(2 * math.pi * k * (1 - k / n))
+
+    def cdf(self, x: float | int) -> float:
+        if x < 0:
+            return 0.0
+        if x >= self.n:
+            return 1.0
+        k = math.floor(x)
+        start, cumulative = self._cumulative_table()
+        if k < start:
+            return self._lower_tail(k)
+        if k < start + len(cumulative):
+            return cumulative[k - start]
+        return 1.0 - self._upper_tail(k)
+
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        return array("d", map(self.cdf, as_float_array(xs)))
+
+    def quantile(self, q: float) -> int:
+        """
+        The smallest k with cdf(k) >= q, by binary search of the cached cdf table,
+        or of the lower tail sums for the rare levels below it.
+        """
+        check_level(q)
+        if q == 0:
+            return self.n if self.p == 1 else 0
+        start, cumulative = self._cumulative_table()
+        if q > cumulative[-1]:
+            k = start + len(cumulative)
+            while k < self.n and self.cdf(k) < q:
+                k += 1
+            return min(k, self.n)
+        index = bisect_left(cumulative, q)
+        if index == 0:
+            return _search_lower_tail(self._lower_tail, q, start)
+        return start + index
+
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        # X < t exactly when X <= ceil(t) - 1
+        return self.cdf_many(
+            [
+                math.ceil(t) - 1 if math.isfinite(t) else t
+                for t in as_float_array(thresholds)
+            ]
+        )
+
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        return self.cdf_many(thresholds)
+
+    def _cumulative_table(self) -> tuple[int, array]:
+        """
+        The first value covered and the cdf values for a window around the mean.
+
+        The window spans _TABLE_HALF_WIDTH standard deviations either side of the mean
+        and is built once per instance from the pmf recurrence
+        P(k + 1) = P(k) (n - k) p / ((k + 1) (1 - p)), working outwards from the
+        mode so that no intermediate value underflows.
+        """
+        if self._cumulative is None:
+            n, p = self.n, self.p
+            half_width = _TABLE_HALF_WIDTH * math.sqrt(self.variance())
+            start = max(0, math.floor(self.mean() - half_width))
+            end = min(n, math.ceil(self.mean() + half_width))
+            mode = min(math.floor((n + 1) * p), n)
+
+            probabilities = [0.0] * (end - start + 1)
+            p_mode = probabilities[mode - start] = self._pmf(mode)
+            if mode > start:
+                odds = (1 - p) / p
+                term = p_mode
+                for k in range(mode, start, -1):
+                    term *= k / (n - k + 1) * odds
+                    probabilities[k - 1 - start] = term
+            if mode < end:
+                odds = p / (1 - p)
+                term = p_mode
+                for k in range(mode, end):
+                    term *= (n - k) / (k + 1) * odds
+                    probabilities[k + 1 - start] = term
+
+            total = self._lower_tail(start - 1) if start > 0 else 0.0
+            cumulative = array("d")
+            for term in probabilities:
+                total += term
+                cumulative.append(min(total, 1.0))
+
+            self._table_start = start
+            self._cumulative = cumulative
+        return self._table_start, self._cumulative
+
+    def _lower_tail(self, k: int) -> float:
+        """
+        P(X <= k) for k below the mean, summing pmf terms downwards from k. The sum
+        stops at subnormal terms, as Poisson's does.
+        """
+        if k < 0:
+            return 0.0
+        n = self.n
+        odds = (1 - self.p) / self.p
+        term = total = self._pmf(k)
+        while k > 0 and term > max(total * _TAIL_PRECISION, sys.float_info.min):
+            term *= k / (n - k + 1) * odds
+            total += term
+            k -= 1
+        return total
+
+    def _upper_tail(self, k: int) -> float:
+        """P(X > k) for k above the mean, summing pmf terms upwards from k + 1."""
+        n = self.n
+        if k >= n:
+            return 0.0
+        odds = self.p / (1 - self.p)
+        k += 1
+        term = total = self._pmf(k)
+        while k < n and term > total * _TAIL_PRECISION:
+            term *= (n - k) / (k + 1) * odds
+            total += term
+            k += 1
+        return total
+
+    @profiled
+    def to_discrete(self, tail_mass: float = 1e-10) -> Discrete:
+        """
+        A Discrete approximation that leaves out at most tail_mass from each tail.
+
+        The retained probabilities are rescaled to sum to 1. Results are cached per
+        tail_mass.
+        """
+        if tail_mass not in self._discrete:
+            start, cumulative = self._cumulative_table()
+            low = start + min(bisect_right(cumulative, tail_mass), len(cumulative) - 1)
+            high = start + min(
+                bisect_left(cumulative, 1 - tail_mass), len(cumulative) - 1
+            )
+            probabilities = [self._pmf(k) for k in range(low, high + 1)]
+            total = sum(probabilities)
+            self._discrete[tail_mass] = Discrete._trusted(
+                array("q", range(low, high + 1)),
+                array("d", [p / total for p in probabilities]),
+            )
+        return self._discrete[tail_mass]
+
+    def _probability_below_other(self, other: "Binomial", inclusive: bool) -> float:
+        """
+        P(X < Y), or P(X <= Y) if inclusive, where X is self and Y is other.
+
+        This is the sum over y of P(Y = y) P(X <= y - shift). Only the window where
+        P(X <= y - shift) comes from this cdf table is summed term by term; above it
+        the rest of the sum is just P(Y >= y), and below it the terms are negligible.
+        """
+        note_path("merge")
+        shift = 0 if inclusive else 1
+        start, cumulative = self._cumulative_table()
+        other_start, _ = other._cumulative_table()
+
+        # y for which y - shift is past the end of this table
+        beyond = start + len(cumulative) + shift
+        total = 1.0 - other.cdf(beyond - 1)
+
+        first = max(start + shift, other_start)
+        last = min(beyond, other.n + 1)
+        if first < last:
+            odds = other.p / (1 - other.p) if other.p < 1 else 0.0
+            p = other._pmf(first)
+            for y in range(first, last):
+                if p == 0.0 and y > other.mean():
+                    break
+                total += p * cumulative[y - shift - start]
+                p *= (other.n - y) / (y + 1) * odds
+        return min(total, 1.0)
+
+    @profiled
+    @cached
+    def __lt__(self, other):
+        return as_bernoulli(self._prob_lt(other))
+
+    @profiled
+    @cached
+    def __le__(self, other):
+        return as_bernoulli(self._prob_le(other))
+
+    def _prob_lt(self, other) -> float:
+        if isinstance(other, (Binomial, float, int)):
+            approximate = approximate_below(self, other, inclusive=False)
+            if approximate is not None:
+                return approximate
+        if isinstance(other, Binomial):
+            return self._probability_below_other(other, inclusive=False)
+        if isinstance(other, (float, int)):
+            if not math.isfinite(other):
+                return self.cdf(other)
+            return self.cdf(math.ceil(other) - 1)
+        return NotImplemented
+
+    def _prob_le(self, other) -> float:
+        if isinstance(other, (Binomial, float, int)):
+            approximate = approximate_below(self, other, inclusive=True)
+            if approximate is not None:
+                return approximate
+        if isinstance(other, Binomial):
+            return self._probability_below_other(other, inclusive=True)
+        if isinstance(other, (float, int)):
+            return self.cdf(other)
+        return NotImplemented
+
+    @profiled
+    def __add__(self, other):
+        if isinstance(other, Binomial):
+            if self.approximately_equal(self.p, other.p):
+                return Binomial._trusted(self.n + other.n, self.p)
+        elif isinstance(other, Bernoulli):
+            if self.approximately_equal(self.p, other.p):
+                return Binomial._trusted(self.n + 1, self.p)
+        elif isinstance(other, (float, int, Discrete)):
+            return self.to_discrete() + other
+        elif not isinstance(other, PoissonBinomial):
+            return NotImplemented
+        note_path("poisson binomial")
+        return PoissonBinomial._trusted(
+            _event_probabilities(self) + _event_probabilities(other),
+            self.equality_tolerance,
+        )
+
+    @profiled
+    def sum_iid(self, n: int) -> "Binomial":
+        """Distribution of the sum of n independent copies of this distribution."""
+        if n < 1:
+            raise ValueError(f"Number of copies must be at least 1; got {n}")
+        return Binomial._trusted(self.n * n, self.p)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+def _event_probabilities(
+    distribution: Binomial | Bernoulli | PoissonBinomial,
+) -> array:
+    """The success probability of each trial making up the distribution."""
+    if isinstance(distribution, Binomial):
+        return array("d", [distribution.p]) * distribution.n
+    if isinstance(distribution, Bernoulli):
+        return array("d", [min(max(distribution.p, 0.0), 1.0)])
+    return distribution.probabilities
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Hashable, Iterator
+
+from twistribution.approximation import error_budget
+from twistribution.profiling import note_path
+
+
+class ResultCache:
+    """
+    A bounded cache of operation results, evicting the least recently used entry
+    once it holds maxsize results.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1; got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __repr__(self):
+        return (
+            f"ResultCache(maxsize={self.maxsize}, size={len(self)}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """The cached result for key, computing and storing it if there isn't one."""
+        try:
+            result = self._results[key]
+        except KeyError:
+            note_path("cache miss")
+            self.misses += 1
+            result = self._results[key] = compute()
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        else:
+            note_path("cache hit")
+            self.hits += 1
+            self._results.move_to_end(key)
+        return result
+
+    def clear(self):
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_active_cache = None
+
+
+def set_cache(cache: ResultCache | None):
+    """Use the given cache for all cached operations, or stop caching with None."""
+    global _active_cache
+    _active_cache = cache
+
+
+@contextmanager
+def caching(maxsize: int = 1024) -> Iterator[ResultCache]:
+    """Cache operation results within the context, in a new cache that is yielded."""
+    previous = _active_cache
+    cache = ResultCache(maxsize)
+    set_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_cache(previous)
+
+
+def cached(operation: Callable) -> Callable:
+    """
+    Cache a distribution method's results in the active cache, if there is one.
+
+    The key is the method, the error budget for approximations, and the cache keys
+    of the distribution and its arguments. Calls with arguments that can't be keyed
+    are not cached.
+    """
+    name = operation.__qualname__
+
+    @wraps(operation)
+    def wrapper(self, *args, **kwargs):
+        cache = _active_cache
+        if cache is None:
+            return operation(self, *args, **kwargs)
+        try:
+            key = (
+                name,
+                error_budget(),
+                self.cache_key(),
+                *(_argument_key(arg) for arg in args),
+                *((k, _argument_key(v)) for k, v in sorted(kwargs.items())),
+            )
+        except TypeError:
+            return operation(self, *args, **kwargs)
+        return cache.get_or_compute(key, lambda: operation(self, *args, **kwargs))
+
+    return wrapper
+
+
+def _argument_key(value: Any) -> Hashable:
+    if isinstance(value, (int, float)):
+        return type(value), value
+    cache_key = getattr(value, "cache_key", None)
+    if cache_key is None:
+        raise TypeError(f"Cannot make a cache key for {type(value)}")
+    return cache_key()
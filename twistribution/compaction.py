@@ -0,0 +1,124 @@
+from math import fsum, sqrt
+
+
+class Compaction:
+    """
+    Limits on the support of a Discrete, to stop it growing without bound through
+    chains of operations.
+
+    Tail values are trimmed first: as many values as possible are removed from each
+    end while the total removed from that end stays within tail_mass, and the removed
+    mass is added to the outermost remaining value. Then, if more than max_points
+    values remain, they are grouped into max_points equal-width bins and each bin's
+    mass is placed at its centre of mass, which keeps the mean unchanged. Binning
+    narrows the distribution, so with preserve_moments the result is finally shifted
+    and scaled to restore the original mean and variance.
+    """
+
+    __slots__ = ("max_points", "tail_mass", "preserve_moments")
+
+    def __init__(
+        self,
+        max_points: int | None = None,
+        tail_mass: float = 0.0,
+        preserve_moments: bool = False,
+    ):
+        if max_points is not None and max_points < 1:
+            raise ValueError(f"max_points must be at least 1; got {max_points}")
+        if not 0 <= tail_mass < 0.5:
+            raise ValueError(
+                f"tail_mass must be in the range [0, 0.5); got {tail_mass}"
+            )
+        self.max_points = max_points
+        self.tail_mass = tail_mass
+        self.preserve_moments = preserve_moments
+
+    def __repr__(self):
+        return (
+            f"Compaction(max_points={self.max_points}, tail_mass={self.tail_mass}, "
+            f"preserve_moments={self.preserve_moments})"
+        )
+
+    def apply(
+        self, support: list[float], probabilities: list[float]
+    ) -> tuple[list[float], list[float]]:
+        """The compacted support and probabilities, both sorted by value."""
+        if self.preserve_moments:
+            original_moments = _moments(support, probabilities)
+        if self.tail_mass > 0:
+            support, probabilities = self._trim_tails(support, probabilities)
+        if self.max_points is not None and len(support) > self.max_points:
+            support, probabilities = self._rebin(support, probabilities)
+        if self.preserve_moments:
+            support = _match_moments(support, probabilities, *original_moments)
+        return support, probabilities
+
+    def _trim_tails(
+        self, support: list[float], probabilities: list[float]
+    ) -> tuple[list[float], list[float]]:
+        first = 0
+        low_mass = 0.0
+        while (
+            first < len(support) - 1
+            and low_mass + probabilities[first] <= self.tail_mass
+        ):
+            low_mass += probabilities[first]
+            first += 1
+
+        last = len(support) - 1
+        high_mass = 0.0
+        while last > first and high_mass + probabilities[last] <= self.tail_mass:
+            high_mass += probabilities[last]
+            last -= 1
+
+        if first == 0 and last == len(support) - 1:
+            return support, probabilities
+        support = support[first : last + 1]
+        probabilities = probabilities[first : last + 1]
+        probabilities[0] += low_mass
+        probabilities[-1] += high_mass
+        return support, probabilities
+
+    def _rebin(
+        self, support: list[float], probabilities: list[float]
+    ) -> tuple[list[float], list[float]]:
+        bins = self.max_points
+        low = support[0]
+        width = (support[-1] - low) / bins
+        masses = [0.0] * bins
+        moments = [0.0] * bins
+        counts = [0] * bins
+        values = [0.0] * bins
+        for x, p in zip(support, probabilities):
+            i = min(int((x - low) / width), bins - 1)
+            masses[i] += p
+            moments[i] += p * x
+            counts[i] += 1
+            values[i] = x
+
+        new_support = []
+        new_probabilities = []
+        for mass, moment, count, value in zip(masses, moments, counts, values):
+            if mass > 0:
+                # a bin holding a single value keeps it exactly
+                new_support.append(value if count == 1 else moment / mass)
+                new_probabilities.append(mass)
+        return new_support, new_probabilities
+
+
+def _moments(support: list[float], probabilities: list[float]) -> tuple[float, float]:
+    """Mean and variance."""
+    mean = fsum(x * p for x, p in zip(support, probabilities))
+    variance = fsum((x - mean) ** 2 * p for x, p in zip(support, probabilities))
+    return mean, variance
+
+
+def _match_moments(
+    support: list[float], probabilities: list[float], mean: float, variance: float
+) -> list[float]:
+    """The support shifted and scaled so the distribution has the given moments."""
+    current_mean, current_variance = _moments(support, probabilities)
+    if current_variance == 0:
+        return [mean] * len(support)
+    scale = sqrt(variance / current_variance)
+    return [mean + (x - current_mean) * scale for x in support]
@@ -0,0 +1,73 @@
+"""
+Probabilities of comparisons between independent distributions, as plain floats.
+
+These are the kernels behind the comparison operators, without building a Bernoulli
+for the result, for loops that only need the number. Each follows Python's rules for
+the operators: the left operand's kernel is tried first, then the reflected kernel of
+the right operand.
+"""
+
+import operator
+from typing import Any, Callable
+
+from twistribution.distribution import Distribution
+
+
+def prob_lt(a: Any, b: Any) -> float:
+    """P(a < b), for distributions or numbers a and b."""
+    if isinstance(a, Distribution):
+        p = a._prob_lt(b)
+        if p is not NotImplemented:
+            return p
+    if isinstance(b, Distribution):
+        p = b._prob_gt(a)
+        if p is not NotImplemented:
+            return p
+    return _compare_numbers(a, b, operator.lt, "<")
+
+
+def prob_le(a: Any, b: Any) -> float:
+    """P(a <= b), for distributions or numbers a and b."""
+    if isinstance(a, Distribution):
+        p = a._prob_le(b)
+        if p is not NotImplemented:
+            return p
+    if isinstance(b, Distribution):
+        p = b._prob_ge(a)
+        if p is not NotImplemented:
+            return p
+    return _compare_numbers(a, b, operator.le, "<=")
+
+
+def prob_gt(a: Any, b: Any) -> float:
+    """P(a > b), for distributions or numbers a and b."""
+    if isinstance(a, Distribution):
+        p = a._prob_gt(b)
+        if p is not NotImplemented:
+            return p
+    if isinstance(b, Distribution):
+        p = b._prob_lt(a)
+        if p is not NotImplemented:
+            return p
+    return _compare_numbers(a, b, operator.gt, ">")
+
+
+def prob_ge(a: Any, b: Any) -> float:
+    """P(a >= b), for distributions or numbers a and b."""
+    if isinstance(a, Distribution):
+        p = a._prob_ge(b)
+        if p is not NotImplemented:
+            return p
+    if isinstance(b, Distribution):
+        p = b._prob_le(a)
+        if p is not NotImplemented:
+            return p
+    return _compare_numbers(a, b, operator.ge, ">=")
+
+
+def _compare_numbers(a: Any, b: Any, comparison: Callable, symbol: str) -> float:
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return float(comparison(a, b))
+    raise TypeError(
+        f"Unsupported comparison: {type(a).__name__} {symbol} {type(b).__name__}"
+    )
@@ -1,5 +1,14 @@
-from typing import Any
-from twistribution.distribution import DiscreteDistribution
+import random
+from array import array
+from typing import Any, Iterable
+
+from twistribution.distribution import (
+    DiscreteDistribution,
+    as_float_array,
+    check_level,
+    uniform_source,
+)
+from twistribution.validation import full_validation_enabled
 
 
 class Constant(DiscreteDistribution):
@@ -7,19 +16,57 @@ class Constant(DiscreteDistribution):
     A constant value with a probability of 1.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: float):
         super().__init__(equality_tolerance=0)
         self.value = value
 
+    @classmethod
+    def _trusted(cls, value: float) -> "Constant":
+        """
+        A Constant built directly, for results computed by operations. With full
+        validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(value)
+        result = cls.__new__(cls)
+        result.equality_tolerance = 0
+        result.value = value
+        return result
+
     def parameters(self) -> tuple[Any, ...]:
         return (self.value,)
 
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        uniform_source(n, rng)
+        return array("d", [self.value]) * n
+
+    def quantile(self, q: float) -> float:
+        check_level(q)
+        return self.value
+
     def pmf(self, x: float) -> float:
         return 1 if x == self.value else 0
 
     def cdf(self, x: float) -> float:
         return 1 if x >= self.value else 0
 
+    def pmf_many(self, xs: Iterable[float]) -> array:
+        value = self.value
+        return array("d", [x == value for x in as_float_array(xs)])
+
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        value = self.value
+        return array("d", [x >= value for x in as_float_array(xs)])
+
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        value = self.value
+        return array("d", [value < t for t in as_float_array(thresholds)])
+
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        return self.cdf_many(thresholds)
+
     @property
     def mean(self) -> float:
         return self.value
@@ -28,20 +75,32 @@ class Constant(DiscreteDistribution):
     def variance(self) -> float:
         return 0
 
-    def __lt__(self, other):
+    def _prob_lt(self, other) -> float:
         if isinstance(other, Constant):
-            return Constant(int(self.value < other.value))
+            return float(self.value < other.value)
         if isinstance(other, (int, float)):
-            return Constant(int(self.value < other))
+            return float(self.value < other)
         return NotImplemented
 
-    def __le__(self, other):
+    def _prob_le(self, other) -> float:
         if isinstance(other, Constant):
-            return Constant(int(self.value <= other.value))
+            return float(self.value <= other.value)
         if isinstance(other, (int, float)):
-            return Constant(int(self.value <= other))
+            return float(self.value <= other)
         return NotImplemented
 
+    def __lt__(self, other):
+        return _as_constant(self._prob_lt(other))
+
+    def __le__(self, other):
+        return _as_constant(self._prob_le(other))
+
+    def __gt__(self, other):
+        return _as_constant(self._prob_gt(other))
+
+    def __ge__(self, other):
+        return _as_constant(self._prob_ge(other))
+
     def __eq__(self, other):
         if not isinstance(other, Constant):
             return NotImplemented
@@ -53,28 +112,33 @@ class Constant(DiscreteDistribution):
 
     def __add__(self, other):
         if isinstance(other, (int, float)):
-            return Constant(self.value + other)
+            return Constant._trusted(self.value + other)
         if isinstance(other, Constant):
-            return Constant(self.value + other.value)
+            return Constant._trusted(self.value + other.value)
         return NotImplemented
 
     def __sub__(self, other):
         if isinstance(other, (int, float)):
-            return Constant(self.value - other)
+            return Constant._trusted(self.value - other)
         if isinstance(other, Constant):
-            return Constant(self.value - other.value)
+            return Constant._trusted(self.value - other.value)
         return NotImplemented
 
     def __mul__(self, other):
         if isinstance(other, (int, float)):
-            return Constant(self.value * other)
+            return Constant._trusted(self.value * other)
         if isinstance(other, Constant):
-            return Constant(self.value * other.value)
+            return Constant._trusted(self.value * other.value)
         return NotImplemented
 
     def __truediv__(self, other):
         if isinstance(other, (int, float)):
-            return Constant(self.value / other)
+            return Constant._trusted(self.value / other)
         if isinstance(other, Constant):
-            return Constant(self.value / other.value)
+            return Constant._trusted(self.value / other.value)
         return NotImplemented
+
+
+def _as_constant(p: float) -> Constant:
+    """The certain outcome of a comparison as a Constant 0 or 1."""
+    return p if p is NotImplemented else Constant._trusted(int(p))
@@ -0,0 +1,55 @@
+"""
+Fast linear convolution of non-negative sequences.
+
+The sequences are packed into the digits of two very large integers (Kronecker
+substitution), which the standard library's decimal module multiplies with a
+number-theoretic transform. This keeps the library free of non-dev dependencies while
+giving O((n + m) log(n + m)) convolution with exact integer arithmetic.
+"""
+
+from decimal import Context, Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN
+
+_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+FIXED_POINT_BITS = 62
+"""Bits of precision used when converting floats to integers for convolution."""
+
+
+def convolve_integers(a: list[int], b: list[int]) -> list[int]:
+    """Exact linear convolution of two sequences of non-negative integers."""
+    if not a or not b:
+        return []
+    length = len(a) + len(b) - 1
+    # no output can exceed the largest value of one input times the sum of the other
+    width = len(str(min(max(a) * sum(b), max(b) * sum(a)))) + 1
+    product = _CONTEXT.multiply(_pack(a, width), _pack(b, width))
+    digits = format(product, "f").rjust(width * length, "0")
+    return [int(digits[i : i + width]) for i in range(0, width * length, width)][::-1]
+
+
+def convolve(a: list[float], b: list[float]) -> list[float]:
+    """
+    Linear convolution of two sequences of non-negative floats.
+
+    Each input is scaled so its largest value uses FIXED_POINT_BITS bits, so the
+    absolute error of each output is of the order of 2**-FIXED_POINT_BITS times the
+    largest values of the inputs.
+    """
+    if not a or not b:
+        return []
+    max_a = max(a)
+    max_b = max(b)
+    if max_a == 0 or max_b == 0:
+        return [0.0] * (len(a) + len(b) - 1)
+    scale_a = (1 << FIXED_POINT_BITS) / max_a
+    scale_b = (1 << FIXED_POINT_BITS) / max_b
+    result = convolve_integers(
+        [round(x * scale_a) for x in a], [round(x * scale_b) for x in b]
+    )
+    unscale = 1 / (scale_a * scale_b)
+    return [r * unscale for r in result]
+
+
+def _pack(values: list[int], width: int) -> Decimal:
+    """One big integer whose base 10**width digits are the values, lowest first."""
+    return Decimal("".join(f"{value:0{width}d}" for value in reversed(values)))
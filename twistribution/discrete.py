@@ -1,116 +1,625 @@
+import random
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from typing import Any
+from collections.abc import ItemsView, Mapping, ValuesView
+from itertools import accumulate
+from math import fsum, gcd
+from operator import mul
+from typing import Any, Iterable
 
-from twistribution.bernoulli import Bernoulli
+from twistribution.approximation import (
+    Moments,
+    approximate_below,
+    approximate_sum,
+    error_budget,
+)
+from twistribution.cache import cached
+from twistribution.compaction import Compaction
 from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
-from twistribution.distribution import DiscreteDistribution
+from twistribution.convolution import convolve, convolve_integers
+from twistribution.distribution import (
+    ContinuousDistribution,
+    DiscreteDistribution,
+    as_bernoulli,
+    as_float_array,
+    check_level,
+    uniform_source,
+)
+from twistribution.profiling import note_path, profiled
+from twistribution.validation import full_validation_enabled
+
+_LATTICE_MIN_PAIRS = 4096
+"""Smallest number of support pairs for which a lattice convolution is attempted."""
+
+_LATTICE_COST_RATIO = 20
+"""How many support pairs a lattice point must save for lattice convolution to pay off."""
+
+_LATTICE_TOLERANCE = 1e-9
+"""Relative tolerance when checking that float values sit on a lattice."""
 
 
 class Discrete(DiscreteDistribution):
     """
     Numerical values and associated probabilities.
+
+    The values and probabilities are held in two parallel arrays, sorted by value;
+    the probabilities attribute is a read-only mapping view onto them.
+
+    If a compaction is given, it is applied to the result of every operation on this
+    distribution, and the result keeps it for further operations.
     """
 
+    __slots__ = (
+        "compaction",
+        "_support",
+        "_probabilities",
+        "_cumulative",
+        "_key",
+        "_alias",
+        "_third_moment",
+    )
+
     def __init__(
         self,
         probabilities: dict[float | int, float],
         equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE,
+        compaction: Compaction | None = None,
     ):
         super().__init__(equality_tolerance)
 
         if not probabilities:
             raise ValueError("Probabilities cannot be empty")
 
-        key_list = list(probabilities.keys())
-        for k1, k2 in zip(key_list, key_list[1:]):
+        support = _support_array(probabilities.keys())
+        for k1, k2 in zip(support, support[1:]):
             if k1 > k2:
                 raise ValueError("Keys must be in ascending order")
 
-        sum_of_probabilities = sum(probabilities.values())
+        values = array("d", probabilities.values())
+        sum_of_probabilities = fsum(values)
         if abs(1 - sum_of_probabilities) > 1e-8:
             raise ValueError("Probability values must sum to 1")
 
-        self.probabilities = probabilities
+        self.compaction = compaction
+        self._support = support
+        self._probabilities = values
+        self._cumulative = None
+        self._key = None
+        self._alias = None
+        self._third_moment = None
+
+    @classmethod
+    def _trusted(
+        cls,
+        support: array,
+        probabilities: array,
+        equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE,
+        compaction: Compaction | None = None,
+    ) -> "Discrete":
+        """
+        A Discrete built without validation or copying, for results computed by
+        operations. The support must be sorted, and an array of type 'q' if all the
+        values are integers; the arrays must not be changed afterwards. With full
+        validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(
+                dict(zip(support, probabilities)), equality_tolerance, compaction
+            )
+        result = cls.__new__(cls)
+        result.equality_tolerance = equality_tolerance
+        result.compaction = compaction
+        result._support = support
+        result._probabilities = probabilities
+        result._cumulative = None
+        result._key = None
+        result._alias = None
+        result._third_moment = None
+        return result
+
+    @property
+    def probabilities(self) -> Mapping[float | int, float]:
+        return _ProbabilityView(self)
 
     def parameters(self) -> tuple[Any, ...]:
         return self.probabilities, self.equality_tolerance
 
+    def cache_key(self) -> tuple[Any, ...]:
+        if self._key is None:
+            compaction = self.compaction
+            self._key = (
+                Discrete,
+                self.equality_tolerance,
+                (
+                    None
+                    if compaction is None
+                    else (
+                        compaction.max_points,
+                        compaction.tail_mass,
+                        compaction.preserve_moments,
+                    )
+                ),
+                tuple(self._support),
+                tuple(self._quantize(p) for p in self._probabilities),
+            )
+        return self._key
+
     def __eq__(self, other):
         if not isinstance(other, Discrete):
             return NotImplemented
 
-        if set(self.probabilities.keys()) != set(other.probabilities.keys()):
+        if self._support != other._support:
             return False
 
-        for key in self.probabilities:
-            if not self.approximately_equal(
-                self.probabilities[key], other.probabilities[key]
-            ):
+        for p1, p2 in zip(self._probabilities, other._probabilities):
+            if not self.approximately_equal(p1, p2):
                 return False
 
         return True
 
     def mean(self) -> float:
-        return sum(value * prob for value, prob in self.probabilities.items())
+        return fsum(map(mul, self._support, self._probabilities))
+
+    def _clt_moments(self) -> Moments:
+        """
+        Moments for the bounds in twistribution.approximation. A sum of Discretes
+        computed with an error budget set remembers the total third moment of its
+        terms, so the bound for later sums reflects how many terms went into it.
+        """
+        mean = self.mean()
+        pairs = list(zip(self._support, self._probabilities))
+        variance = fsum(p * (x - mean) ** 2 for x, p in pairs)
+        if self._third_moment is None:
+            self._third_moment = fsum(p * abs(x - mean) ** 3 for x, p in pairs)
+        return Moments(
+            mean, variance, self._third_moment, self._support.typecode == "q"
+        )
 
     def median(self, tie_margin: float = 1e-6) -> float:
-        cumulative = 0
-        previous_cumulative = 0
-        previous_value = None
-        for value, prob in self.probabilities.items():
-            cumulative += prob
-            if cumulative > 0.5 + tie_margin:
-                if (0.5 - previous_cumulative) < 2 * tie_margin:
-                    # effectively a tie
-                    return (previous_value + value) / 2
-                return value
-            previous_value = value
-            previous_cumulative = cumulative
-        raise RuntimeError("Median calculation failed: probabilities may be malformed")
+        cumulative = self._cumulative_probabilities()
+        index = bisect_right(cumulative, 0.5 + tie_margin)
+        if index == len(cumulative):
+            raise RuntimeError(
+                "Median calculation failed: probabilities may be malformed"
+            )
+        value = self._support[index]
+        if index > 0 and (0.5 - cumulative[index - 1]) < 2 * tie_margin:
+            # effectively a tie
+            return (self._support[index - 1] + value) / 2
+        return value
+
+    def quantile(self, q: float) -> float | int:
+        """The smallest value with cdf(x) >= q, by binary search of the running totals."""
+        check_level(q)
+        cumulative = self._cumulative_probabilities()
+        return self._support[min(bisect_left(cumulative, q), len(cumulative) - 1)]
+
+    def quantile_many(self, qs: Iterable[float]) -> array:
+        qs = as_float_array(qs)
+        cumulative = self._cumulative_probabilities()
+        support = self._support
+        last = len(cumulative) - 1
+        result = array("d")
+        for q in qs:
+            check_level(q)
+            result.append(support[min(bisect_left(cumulative, q), last)])
+        return result
+
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        """
+        n independent draws, by Vose's alias method: each draw takes one uniform
+        number, whose integer part picks a column of the alias table and whose
+        fractional part picks between that column's value and its alias.
+        """
+        uniform = uniform_source(n, rng)
+        thresholds, aliases = self._alias_table()
+        support = self._support
+        size = len(support)
+        return array(
+            "d",
+            [
+                support[column] if x - column < thresholds[column] else aliases[column]
+                for x in [uniform() * size for _ in range(n)]
+                for column in (int(x),)
+            ],
+        )
+
+    def _alias_table(self) -> tuple[array, array]:
+        """
+        For each column, the probability of keeping its own value, and the value to
+        use otherwise. Built once, by Vose's method.
+        """
+        if self._alias is None:
+            size = len(self._support)
+            scaled = [p * size for p in self._probabilities]
+            thresholds = array("d", [1.0]) * size
+            aliases = array("d", self._support)
+            small = [i for i, p in enumerate(scaled) if p < 1.0]
+            large = [i for i, p in enumerate(scaled) if p >= 1.0]
+            while small and large:
+                s = small.pop()
+                g = large.pop()
+                thresholds[s] = scaled[s]
+                aliases[s] = self._support[g]
+                scaled[g] -= 1.0 - scaled[s]
+                if scaled[g] < 1.0:
+                    small.append(g)
+                else:
+                    large.append(g)
+            # anything left over is 1 up to rounding, so always keeps its own value
+            self._alias = thresholds, aliases
+        return self._alias
+
+    def _cumulative_probabilities(self) -> array:
+        """Running totals of the probabilities, aligned with the sorted support."""
+        if self._cumulative is None:
+            self._cumulative = array("d", accumulate(self._probabilities))
+        return self._cumulative
 
+    def _probability_below(self, x: float, inclusive: bool) -> float:
+        """P(X < x), or P(X <= x) if inclusive, by binary search over the support."""
+        note_path("bisect")
+        if inclusive:
+            index = bisect_right(self._support, x)
+        else:
+            index = bisect_left(self._support, x)
+        if index == 0:
+            return 0.0
+        return self._cumulative_probabilities()[index - 1]
+
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        return self._probability_below_many(thresholds, inclusive=False)
+
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        return self._probability_below_many(thresholds, inclusive=True)
+
+    def _probability_below_many(
+        self, thresholds: Iterable[float], inclusive: bool
+    ) -> array:
+        """
+        P(X < t), or P(X <= t) if inclusive, for each threshold t.
+
+        The thresholds are sorted once and merged against the sorted support.
+        """
+        thresholds = as_float_array(thresholds)
+        support = self._support
+        cumulative = self._cumulative_probabilities()
+        size = len(support)
+        result = array("d", bytes(8 * len(thresholds)))
+        i = 0
+        for j in sorted(range(len(thresholds)), key=thresholds.__getitem__):
+            t = thresholds[j]
+            if inclusive:
+                while i < size and support[i] <= t:
+                    i += 1
+            else:
+                while i < size and support[i] < t:
+                    i += 1
+            if i:
+                result[j] = cumulative[i - 1]
+        return result
+
+    def _probability_below_other(self, other: "Discrete", inclusive: bool) -> float:
+        """
+        P(X < Y), or P(X <= Y) if inclusive, where X is self and Y is other.
+
+        Both supports are sorted, so a single merge pass keeps a running total of the
+        mass of X below each point of Y.
+        """
+        note_path("merge")
+        support = self._support
+        probabilities = self._probabilities
+        size = len(support)
+        i = 0
+        mass_below = 0.0
+        probability = 0.0
+        for k2, v2 in zip(other._support, other._probabilities):
+            if inclusive:
+                while i < size and support[i] <= k2:
+                    mass_below += probabilities[i]
+                    i += 1
+            else:
+                while i < size and support[i] < k2:
+                    mass_below += probabilities[i]
+                    i += 1
+            probability += mass_below * v2
+        return probability
+
+    @profiled
+    def compact(self, compaction: Compaction | None = None) -> "Discrete":
+        """
+        A copy with its support limited by the given compaction, or by this
+        distribution's own if none is given. The copy keeps the compaction used.
+        """
+        compaction = compaction or self.compaction
+        if compaction is None:
+            raise ValueError("No compaction given and none set on the distribution")
+        support, probabilities = compaction.apply(
+            list(self._support), list(self._probabilities)
+        )
+        return Discrete._trusted(
+            _support_array(support),
+            array("d", probabilities),
+            self.equality_tolerance,
+            compaction,
+        )
+
+    @profiled
+    @cached
     def __add__(self, other):
         if isinstance(other, (float, int)):
-            return Discrete({k + other: v for (k, v) in self.probabilities.items()})
+            note_path("shift")
+            typecode = (
+                "q" if self._support.typecode == "q" and isinstance(other, int) else "d"
+            )
+            result = Discrete._trusted(
+                array(typecode, [k + other for k in self._support]),
+                self._probabilities,
+            )
+            # shifting leaves the central moments unchanged
+            result._third_moment = self._third_moment
+            compaction = self.compaction
         elif isinstance(other, Discrete):
-            new_probabilities = defaultdict(lambda: 0.0)
-            for v1, p1 in self.probabilities.items():
-                for v2, p2 in other.probabilities.items():
-                    new_probabilities[v1 + v2] += p1 * p2
-            sorted_dict = dict(sorted(new_probabilities.items()))
-            return Discrete(sorted_dict)
-        raise TypeError(f"Unsupported operation between Discrete and {type(other)}")
+            approximate = approximate_sum((self, other))
+            if approximate is not None:
+                return approximate
+            result = self._add_discrete(other)
+            if error_budget() is not None:
+                result._third_moment = self._third_moment + other._third_moment
+            compaction = self.compaction or other.compaction
+        elif isinstance(other, ContinuousDistribution):
+            # avoid cyclic dependency by importing here
+            from twistribution.mixture import Mixture
+
+            note_path("mixture")
+            if isinstance(other, Mixture):
+                return other + self
+            return Mixture(other, self)
+        else:
+            # let the other operand's __radd__ have a go
+            return NotImplemented
+        if compaction is None:
+            return result
+        note_path("compacted")
+        compacted = result.compact(compaction)
+        compacted._third_moment = result._third_moment
+        return compacted
+
+    def _add_discrete(self, other: "Discrete") -> "Discrete":
+        if len(self._support) * len(other._support) >= _LATTICE_MIN_PAIRS:
+            step = self._common_lattice_step(other)
+            if step is not None:
+                result = self._add_on_lattice(other, step)
+                if result is not None:
+                    note_path("lattice")
+                    return result
+        note_path("pairwise")
+        new_probabilities = defaultdict(lambda: 0.0)
+        for v1, p1 in zip(self._support, self._probabilities):
+            for v2, p2 in zip(other._support, other._probabilities):
+                new_probabilities[v1 + v2] += p1 * p2
+        support = sorted(new_probabilities)
+        return Discrete._trusted(
+            array(_sum_typecode(self, other), support),
+            array("d", [new_probabilities[k] for k in support]),
+        )
+
+    def _common_lattice_step(self, other: "Discrete") -> float | int | None:
+        """
+        The spacing of a lattice that both supports sit on, or None if there isn't one.
+
+        Integer supports use the greatest common divisor of their offsets, so the step
+        is exact. Float supports start from the smallest gap in either support, refined
+        to the widest support's span divided by its whole number of steps, which cancels
+        most of the rounding error in the gap. Every value must then be a whole number
+        of steps from the start of its support.
+        """
+        supports = (self._support, other._support)
+        if all(support.typecode == "q" for support in supports):
+            step = 0
+            for support in supports:
+                for k in support:
+                    step = gcd(step, k - support[0])
+            return step or 1
+
+        gaps = [k2 - k1 for support in supports for k1, k2 in zip(support, support[1:])]
+        if not gaps:
+            return None
+        step = min(gaps)
+        if step <= 0:
+            return None
+        span = max(support[-1] - support[0] for support in supports)
+        step = span / round(span / step)
+        for support in supports:
+            for k in support:
+                steps = (k - support[0]) / step
+                if abs(steps - round(steps)) > _LATTICE_TOLERANCE * max(1.0, steps):
+                    return None
+        return step
+
+    def _lattice_indices(self, step: float | int) -> list[int]:
+        """Position of each support value on a lattice of the given step."""
+        start = self._support[0]
+        return [round((k - start) / step) for k in self._support]
+
+    def _add_on_lattice(
+        self, other: "Discrete", step: float | int
+    ) -> "Discrete | None":
+        """
+        Sum of two distributions on a common lattice, by fast convolution.
+
+        Returns None if the lattice is so sparse that the direct sum would be cheaper.
+        """
+        indices_a = self._lattice_indices(step)
+        indices_b = other._lattice_indices(step)
+        pairs = len(indices_a) * len(indices_b)
+        if (indices_a[-1] + indices_b[-1]) * _LATTICE_COST_RATIO > pairs:
+            return None
+
+        grid_a = [0.0] * (indices_a[-1] + 1)
+        for i, v in zip(indices_a, self._probabilities):
+            grid_a[i] += v
+        grid_b = [0.0] * (indices_b[-1] + 1)
+        for i, v in zip(indices_b, other._probabilities):
+            grid_b[i] += v
+        probabilities = convolve(grid_a, grid_b)
+
+        if len(grid_a) == len(indices_a) and len(grid_b) == len(indices_b):
+            reachable = None
+        else:
+            # on a sparse lattice some points can't be reached, and the direct sum
+            # wouldn't include them
+            present_a = [0] * len(grid_a)
+            for i in indices_a:
+                present_a[i] = 1
+            present_b = [0] * len(grid_b)
+            for i in indices_b:
+                present_b[i] = 1
+            reachable = convolve_integers(present_a, present_b)
+
+        if reachable is None:
+            # every lattice point is a support value, so each key can be an actual sum
+            # of two support values, exactly as the direct sum would compute it
+            support_a, support_b = self._support, other._support
+            last_a = len(support_a) - 1
+            indices = range(len(probabilities))
+            keys = [
+                support_a[min(i, last_a)] + support_b[i - min(i, last_a)]
+                for i in indices
+            ]
+        else:
+            # likewise take each key from a pair of support values that reaches it,
+            # rather than start + i * step, which drifts from the direct sum's keys
+            indices = [i for i in range(len(probabilities)) if reachable[i]]
+            support_a = self._support
+            value_b = dict(zip(indices_b, other._support))
+            keys = []
+            for i in indices:
+                j = bisect_right(indices_a, i) - 1
+                while i - indices_a[j] not in value_b:
+                    j -= 1
+                keys.append(support_a[j] + value_b[i - indices_a[j]])
+        return Discrete._trusted(
+            array(_sum_typecode(self, other), keys),
+            array("d", [probabilities[i] for i in indices]),
+        )
+
+    @profiled
+    def sum_iid(self, n: int) -> "Discrete":
+        """
+        Distribution of the sum of n independent copies of this distribution.
+
+        Uses repeated doubling, so only O(log n) additions are needed, or the Normal
+        approximation if it is within the error budget.
+        """
+        if n < 1:
+            raise ValueError(f"Number of copies must be at least 1; got {n}")
+        approximate = approximate_sum((self,), n)
+        if approximate is not None:
+            return approximate
+        result = None
+        power = self
+        while True:
+            if n & 1:
+                result = power if result is None else result + power
+            n >>= 1
+            if not n:
+                return result
+            power = power + power
 
     def __radd__(self, other):
         return self.__add__(other)
 
-    def __lt__(self, other):
+    def _prob_lt(self, other) -> float:
         if isinstance(other, (float, int)):
-            probability = 0.0
-            for k, v in self.probabilities.items():
-                if k < other:
-                    probability += v
-            return Bernoulli(probability)
+            return self._probability_below(other, inclusive=False)
         elif isinstance(other, Discrete):
-            cumulative_probability = 0.0
-            for k1, v1 in self.probabilities.items():
-                for k2, v2 in other.probabilities.items():
-                    if k1 < k2:
-                        cumulative_probability += v1 * v2
-            return Bernoulli(cumulative_probability)
+            approximate = approximate_below(self, other, inclusive=False)
+            if approximate is not None:
+                return approximate
+            return self._probability_below_other(other, inclusive=False)
         return NotImplemented
 
-    def __le__(self, other):
+    def _prob_le(self, other) -> float:
         if isinstance(other, (float, int)):
-            probability = 0.0
-            for k, v in self.probabilities.items():
-                if k <= other:
-                    probability += v
-            return Bernoulli(probability)
+            return self._probability_below(other, inclusive=True)
         elif isinstance(other, Discrete):
-            cumulative_probability = 0.0
-            for k1, v1 in self.probabilities.items():
-                for k2, v2 in other.probabilities.items():
-                    if k1 <= k2:
-                        cumulative_probability += v1 * v2
-            return Bernoulli(cumulative_probability)
+            approximate = approximate_below(self, other, inclusive=True)
+            if approximate is not None:
+                return approximate
+            return self._probability_below_other(other, inclusive=True)
         return NotImplemented
+
+    @profiled
+    @cached
+    def __lt__(self, other):
+        return as_bernoulli(self._prob_lt(other))
+
+    @profiled
+    @cached
+    def __le__(self, other):
+        return as_bernoulli(self._prob_le(other))
+
+
+def _sum_typecode(a: Discrete, b: Discrete) -> str:
+    """The array type for the support of a sum: integers only if both are."""
+    return "q" if a._support.typecode == b._support.typecode == "q" else "d"
+
+
+def _support_array(values: Iterable[float | int]) -> array:
+    """Values as a compact array, keeping them as integers if they all are."""
+    values = list(values)
+    if all(type(v) is int for v in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            pass
+    return array("d", values)
+
+
+class _ProbabilityView(Mapping):
+    """Read-only mapping from each value of a Discrete to its probability."""
+
+    __slots__ = ("_discrete",)
+
+    def __init__(self, discrete: Discrete):
+        self._discrete = discrete
+
+    def __getitem__(self, key: float | int) -> float:
+        support = self._discrete._support
+        index = bisect_left(support, key)
+        if index == len(support) or support[index] != key:
+            raise KeyError(key)
+        return self._discrete._probabilities[index]
+
+    def __iter__(self):
+        return iter(self._discrete._support)
+
+    def __len__(self) -> int:
+        return len(self._discrete._support)
+
+    def __contains__(self, key) -> bool:
+        support = self._discrete._support
+        index = bisect_left(support, key)
+        return index < len(support) and support[index] == key
+
+    def values(self) -> ValuesView:
+        return _ProbabilityValuesView(self)
+
+    def items(self) -> ItemsView:
+        return _ProbabilityItemsView(self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class _ProbabilityValuesView(ValuesView):
+    def __iter__(self):
+        return iter(self._mapping._discrete._probabilities)
+
+
+class _ProbabilityItemsView(ItemsView):
+    def __iter__(self):
+        discrete = self._mapping._discrete
+        return zip(discrete._support, discrete._probabilities)
@@ -1,12 +1,25 @@
+import random
 from abc import abstractmethod, ABC
-from typing import Any
+from array import array
+from bisect import bisect_left
+from math import ceil, floor, isfinite
+from typing import Any, Callable, Iterable
 
 from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
+from twistribution.profiling import profiled
+
+_TABLE_RESOLUTION = 16
+"""Entries in the cdf table used to place a quantile grid, per value of the grid."""
+
+_BISECTION_STEPS = 200
+"""Most halvings when searching for a quantile; fewer when floats run out first."""
 
 
 class Distribution(ABC):
     """Base class for all distributions."""
 
+    __slots__ = ("equality_tolerance",)
+
     def __init__(self, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE):
         self.equality_tolerance = equality_tolerance
 
@@ -18,6 +31,37 @@ class Distribution(ABC):
         """All the distribution's parameter values, in a fixed order."""
         pass
 
+    @abstractmethod
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        """
+        n independent draws from the distribution, using rng if given, or else the
+        random module's shared generator.
+        """
+
+    @abstractmethod
+    def quantile(self, q: float) -> float:
+        """The smallest x with cdf(x) >= q, for a level q in [0, 1]."""
+
+    def quantile_many(self, qs: Iterable[float]) -> array:
+        """The quantile at each of the levels."""
+        return array("d", map(self.quantile, as_float_array(qs)))
+
+    def cache_key(self) -> tuple[Any, ...]:
+        """
+        A hashable key for caching results computed from this distribution.
+
+        Numerical parameters are quantized to multiples of equality_tolerance, so
+        distributions that differ by much less than the tolerance share a key.
+        Distributions themselves aren't hashable, because no hash can be consistent
+        with approximate equality.
+        """
+        return (type(self), *(self._quantize(p) for p in self.parameters()))
+
+    def _quantize(self, value: Any) -> Any:
+        if isinstance(value, (int, float)) and self.equality_tolerance > 0:
+            return round(value / self.equality_tolerance)
+        return value
+
     def __str__(self):
         return "{}({})".format(
             type(self).__name__, ", ".join(str(p) for p in self.parameters())
@@ -47,6 +91,12 @@ class Distribution(ABC):
 class ContinuousDistribution(Distribution, ABC):
     """Base class for continuous distributions."""
 
+    __slots__ = ("_discrete",)
+
+    def __init__(self, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE):
+        super().__init__(equality_tolerance)
+        self._discrete = None
+
     @abstractmethod
     def pdf(self, x: float) -> float:
         """Probability density function."""
@@ -55,29 +105,147 @@ class ContinuousDistribution(Distribution, ABC):
     def cdf(self, x: float) -> float:
         """Cumulative density function."""
 
-    def __lt__(self, other):
+    def pdf_many(self, xs: Iterable[float]) -> array:
+        """Probability density function at each of the values."""
+        return array("d", map(self.pdf, as_float_array(xs)))
+
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        """Cumulative density function at each of the values."""
+        return array("d", map(self.cdf, as_float_array(xs)))
+
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        """P(X < t) for each threshold t. For a continuous distribution this is the cdf."""
+        return self.cdf_many(thresholds)
+
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        """P(X <= t) for each threshold t. For a continuous distribution this is the cdf."""
+        return self.cdf_many(thresholds)
+
+    def quantile(self, q: float) -> float:
+        """The smallest x with cdf(x) >= q, found by bisecting the cdf."""
+        check_level(q)
+        if q == 0:
+            return _boundary(lambda x: self.cdf(x) > 0)
+        return _boundary(lambda x: self.cdf(x) >= q)
+
+    @profiled
+    def to_discrete(
+        self,
+        max_points: int = 256,
+        tail_mass: float = 1e-10,
+        lattice: float | int | None = None,
+    ) -> "Discrete":
         """
-        Master comparator. All others are defined in terms of this.
-        Default implementation that only works with scalars. Can be overridden to work against other distributions.
+        A Discrete approximation with at most max_points values, leaving out at most
+        tail_mass from each tail and rescaling the rest to sum to 1.
+
+        By default the values are quantile spaced: the range is cut into cells of
+        roughly equal probability, placed using a table of the cdf. Each cell's mass is
+        the difference of the cdf at its edges, and its value is its median. With a
+        lattice step, the values are instead multiples of the step, or of as small a
+        multiple of it as keeps within max_points, each taking the mass within half a
+        step of it. Results on the same lattice can then be added by lattice
+        convolution.
+
+        Results are memoised per settings.
         """
-        if isinstance(other, (float, int)):
+        settings = (max_points, tail_mass, lattice)
+        if self._discrete is None:
+            self._discrete = {}
+        if settings not in self._discrete:
+            if max_points < 2:
+                raise ValueError(f"max_points must be at least 2; got {max_points}")
+            if not 0 <= tail_mass < 0.5:
+                raise ValueError(
+                    f"tail_mass must be in the range [0, 0.5); got {tail_mass}"
+                )
+            if lattice is not None and lattice <= 0:
+                raise ValueError(f"lattice must be positive; got {lattice}")
+
+            lower = _boundary(lambda x: self.cdf(x) > tail_mass)
+            upper = _boundary(lambda x: self.cdf(x) >= 1 - tail_mass)
+            if lattice is None:
+                edges, values = self._quantile_grid(max_points, lower, upper, tail_mass)
+            else:
+                edges, values = _lattice_grid(max_points, lower, upper, lattice)
+
+            cdf = self.cdf_many(edges)
+            masses = {}
+            for value, low, high in zip(values, cdf, cdf[1:]):
+                if high > low:
+                    masses[value] = masses.get(value, 0.0) + high - low
+            total = sum(masses.values())
+
             # avoid cyclic dependency by importing here
-            from twistribution.bernoulli import Bernoulli
+            from twistribution.discrete import Discrete
 
-            return Bernoulli(self.cdf(other))
+            self._discrete[settings] = Discrete(
+                {value: mass / total for value, mass in masses.items()},
+                self.equality_tolerance,
+            )
+        return self._discrete[settings]
+
+    def _quantile_grid(
+        self, max_points: int, lower: float, upper: float, tail_mass: float
+    ) -> tuple[list[float], list[float]]:
+        """
+        Cell edges and values at evenly spaced quantiles from tail_mass to
+        1 - tail_mass, interpolated in a table of the cdf over [lower, upper].
+        """
+        size = _TABLE_RESOLUTION * max_points
+        xs = array("d", [lower + (upper - lower) * i / size for i in range(size + 1)])
+        table = self.cdf_many(xs)
+
+        def quantile(q: float) -> float:
+            i = bisect_left(table, q)
+            if i == 0:
+                return xs[0]
+            if i > size:
+                return xs[-1]
+            below = table[i - 1]
+            return xs[i - 1] + (xs[i] - xs[i - 1]) * (q - below) / (table[i] - below)
+
+        span = 1 - 2 * tail_mass
+        edges = [quantile(tail_mass + span * i / max_points) for i in range(max_points)]
+        edges[0] = lower
+        edges.append(upper)
+        values = [
+            quantile(tail_mass + span * (i + 0.5) / max_points)
+            for i in range(max_points)
+        ]
+        return edges, values
+
+    def _prob_lt(self, other) -> float:
+        """
+        P(X < other) as a float, or NotImplemented. This is the master comparison
+        kernel: all the others, and all the comparison operators, are defined in terms
+        of it. This default only works with scalars, and can be overridden to work
+        against other distributions.
+        """
+        if isinstance(other, (float, int)):
+            return self.cdf(other)
         return NotImplemented
 
+    def _prob_le(self, other) -> float:
+        return self._prob_lt(other)
+
+    def _prob_gt(self, other) -> float:
+        p = self._prob_lt(other)
+        return p if p is NotImplemented else 1 - p
+
+    def _prob_ge(self, other) -> float:
+        return self._prob_gt(other)
+
+    @profiled
+    def __lt__(self, other):
+        return as_bernoulli(self._prob_lt(other))
+
     def __le__(self, other):
         return self.__lt__(other)
 
+    @profiled
     def __gt__(self, other):
-        # avoid cyclic dependency by importing here
-        from twistribution.bernoulli import Bernoulli
-
-        lt = self.__lt__(other)
-        if lt is NotImplemented:
-            return NotImplemented
-        return Bernoulli(1 - lt.p)
+        return as_bernoulli(self._prob_gt(other))
 
     def __ge__(self, other):
         return self.__gt__(other)
@@ -100,28 +268,141 @@ class ContinuousDistribution(Distribution, ABC):
 class DiscreteDistribution(Distribution, ABC):
     """Base class for discrete distributions."""
 
+    __slots__ = ()
+
     @abstractmethod
-    def __lt__(self, other):
-        pass
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        """P(X < t) for each threshold t."""
+
+    @abstractmethod
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        """P(X <= t) for each threshold t."""
 
     @abstractmethod
+    def _prob_lt(self, other) -> float:
+        """P(X < other) as a float, or NotImplemented."""
+
+    @abstractmethod
+    def _prob_le(self, other) -> float:
+        """P(X <= other) as a float, or NotImplemented."""
+
+    def _prob_gt(self, other) -> float:
+        p = self._prob_le(other)
+        return p if p is NotImplemented else 1 - p
+
+    def _prob_ge(self, other) -> float:
+        p = self._prob_lt(other)
+        return p if p is NotImplemented else 1 - p
+
+    @profiled
+    def __lt__(self, other):
+        return as_bernoulli(self._prob_lt(other))
+
+    @profiled
     def __le__(self, other):
-        pass
+        return as_bernoulli(self._prob_le(other))
 
+    @profiled
     def __gt__(self, other):
-        # avoid cyclic dependency by importing here
-        from twistribution.bernoulli import Bernoulli
-
-        le = self.__le__(other)
-        if le is NotImplemented:
-            return NotImplemented
-        return Bernoulli(1 - le.p)
+        return as_bernoulli(self._prob_gt(other))
 
+    @profiled
     def __ge__(self, other):
+        return as_bernoulli(self._prob_ge(other))
+
+
+def _boundary(predicate: Callable[[float], bool]) -> float:
+    """
+    The point where a monotone predicate changes from false to true, found by
+    expanding a bracket outwards from 0 and then bisecting it.
+    """
+    step = 1.0
+    if predicate(0.0):
+        low, high = -step, 0.0
+        while predicate(low):
+            high = low
+            step *= 2
+            low = high - step
+            if not isfinite(low):
+                raise ValueError("Predicate is true everywhere")
+    else:
+        low, high = 0.0, step
+        while not predicate(high):
+            low = high
+            step *= 2
+            high = low + step
+            if not isfinite(high):
+                raise ValueError("Predicate is false everywhere")
+    for _ in range(_BISECTION_STEPS):
+        middle = (low + high) / 2
+        if middle in (low, high):
+            break
+        if predicate(middle):
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def _lattice_grid(
+    max_points: int, lower: float, upper: float, lattice: float | int
+) -> tuple[list[float], list[float | int]]:
+    """
+    Cell edges and values for multiples of a multiple of lattice covering
+    [lower, upper] with at most max_points values.
+    """
+    multiple = max(1, ceil((upper - lower) / (lattice * (max_points - 1))))
+    while True:
+        step = lattice * multiple
+        first = floor(lower / step + 0.5)
+        last = floor(upper / step + 0.5)
+        if last - first < max_points:
+            break
+        multiple += 1
+    edges = [lower] + [(k + 0.5) * step for k in range(first, last)] + [upper]
+    return edges, [k * step for k in range(first, last + 1)]
+
+
+_Bernoulli = None
+"""The Bernoulli class, imported on first use because it depends on this module."""
+
+
+def as_bernoulli(p: float) -> Any:
+    """The Bernoulli with probability p, passing NotImplemented through."""
+    global _Bernoulli
+    if p is NotImplemented:
+        return p
+    if _Bernoulli is None:
         # avoid cyclic dependency by importing here
         from twistribution.bernoulli import Bernoulli
 
-        lt = self.__lt__(other)
-        if lt is NotImplemented:
-            return NotImplemented
-        return Bernoulli(1 - lt.p)
+        _Bernoulli = Bernoulli
+    return _Bernoulli._trusted(p)
+
+
+def as_float_array(values: Iterable[float]) -> array:
+    """
+    The values as an array of doubles, accepting any iterable or buffer of numbers.
+    Arrays of doubles are returned as they are, without copying.
+    """
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+    if isinstance(values, memoryview):
+        if values.c_contiguous:
+            return array("d", values.cast("B").cast(values.format))
+        # a strided view, such as a slice with a step, can't be cast
+        return array("d", values.tolist())
+    return array("d", values)
+
+
+def check_level(q: float):
+    """Check that q is a valid level for a quantile."""
+    if not 0 <= q <= 1:
+        raise ValueError(f"Quantile level must be in the range [0, 1]; got {q}")
+
+
+def uniform_source(n: int, rng: random.Random | None) -> Callable[[], float]:
+    """The function giving uniform draws in [0, 1) for a sample of size n."""
+    if n < 0:
+        raise ValueError(f"Sample size must be non-negative; got {n}")
+    return (rng or random).random
@@ -0,0 +1,205 @@
+import heapq
+from collections import Counter
+from typing import Any
+
+from twistribution.constant import Constant
+from twistribution.discrete import Discrete
+from twistribution.normal import Normal
+from twistribution.poisson import Poisson
+
+
+def lazy(value: Any) -> "Lazy":
+    """Start a lazily evaluated expression from a distribution or a number."""
+    return value if isinstance(value, Lazy) else Lazy("value", value)
+
+
+class Lazy:
+    """
+    A node in an expression of distributions that is only evaluated on request.
+
+    Arithmetic and comparisons on a Lazy build further nodes instead of computing
+    anything. Calling evaluate() then simplifies before doing any numerical work:
+
+    - sums are flattened, and their terms grouped so that numbers and Constants fold
+      into a single shift, and Normals and Poissons each combine in closed form;
+    - Discrete terms are added smallest support first, which keeps the intermediate
+      supports as small as possible;
+    - a node used in more than one place is only evaluated once.
+
+    The result is whatever the eager operators would have produced.
+    """
+
+    __slots__ = ("op", "operands")
+
+    def __init__(self, op: str, *operands: Any):
+        self.op = op
+        self.operands = operands
+
+    def __repr__(self):
+        if self.op == "value":
+            return f"lazy({self.operands[0]!r})"
+        return "Lazy({}, {})".format(
+            self.op, ", ".join(repr(operand) for operand in self.operands)
+        )
+
+    def __add__(self, other):
+        return Lazy("add", self, lazy(other))
+
+    def __radd__(self, other):
+        return Lazy("add", lazy(other), self)
+
+    def __sub__(self, other):
+        return Lazy("sub", self, lazy(other))
+
+    def __rsub__(self, other):
+        return Lazy("sub", lazy(other), self)
+
+    def __mul__(self, other):
+        return Lazy("mul", self, lazy(other))
+
+    def __rmul__(self, other):
+        return Lazy("mul", lazy(other), self)
+
+    def __truediv__(self, other):
+        return Lazy("truediv", self, lazy(other))
+
+    def __lt__(self, other):
+        return Lazy("lt", self, lazy(other))
+
+    def __le__(self, other):
+        return Lazy("le", self, lazy(other))
+
+    def __gt__(self, other):
+        return Lazy("gt", self, lazy(other))
+
+    def __ge__(self, other):
+        return Lazy("ge", self, lazy(other))
+
+    def evaluate(self) -> Any:
+        """The value of the expression."""
+        return _Evaluation(self).value(self)
+
+
+_BINARY_OPERATIONS = {
+    "sub": lambda a, b: a - b,
+    "mul": lambda a, b: a * b,
+    "truediv": lambda a, b: a / b,
+    "lt": lambda a, b: a < b,
+    "le": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "ge": lambda a, b: a >= b,
+}
+
+
+class _Evaluation:
+    """The state of evaluating one expression: reference counts and finished nodes."""
+
+    def __init__(self, root: Lazy):
+        self.references = Counter()
+        self.values = {}
+        self._count_references(root)
+
+    def _count_references(self, root: Lazy):
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self.references[id(node)] += 1
+            if self.references[id(node)] == 1 and node.op != "value":
+                stack.extend(node.operands)
+
+    def value(self, node: Lazy) -> Any:
+        key = id(node)
+        if key not in self.values:
+            if node.op == "value":
+                self.values[key] = node.operands[0]
+            elif node.op == "add":
+                self.values[key] = self._sum(self._terms(node))
+            else:
+                a, b = (self.value(operand) for operand in node.operands)
+                self.values[key] = _BINARY_OPERATIONS[node.op](a, b)
+        return self.values[key]
+
+    def _terms(self, node: Lazy) -> list[Any]:
+        """
+        Values of the terms of a sum, looking through nested sums that aren't shared
+        with the rest of the expression.
+        """
+        terms = []
+        stack = list(reversed(node.operands))
+        while stack:
+            operand = stack.pop()
+            if operand.op == "add" and self.references[id(operand)] == 1:
+                stack.extend(reversed(operand.operands))
+            else:
+                terms.append(self.value(operand))
+        return terms
+
+    @staticmethod
+    def _sum(terms: list[Any]) -> Any:
+        shift = 0
+        has_constant = False
+        normals = []
+        poissons = []
+        discretes = []
+        others = []
+        for term in terms:
+            if isinstance(term, (int, float)):
+                shift += term
+            elif isinstance(term, Constant):
+                shift += term.value
+                has_constant = True
+            elif type(term) is Normal:
+                normals.append(term)
+            elif type(term) is Poisson:
+                poissons.append(term)
+            elif type(term) is Discrete:
+                discretes.append(term)
+            else:
+                others.append(term)
+
+        partial_sums = []
+        if normals:
+            partial_sums.append(
+                Normal(
+                    sum(n.mean for n in normals),
+                    sum(n.stddev**2 for n in normals) ** 0.5,
+                )
+            )
+        if poissons:
+            partial_sums.append(Poisson(sum(p.mean for p in poissons)))
+        if discretes:
+            partial_sums.append(_sum_smallest_first(discretes))
+        partial_sums.extend(others)
+
+        if not partial_sums:
+            return Constant(shift) if has_constant else shift
+        result = partial_sums[0]
+        for partial_sum in partial_sums[1:]:
+            result = result + partial_sum
+        if shift:
+            result = result + shift
+        return result
+
+
+def _sum_smallest_first(discretes: list[Discrete]) -> Any:
+    """
+    Sum of Discrete distributions, always adding the two with the smallest supports.
+
+    Under an error budget a partial sum may come back as a Normal approximation,
+    which has no support to order by; the remaining terms are then added to it
+    directly.
+    """
+    heap = [(len(d.probabilities), i, d) for i, d in enumerate(discretes)]
+    heapq.heapify(heap)
+    counter = len(heap)
+    while len(heap) > 1:
+        _, _, a = heapq.heappop(heap)
+        _, _, b = heapq.heappop(heap)
+        total = a + b
+        if not isinstance(total, Discrete):
+            for _, _, term in sorted(heap):
+                total = total + term
+            return total
+        heapq.heappush(heap, (len(total.probabilities), counter, total))
+        counter += 1
+    return heap[0][2]
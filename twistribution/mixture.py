@@ -0,0 +1,162 @@
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import add, mul
+from typing import Any, Iterable
+
+from twistribution.discrete import Discrete
+from twistribution.distribution import ContinuousDistribution, as_float_array
+from twistribution.normal import Normal
+from twistribution.piecewise import PiecewisePolynomial
+from twistribution.profiling import note_path, profiled
+from twistribution.uniform import Uniform
+
+_NORMAL_HALF_WIDTH = 9
+"""Standard deviations beyond which a Normal's cdf is taken as exactly 0 or 1."""
+
+
+class Mixture(ContinuousDistribution):
+    """
+    The sum of a continuous distribution and an independent Discrete one: copies of
+    the component shifted by each value of the offsets, weighted by its probability.
+
+    The component must be a Normal, Uniform or PiecewisePolynomial, whose mass lies
+    within known bounds (for a Normal, within 9 standard deviations of the mean).
+    The offsets are sorted, so the cdf at x only evaluates the component for offsets
+    whose shifted copy straddles x: copies wholly below x contribute their weight,
+    found from running totals, and copies wholly above contribute nothing.
+    """
+
+    __slots__ = ("component", "offsets", "_low", "_high")
+
+    def __init__(self, component: ContinuousDistribution, offsets: Discrete):
+        super().__init__(component.equality_tolerance)
+        if isinstance(component, Normal):
+            half_width = _NORMAL_HALF_WIDTH * component.stddev
+            low, high = component.mean - half_width, component.mean + half_width
+        elif isinstance(component, Uniform):
+            low, high = component.a, component.b
+        elif isinstance(component, PiecewisePolynomial):
+            low, high = component.breakpoints[0], component.breakpoints[-1]
+        else:
+            raise TypeError(f"Unsupported mixture component {type(component)}")
+        self.component = component
+        self.offsets = offsets
+        self._low = low
+        self._high = high
+
+    def parameters(self) -> tuple[Any, ...]:
+        return self.component, self.offsets
+
+    def cache_key(self) -> tuple[Any, ...]:
+        return Mixture, self.component.cache_key(), self.offsets.cache_key()
+
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        return array(
+            "d", map(add, self.component.sample(n, rng), self.offsets.sample(n, rng))
+        )
+
+    def pdf(self, x: float) -> float:
+        support = self.offsets._support
+        start = bisect_left(support, x - self._high)
+        end = bisect_right(support, x - self._low)
+        return self._window_sum(x, start, end, self.component.pdf_many)
+
+    def cdf(self, x: float) -> float:
+        support = self.offsets._support
+        start = bisect_right(support, x - self._high)
+        end = bisect_left(support, x - self._low, start)
+        below = self.offsets._cumulative_probabilities()[start - 1] if start else 0.0
+        return below + self._window_sum(x, start, end, self.component.cdf_many)
+
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        """
+        The cdf at each of the values. The values are visited in sorted order, so the
+        window of offsets to evaluate only ever moves forwards.
+        """
+        xs = as_float_array(xs)
+        support = self.offsets._support
+        cumulative = self.offsets._cumulative_probabilities()
+        cdf_many = self.component.cdf_many
+        low, high = self._low, self._high
+        size = len(support)
+        result = array("d", bytes(8 * len(xs)))
+        start = end = 0
+        for j in sorted(range(len(xs)), key=xs.__getitem__):
+            x = xs[j]
+            while start < size and support[start] <= x - high:
+                start += 1
+            end = max(end, start)
+            while end < size and support[end] < x - low:
+                end += 1
+            below = cumulative[start - 1] if start else 0.0
+            result[j] = below + self._window_sum(x, start, end, cdf_many)
+        return result
+
+    def _window_sum(self, x: float, start: int, end: int, function) -> float:
+        """Sum of the offsets' weights times the function at x minus each offset."""
+        if start >= end:
+            return 0.0
+        note_path("window")
+        values = function(array("d", [x - d for d in self.offsets._support[start:end]]))
+        return sum(map(mul, self.offsets._probabilities[start:end], values))
+
+    def _weighted_cdf(self, offsets: Discrete) -> float:
+        """The expected cdf at the values of the given offsets."""
+        return sum(map(mul, offsets._probabilities, self.cdf_many(offsets._support)))
+
+    def _prob_lt(self, other) -> float:
+        if isinstance(other, (int, float)):
+            return self.cdf(other)
+        elif isinstance(other, Discrete):
+            return self._weighted_cdf(other)
+        elif isinstance(other, Normal) and isinstance(self.component, Normal):
+            # X + D < Y exactly when (X - Y) + D < 0
+            return Mixture(self.component - other, self.offsets).cdf(0)
+        elif (
+            isinstance(other, Mixture)
+            and isinstance(self.component, Normal)
+            and isinstance(other.component, Normal)
+        ):
+            # X1 + D1 < X2 + D2 exactly when (X1 - X2) + D1 < D2
+            difference = Mixture(self.component - other.component, self.offsets)
+            return difference._weighted_cdf(other.offsets)
+        return NotImplemented
+
+    @profiled
+    def __add__(self, other):
+        if isinstance(other, (int, float, Discrete)):
+            offsets = self.offsets + other
+            if not isinstance(offsets, Discrete):
+                # under an error budget the offsets may have become a Normal
+                return self.component + offsets
+            return Mixture(self.component, offsets)
+        elif isinstance(other, ContinuousDistribution) and not isinstance(
+            other, Mixture
+        ):
+            component = self.component.__add__(other)
+            if component is NotImplemented:
+                return NotImplemented
+            return Mixture(component, self.offsets)
+        return NotImplemented
+
+    @profiled
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            if other == 0:
+                raise ValueError("Cannot scale a mixture by zero")
+            pairs = [
+                (k * other, p)
+                for k, p in zip(self.offsets._support, self.offsets._probabilities)
+            ]
+            if other < 0:
+                pairs.reverse()
+            return Mixture(
+                self.component * other,
+                Discrete(
+                    dict(pairs),
+                    self.offsets.equality_tolerance,
+                    self.offsets.compaction,
+                ),
+            )
+        return NotImplemented
@@ -0,0 +1,222 @@
+"""
+Monte Carlo estimates for operations that have no closed form, such as comparing a
+Normal with a Uniform or multiplying two Normals.
+
+Samples are drawn in batches, in this process unless more workers are asked for, in
+which case batches run in parallel across processes. Each batch has its own seed
+derived from the seed argument, and batches are combined in order, so a given seed
+always gives the same result however many workers there are. Sampling stops as soon as
+the confidence interval of every estimated probability is within the requested
+precision.
+"""
+
+import operator
+import os
+import random
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from statistics import NormalDist
+from typing import Any, Callable, Iterator
+
+from twistribution.bernoulli import Bernoulli
+from twistribution.discrete import Discrete
+
+_COMPARISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_ARITHMETIC = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+def compare(
+    a: Any,
+    op: str,
+    b: Any,
+    precision: float = 1e-3,
+    confidence: float = 0.99,
+    batch_size: int = 100_000,
+    max_samples: int = 100_000_000,
+    workers: int | None = 1,
+    seed: int = 0,
+) -> Bernoulli:
+    """
+    Estimate of a op b, for op one of <, <=, > or >=, where a and b are
+    distributions or numbers. Batches run in worker processes if workers is more
+    than 1, or on every CPU if it is None.
+    """
+    comparison = _lookup(_COMPARISONS, op)
+    z = _z(confidence)
+    successes = 0
+    total = 0
+    for count in _stream(
+        _comparison_batch,
+        (a, comparison, b),
+        batch_size,
+        max_samples,
+        workers,
+        seed,
+    ):
+        successes += count
+        total += batch_size
+        if _wilson_half_width(successes / total, total, z) <= precision:
+            break
+    return Bernoulli(successes / total)
+
+
+def combine(
+    a: Any,
+    op: str,
+    b: Any,
+    bins: int = 200,
+    precision: float = 1e-3,
+    confidence: float = 0.99,
+    batch_size: int = 100_000,
+    max_samples: int = 100_000_000,
+    workers: int | None = 1,
+    seed: int = 0,
+) -> Discrete:
+    """
+    Estimate of a op b, for op one of +, -, * or /, where a and b are distributions
+    or numbers, as a Discrete with at most the given number of bins.
+
+    The bins are equal width, spanning the range of a first batch drawn in this process,
+    and values outside that range go in the end bins. Each bin's probability sits at
+    the mean of the values that fell in it, which keeps the overall mean unbiased.
+    Sampling stops once every bin's probability is within precision, and batches run
+    in worker processes as for compare().
+    """
+    arithmetic = _lookup(_ARITHMETIC, op)
+    z = _z(confidence)
+    pilot = _combined_values(a, arithmetic, b, batch_size, f"{seed}:pilot")
+    low = min(pilot)
+    width = (max(pilot) - low) / bins or 1.0
+
+    counts = [0] * bins
+    sums = [0.0] * bins
+    total = 0
+    for batch_counts, batch_sums in _stream(
+        _combination_batch,
+        (a, arithmetic, b, low, width, bins),
+        batch_size,
+        max_samples,
+        workers,
+        seed,
+    ):
+        total += batch_size
+        for i in range(bins):
+            counts[i] += batch_counts[i]
+            sums[i] += batch_sums[i]
+        if all(
+            _wilson_half_width(count / total, total, z) <= precision for count in counts
+        ):
+            break
+
+    return Discrete(
+        {sums[i] / counts[i]: counts[i] / total for i in range(bins) if counts[i] > 0}
+    )
+
+
+def _lookup(operations: dict[str, Callable], op: str) -> Callable:
+    try:
+        return operations[op]
+    except KeyError:
+        raise ValueError(
+            f"Operation must be one of {', '.join(operations)}; got {op!r}"
+        ) from None
+
+
+def _z(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence must be in the range (0, 1); got {confidence}")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def _wilson_half_width(p: float, n: int, z: float) -> float:
+    """Half the width of the Wilson score interval, which stays honest near 0 and 1."""
+    return z / (1 + z * z / n) * sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+
+
+def _stream(
+    batch: Callable,
+    args: tuple,
+    batch_size: int,
+    max_samples: int,
+    workers: int | None,
+    seed: int,
+) -> Iterator[Any]:
+    """
+    Results of batch(*args, batch_size, batch_seed) for successive batches, in order,
+    until the caller stops or max_samples have been drawn. With more than one worker,
+    a few batches run ahead in other processes.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    seeds = [f"{seed}:{i}" for i in range(max(1, max_samples // batch_size))]
+    if workers <= 1:
+        for batch_seed in seeds:
+            yield batch(*args, batch_size, batch_seed)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        try:
+            for batch_seed in seeds:
+                pending.append(pool.submit(batch, *args, batch_size, batch_seed))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _draw(value: Any, n: int, rng: random.Random) -> array:
+    if isinstance(value, (int, float)):
+        return array("d", [value]) * n
+    return value.sample(n, rng)
+
+
+def _combined_values(
+    a: Any, arithmetic: Callable, b: Any, size: int, seed: str
+) -> list[float]:
+    rng = random.Random(seed)
+    return list(map(arithmetic, _draw(a, size, rng), _draw(b, size, rng)))
+
+
+def _comparison_batch(
+    a: Any, comparison: Callable, b: Any, size: int, seed: str
+) -> int:
+    rng = random.Random(seed)
+    return sum(map(comparison, _draw(a, size, rng), _draw(b, size, rng)))
+
+
+def _combination_batch(
+    a: Any,
+    arithmetic: Callable,
+    b: Any,
+    low: float,
+    width: float,
+    bins: int,
+    size: int,
+    seed: str,
+) -> tuple[list[int], list[float]]:
+    counts = [0] * bins
+    sums = [0.0] * bins
+    last = bins - 1
+    for value in _combined_values(a, arithmetic, b, size, seed):
+        i = int((value - low) / width)
+        i = 0 if i < 0 else last if i > last else i
+        counts[i] += 1
+        sums[i] += value
+    return counts, sums
@@ -1,12 +1,96 @@
-from math import erf, sqrt, pi, exp
-from typing import Any
+import random
+from array import array
+from math import cos, erf, inf, log, sin, sqrt, pi, exp
+from typing import Any, Iterable
 
-from twistribution.bernoulli import Bernoulli
 from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
-from twistribution.distribution import ContinuousDistribution
+from twistribution.distribution import (
+    ContinuousDistribution,
+    as_float_array,
+    check_level,
+    uniform_source,
+)
+from twistribution.profiling import profiled
+from twistribution.validation import full_validation_enabled
+
+# Coefficients of Wichura's algorithm AS241 (PPND16), lowest power first. Each pair
+# is the numerator and denominator of a rational approximation on one region.
+_CENTRAL = (
+    (
+        3.387132872796366608,
+        133.14166789178437745,
+        1971.5909503065514427,
+        13731.693765509461125,
+        45921.953931549871457,
+        67265.770927008700853,
+        33430.575583588128105,
+        2509.0809287301226727,
+    ),
+    (
+        1.0,
+        42.313330701600911252,
+        687.1870074920579083,
+        5394.1960214247511077,
+        21213.794301586595867,
+        39307.89580009271061,
+        28729.085735721942674,
+        5226.495278852854561,
+    ),
+)
+"""For levels within 0.425 of 1/2, in terms of 0.180625 - (q - 1/2) ** 2."""
+
+_INTERMEDIATE = (
+    (
+        1.42343711074968357734,
+        4.6303378461565452959,
+        5.7694972214606914055,
+        3.64784832476320460504,
+        1.27045825245236838258,
+        0.24178072517745061177,
+        0.0227238449892691845833,
+        7.7454501427834140764e-4,
+    ),
+    (
+        1.0,
+        2.05319162663775882187,
+        1.6763848301838038494,
+        0.68976733498510000455,
+        0.14810397642748007459,
+        0.0151986665636164571966,
+        5.475938084995344946e-4,
+        1.05075007164441684324e-9,
+    ),
+)
+"""For tail areas r with sqrt(-log(r)) <= 5, in terms of sqrt(-log(r)) - 1.6."""
+
+_FAR = (
+    (
+        6.6579046435011037772,
+        5.4637849111641143699,
+        1.7848265399172913358,
+        0.29656057182850489123,
+        0.026532189526576123093,
+        0.0012426609473880784386,
+        2.71155556874348757815e-5,
+        2.01033439929228813265e-7,
+    ),
+    (
+        1.0,
+        0.599832206555887937690,
+        0.136929880922735805310,
+        0.0148753612908506148525,
+        7.868691311456132591e-4,
+        1.8463183175100546818e-5,
+        1.4215117583164458887e-7,
+        2.04426310338993978564e-15,
+    ),
+)
+"""For tail areas r with sqrt(-log(r)) > 5, in terms of sqrt(-log(r)) - 5."""
 
 
 class Normal(ContinuousDistribution):
+    __slots__ = ("mean", "stddev")
+
     def __init__(
         self,
         mean: float,
@@ -19,57 +103,125 @@ class Normal(ContinuousDistribution):
         self.mean = mean
         self.stddev = stddev
 
+    @classmethod
+    def _trusted(
+        cls,
+        mean: float,
+        stddev: float,
+        equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE,
+    ) -> "Normal":
+        """
+        A Normal built without validation, for results computed by operations. With
+        full validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(mean, stddev, equality_tolerance)
+        result = cls.__new__(cls)
+        result.equality_tolerance = equality_tolerance
+        result._discrete = None
+        result.mean = mean
+        result.stddev = stddev
+        return result
+
     def parameters(self) -> tuple[Any, ...]:
         return self.mean, self.stddev
 
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        """
+        n independent draws, made in batches by the Box-Muller transform, which turns
+        each pair of uniform draws into two independent normal draws.
+        """
+        uniform = uniform_source(n, rng)
+        pairs = (n + 1) // 2
+        radii = [self.stddev * sqrt(-2.0 * log(1.0 - uniform())) for _ in range(pairs)]
+        angles = [2 * pi * uniform() for _ in range(pairs)]
+        mean = self.mean
+        draws = array("d", [mean + r * cos(a) for r, a in zip(radii, angles)])
+        draws.extend([mean + r * sin(a) for r, a in zip(radii, angles)])
+        del draws[n:]
+        return draws
+
+    def quantile(self, q: float) -> float:
+        check_level(q)
+        return self.mean + self.stddev * standard_normal_quantile(q)
+
+    def quantile_many(self, qs: Iterable[float]) -> array:
+        mean = self.mean
+        stddev = self.stddev
+        result = array("d")
+        for q in as_float_array(qs):
+            check_level(q)
+            result.append(mean + stddev * standard_normal_quantile(q))
+        return result
+
     def pdf(self, x: float) -> float:
         return normal_pdf(x=x, mean=self.mean, variance=self.stddev**2)
 
     def cdf(self, x: float) -> float:
-        return (1 + erf(x / sqrt(2))) / 2
+        return (1 + erf((x - self.mean) / (self.stddev * sqrt(2)))) / 2
+
+    def pdf_many(self, xs: Iterable[float]) -> array:
+        mean = self.mean
+        coefficient = 1.0 / (self.stddev * sqrt(2 * pi))
+        scale = -1.0 / (2 * self.stddev**2)
+        return array(
+            "d",
+            [coefficient * exp(scale * (x - mean) ** 2) for x in as_float_array(xs)],
+        )
+
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        mean = self.mean
+        scale = 1.0 / (self.stddev * sqrt(2))
+        return array(
+            "d", [(1 + erf((x - mean) * scale)) / 2 for x in as_float_array(xs)]
+        )
 
-    def __lt__(self, other):
+    def _prob_lt(self, other) -> float:
         if isinstance(other, Normal):
             combined_stddev = sqrt(self.stddev**2 + other.stddev**2)
             z = (self.mean - other.mean) / combined_stddev
             # Use the standard Normal CDF approximation with the Error function erf
             p = 0.5 * (1 + erf(z / sqrt(2)))
-            return Bernoulli(1 - p)
+            return 1 - p
         elif isinstance(other, (int, float)):
             z = (self.mean - other) / self.stddev
             # Use the standard Normal CDF approximation with the Error function erf
             p = 0.5 * (1 + erf(z / sqrt(2)))
-            return Bernoulli(1 - p)
+            return 1 - p
         return NotImplemented
 
+    @profiled
     def __add__(self, other):
         if isinstance(other, (int, float)):
-            return Normal(self.mean + other, self.stddev)
+            return Normal._trusted(self.mean + other, self.stddev)
         elif isinstance(other, Normal):
-            return Normal(
+            return Normal._trusted(
                 self.mean + other.mean, (self.stddev**2 + other.stddev**2) ** 0.5
             )
         return NotImplemented
 
+    @profiled
     def __sub__(self, other):
         if isinstance(other, (int, float)):
-            return Normal(self.mean - other, self.stddev)
+            return Normal._trusted(self.mean - other, self.stddev)
         elif isinstance(other, Normal):
-            return Normal(
+            return Normal._trusted(
                 self.mean - other.mean, (self.stddev**2 + other.stddev**2) ** 0.5
             )
         return NotImplemented
 
+    @profiled
     def __mul__(self, other):
         if isinstance(other, (int, float)):
-            return Normal(self.mean * other, abs(self.stddev * other))
+            return Normal._trusted(self.mean * other, abs(self.stddev * other))
         return NotImplemented
 
+    @profiled
     def __truediv__(self, other):
         if isinstance(other, (int, float)):
             if other == 0:
                 raise ZeroDivisionError("Cannot divide by zero")
-            return Normal(self.mean / other, self.stddev / abs(other))
+            return Normal._trusted(self.mean / other, self.stddev / abs(other))
         return NotImplemented
 
 
@@ -77,3 +229,33 @@ def normal_pdf(x, mean, variance):
     coefficient = 1.0 / sqrt(2 * pi * variance)
     exponent = -((x - mean) ** 2) / (2 * variance)
     return coefficient * exp(exponent)
+
+
+def standard_normal_quantile(q: float) -> float:
+    """
+    The quantile of the standard normal distribution at level q, by Wichura's
+    algorithm AS241, which is accurate to about 1e-16.
+    """
+    if q <= 0:
+        return -inf
+    if q >= 1:
+        return inf
+    centred = q - 0.5
+    if abs(centred) <= 0.425:
+        r = 0.180625 - centred * centred
+        return centred * _rational(_CENTRAL, r)
+    r = sqrt(-log(q if centred < 0 else 1 - q))
+    if r <= 5:
+        z = _rational(_INTERMEDIATE, r - 1.6)
+    else:
+        z = _rational(_FAR, r - 5)
+    return -z if centred < 0 else z
+
+
+def _rational(coefficients: tuple[tuple[float, ...], tuple[float, ...]], x: float):
+    numerator, denominator = coefficients
+    n = d = 0.0
+    for a, b in zip(reversed(numerator), reversed(denominator)):
+        n = n * x + a
+        d = d * x + b
+    return n / d
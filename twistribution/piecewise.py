@@ -0,0 +1,244 @@
+import random
+from array import array
+from bisect import bisect_right
+from math import fsum
+from typing import Any, Sequence
+
+from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
+from twistribution.distribution import (
+    ContinuousDistribution,
+    check_level,
+    uniform_source,
+)
+from twistribution.profiling import note_path, profiled
+from twistribution.uniform import Uniform
+
+_INVERSION_STEPS = 60
+"""Bisection steps that bound the error of the inverse cdf, at 2**-60 of a piece."""
+
+
+class PiecewisePolynomial(ContinuousDistribution):
+    """
+    A distribution whose density is a polynomial between consecutive breakpoints, and
+    zero outside the first and last breakpoints.
+
+    pieces[i] holds the coefficients of the density on [breakpoints[i],
+    breakpoints[i + 1]), lowest power first, as a polynomial in x - breakpoints[i].
+
+    Sums of Uniforms are represented exactly: adding a Uniform to a piecewise
+    polynomial gives another, one degree higher, so Uniform(0, 1) + Uniform(0, 1)
+    is the triangular distribution and further sums give the Irwin–Hall family. The
+    pdf and cdf find the piece by binary search and evaluate one polynomial.
+    """
+
+    __slots__ = ("breakpoints", "pieces", "_cumulative", "_integrals")
+
+    def __init__(
+        self,
+        breakpoints: Sequence[float],
+        pieces: Sequence[Sequence[float]],
+        equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE,
+    ):
+        super().__init__(equality_tolerance)
+        if len(breakpoints) < 2 or len(pieces) != len(breakpoints) - 1:
+            raise ValueError(
+                "There must be at least two breakpoints and one piece between each "
+                f"consecutive pair; got {len(breakpoints)} breakpoints and "
+                f"{len(pieces)} pieces"
+            )
+        if any(a >= b for a, b in zip(breakpoints, breakpoints[1:])):
+            raise ValueError("Breakpoints must be strictly increasing")
+
+        self.breakpoints = tuple(breakpoints)
+        self.pieces = tuple(tuple(piece) for piece in pieces)
+        self._integrals = tuple(_integral(piece) for piece in self.pieces)
+        masses = [
+            _evaluate(integral, b - a)
+            for integral, a, b in zip(self._integrals, breakpoints, breakpoints[1:])
+        ]
+        total = fsum(masses)
+        if not self.approximately_equal(total, 1):
+            raise ValueError(f"Density must integrate to 1; got {total}")
+        cumulative = array("d", [0.0])
+        for mass in masses:
+            cumulative.append(cumulative[-1] + mass)
+        self._cumulative = cumulative
+
+    @classmethod
+    def from_uniform(cls, uniform: Uniform) -> "PiecewisePolynomial":
+        return cls(
+            (uniform.a, uniform.b),
+            ((1 / (uniform.b - uniform.a),),),
+            uniform.equality_tolerance,
+        )
+
+    def parameters(self) -> tuple[Any, ...]:
+        return self.breakpoints, self.pieces
+
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        uniform = uniform_source(n, rng)
+        return array("d", [self._inverse_cdf(uniform()) for _ in range(n)])
+
+    def pdf(self, x: float) -> float:
+        breakpoints = self.breakpoints
+        if x < breakpoints[0] or x > breakpoints[-1]:
+            return 0
+        i = min(bisect_right(breakpoints, x) - 1, len(self.pieces) - 1)
+        return _evaluate(self.pieces[i], x - breakpoints[i])
+
+    def cdf(self, x: float) -> float:
+        breakpoints = self.breakpoints
+        if x <= breakpoints[0]:
+            return 0
+        if x >= breakpoints[-1]:
+            return 1
+        i = bisect_right(breakpoints, x) - 1
+        return min(
+            1.0,
+            self._cumulative[i] + _evaluate(self._integrals[i], x - breakpoints[i]),
+        )
+
+    def quantile(self, q: float) -> float:
+        check_level(q)
+        return self._inverse_cdf(q)
+
+    def _inverse_cdf(self, q: float) -> float:
+        """The x with cdf(x) = q, for q in [0, 1]."""
+        cumulative = self._cumulative
+        i = min(max(bisect_right(cumulative, q) - 1, 0), len(self.pieces) - 1)
+        integral = self._integrals[i]
+        target = q - cumulative[i]
+        low = 0.0
+        high = self.breakpoints[i + 1] - self.breakpoints[i]
+        for _ in range(_INVERSION_STEPS):
+            middle = (low + high) / 2
+            if _evaluate(integral, middle) < target:
+                low = middle
+            else:
+                high = middle
+        return self.breakpoints[i] + (low + high) / 2
+
+    def _prob_lt(self, other) -> float:
+        if isinstance(other, (int, float)):
+            return self.cdf(other)
+        elif isinstance(other, Uniform):
+            # P(X < Y) = P(X - Y < 0)
+            return self._add_uniform(-other.b, -other.a).cdf(0)
+        return NotImplemented
+
+    @profiled
+    def __add__(self, other):
+        if isinstance(other, (int, float)):
+            return PiecewisePolynomial(
+                [x + other for x in self.breakpoints],
+                self.pieces,
+                self.equality_tolerance,
+            )
+        elif isinstance(other, Uniform):
+            return self._add_uniform(other.a, other.b)
+        return NotImplemented
+
+    @profiled
+    def __sub__(self, other):
+        if isinstance(other, (int, float)):
+            return self + -other
+        elif isinstance(other, Uniform):
+            return self._add_uniform(-other.b, -other.a)
+        return NotImplemented
+
+    @profiled
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            if other == 0:
+                raise ValueError("Cannot scale a PiecewisePolynomial by zero")
+            scaled = self._reflect() if other < 0 else self
+            scale = abs(other)
+            return PiecewisePolynomial(
+                [x * scale for x in scaled.breakpoints],
+                [
+                    [c / scale ** (k + 1) for k, c in enumerate(piece)]
+                    for piece in scaled.pieces
+                ],
+                self.equality_tolerance,
+            )
+        return NotImplemented
+
+    @profiled
+    def __truediv__(self, other):
+        if isinstance(other, (int, float)):
+            if other == 0:
+                raise ZeroDivisionError("Cannot divide by zero")
+            return self * (1 / other)
+        return NotImplemented
+
+    def _reflect(self) -> "PiecewisePolynomial":
+        """The distribution of -X."""
+        breakpoints = self.breakpoints
+        pieces = []
+        for i in reversed(range(len(self.pieces))):
+            # p(u) for u = x - x_i becomes p(width - v) for v = -x - (-x_{i+1})
+            shifted = _shift(self.pieces[i], breakpoints[i + 1] - breakpoints[i])
+            pieces.append([c if k % 2 == 0 else -c for k, c in enumerate(shifted)])
+        return PiecewisePolynomial(
+            [-x for x in reversed(breakpoints)], pieces, self.equality_tolerance
+        )
+
+    def _add_uniform(self, a: float, b: float) -> "PiecewisePolynomial":
+        """
+        The distribution of X + U for U uniform on [a, b].
+
+        Its density at y is (F(y - a) - F(y - b)) / (b - a), where F is the cdf of X,
+        so each new piece is the difference of two cdf pieces, shifted.
+        """
+        note_path("convolve uniform")
+        breakpoints = sorted(
+            {x + a for x in self.breakpoints} | {x + b for x in self.breakpoints}
+        )
+        scale = 1 / (b - a)
+        pieces = []
+        for start, end in zip(breakpoints, breakpoints[1:]):
+            middle = (start + end) / 2
+            upper = self._cdf_piece(middle - a, start - a)
+            lower = self._cdf_piece(middle - b, start - b)
+            length = max(len(upper), len(lower))
+            upper += [0.0] * (length - len(upper))
+            lower += [0.0] * (length - len(lower))
+            pieces.append([(u - l) * scale for u, l in zip(upper, lower)])
+        return PiecewisePolynomial(breakpoints, pieces, self.equality_tolerance)
+
+    def _cdf_piece(self, x: float, origin: float) -> list[float]:
+        """
+        Coefficients of the cdf on the piece containing x, as a polynomial in
+        t - origin.
+        """
+        breakpoints = self.breakpoints
+        if x < breakpoints[0]:
+            return [0.0]
+        if x > breakpoints[-1]:
+            return [1.0]
+        i = bisect_right(breakpoints, x) - 1
+        coefficients = _shift(self._integrals[i], origin - breakpoints[i])
+        coefficients[0] += self._cumulative[i]
+        return coefficients
+
+
+def _evaluate(coefficients: Sequence[float], u: float) -> float:
+    result = 0.0
+    for c in reversed(coefficients):
+        result = result * u + c
+    return result
+
+
+def _integral(coefficients: Sequence[float]) -> list[float]:
+    """Coefficients of the integral from 0."""
+    return [0.0] + [c / (k + 1) for k, c in enumerate(coefficients)]
+
+
+def _shift(coefficients: Sequence[float], d: float) -> list[float]:
+    """Coefficients of p(u + d), given those of p(u) (a Taylor shift)."""
+    shifted = list(coefficients)
+    n = len(shifted)
+    for i in range(n - 1):
+        for j in range(n - 2, i - 1, -1):
+            shifted[j] += d * shifted[j + 1]
+    return shifted
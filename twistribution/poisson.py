@@ -1,13 +1,36 @@
 import math
-from typing import Any
+import random
+import sys
+import warnings
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable
 
-from twistribution.bernoulli import Bernoulli
+from twistribution.approximation import Moments, approximate_below
+from twistribution.cache import cached
 from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
 from twistribution.discrete import Discrete
-from twistribution.distribution import DiscreteDistribution
+from twistribution.distribution import (
+    DiscreteDistribution,
+    as_bernoulli,
+    as_float_array,
+    check_level,
+)
+from twistribution.profiling import note_path, profiled
+from twistribution.validation import full_validation_enabled
+
+_TABLE_HALF_WIDTH = 10
+"""Standard deviations either side of the mean covered by the cached cdf table."""
+
+_TAIL_PRECISION = 1e-17
+"""Relative size of the term at which tail sums outside the cdf table stop."""
+
+_LOG_SQRT_2_PI = 0.5 * math.log(2 * math.pi)
 
 
 class Poisson(DiscreteDistribution):
+    __slots__ = ("mean", "_table_start", "_cumulative", "_discrete")
+
     def __init__(
         self, mean: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
     ):
@@ -15,6 +38,27 @@ class Poisson(DiscreteDistribution):
         if mean <= 0:
             raise ValueError(f"Mean must be strictly positive; got {mean}")
         self.mean = mean
+        self._table_start = None
+        self._cumulative = None
+        self._discrete = {}
+
+    @classmethod
+    def _trusted(
+        cls, mean: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
+    ) -> "Poisson":
+        """
+        A Poisson built without validation, for results computed by operations. With
+        full validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(mean, equality_tolerance)
+        result = cls.__new__(cls)
+        result.equality_tolerance = equality_tolerance
+        result.mean = mean
+        result._table_start = None
+        result._cumulative = None
+        result._discrete = {}
+        return result
 
     def parameters(self) -> tuple[Any, ...]:
         return (self.mean,)
@@ -23,11 +67,32 @@ class Poisson(DiscreteDistribution):
     def variance(self) -> float:
         return self.mean
 
+    def _clt_moments(self) -> Moments:
+        # a sum of many Poissons with small means, whose third absolute central moments
+        # are close to their means
+        return Moments(self.mean, self.mean, self.mean, True)
+
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        """n independent draws, made from the cached to_discrete() materialisation."""
+        return self.to_discrete().sample(n, rng)
+
     def pmf(self, x: float | int) -> float:
         if not float(x).is_integer() or x < 0:
             return 0.0
-        k = int(x)
-        return self.mean**k * math.exp(-self.mean) / math.factorial(k)
+        return self._pmf(int(x))
+
+    def _pmf(self, k: int) -> float:
+        """
+        Probability of exactly k events, computed in log space so it never overflows.
+
+        Uses Loader's saddle point expansion rather than k * log(mean) - lgamma(k + 1),
+        which loses about ten digits to cancellation when k and the mean are large.
+        """
+        if k == 0:
+            return math.exp(-self.mean)
+        return math.exp(-_stirling_error(k) - _deviance(k, self.mean)) / math.sqrt(
+            2 * math.pi * k
+        )
 
     def cdf(self, x: float | int) -> float:
         if x < 0:
@@ -35,40 +100,356 @@ class Poisson(DiscreteDistribution):
         if math.isinf(x):
             return 1.0
         k = math.floor(x)
-        return sum(
-            self.mean**i * math.exp(-self.mean) / math.factorial(i)
-            for i in range(k + 1)
+        start, cumulative = self._cumulative_table()
+        if k < start:
+            return self._lower_tail(k)
+        if k < start + len(cumulative):
+            return cumulative[k - start]
+        return 1.0 - self._upper_tail(k)
+
+    def pmf_many(self, xs: Iterable[float]) -> array:
+        """Probability mass function at each of the values."""
+        return array(
+            "d",
+            [
+                self._pmf(int(x)) if x >= 0 and x.is_integer() else 0.0
+                for x in as_float_array(xs)
+            ],
         )
 
-    def to_discrete(self, min_probability: float = 1e-10) -> Discrete:
-        values = {}
-        k = 0
-        while True:
-            p = self.pmf(k)
-            if p < min_probability:
-                break
-            values[k] = p
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        """
+        Cumulative distribution function at each of the values.
+
+        Values within the cached table are looked up directly. The rest are visited in
+        sorted order, so each tail sum only extends the previous one by the pmf terms
+        in between.
+        """
+        xs = as_float_array(xs)
+        start, cumulative = self._cumulative_table()
+        end = start + len(cumulative)
+        result = array("d", bytes(8 * len(xs)))
+        lower = []
+        upper = []
+        for i, x in enumerate(xs):
+            if x < 0 or x != x:
+                continue
+            if x == math.inf:
+                result[i] = 1.0
+                continue
+            k = math.floor(x)
+            if k < start:
+                lower.append((k, i))
+            elif k < end:
+                result[i] = cumulative[k - start]
+            else:
+                upper.append((k, i))
+
+        # P(X <= k), ascending from the smallest k
+        lower.sort()
+        previous = None
+        for k, i in lower:
+            if previous is None:
+                total = self._lower_tail(k)
+            elif k > previous:
+                total += self._sum_pmf(previous + 1, k)
+            result[i] = total
+            previous = k
+
+        # P(X > k), descending from the largest k
+        upper.sort(reverse=True)
+        previous = None
+        for k, i in upper:
+            if previous is None:
+                total = self._upper_tail(k)
+            elif k < previous:
+                total += self._sum_pmf(k + 1, previous)
+            result[i] = 1.0 - total
+            previous = k
+        return result
+
+    def quantile(self, q: float) -> float | int:
+        """
+        The smallest k with cdf(k) >= q, by binary search of the cached cdf table,
+        or of the lower tail sums for the rare levels below it.
+        """
+        check_level(q)
+        if q == 0:
+            return 0
+        if q == 1:
+            return math.inf
+        start, cumulative = self._cumulative_table()
+        if q > cumulative[-1]:
+            k = start + len(cumulative)
+            while self.cdf(k) < q:
+                k += 1
+            return k
+        index = bisect_left(cumulative, q)
+        if index == 0:
+            return _search_lower_tail(self._lower_tail, q, start)
+        return start + index
+
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        # X < t exactly when X <= ceil(t) - 1
+        return self.cdf_many(
+            [
+                math.ceil(t) - 1 if math.isfinite(t) else t
+                for t in as_float_array(thresholds)
+            ]
+        )
+
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        return self.cdf_many(thresholds)
+
+    def _sum_pmf(self, first: int, last: int) -> float:
+        """
+        P(first <= X <= last) for a range within one tail, using the pmf recurrence
+        away from the mean until the terms underflow.
+        """
+        if last <= self.mean:
+            p = total = self._pmf(last)
+            for k in range(last, first, -1):
+                p *= k / self.mean
+                if p == 0.0:
+                    break
+                total += p
+        else:
+            p = total = self._pmf(first)
+            for k in range(first + 1, last + 1):
+                p *= self.mean / k
+                if p == 0.0:
+                    break
+                total += p
+        return total
+
+    def _cumulative_table(self) -> tuple[int, array]:
+        """
+        The first value covered and the cdf values for a window around the mean.
+
+        The window spans _TABLE_HALF_WIDTH standard deviations either side of the mean
+        and is built once per instance from the pmf recurrence, working outwards from
+        the mode so that no intermediate value underflows.
+        """
+        if self._cumulative is None:
+            half_width = _TABLE_HALF_WIDTH * math.sqrt(self.mean)
+            start = max(0, math.floor(self.mean - half_width))
+            end = math.ceil(self.mean + half_width)
+            mode = math.floor(self.mean)
+
+            probabilities = [0.0] * (end - start + 1)
+            p = probabilities[mode - start] = self._pmf(mode)
+            for k in range(mode, start, -1):
+                p *= k / self.mean
+                probabilities[k - 1 - start] = p
+            p = probabilities[mode - start]
+            for k in range(mode + 1, end + 1):
+                p *= self.mean / k
+                probabilities[k - start] = p
+
+            total = self._lower_tail(start - 1) if start > 0 else 0.0
+            cumulative = array("d")
+            for p in probabilities:
+                total += p
+                cumulative.append(min(total, 1.0))
+
+            self._table_start = start
+            self._cumulative = cumulative
+        return self._table_start, self._cumulative
+
+    def _lower_tail(self, k: int) -> float:
+        """
+        P(X <= k) for k below the mean, summing pmf terms downwards from k. The sum
+        stops at subnormal terms, where rounding can keep the ratio recurrence from
+        shrinking them for hundreds of thousands of steps.
+        """
+        if k < 0:
+            return 0.0
+        term = total = self._pmf(k)
+        while k > 0 and term > max(total * _TAIL_PRECISION, sys.float_info.min):
+            term *= k / self.mean
+            total += term
+            k -= 1
+        return total
+
+    def _upper_tail(self, k: int) -> float:
+        """P(X > k) for k above the mean, summing pmf terms upwards from k + 1."""
+        k += 1
+        term = total = self._pmf(k)
+        while term > total * _TAIL_PRECISION:
             k += 1
-        return Discrete(values)
+            term *= self.mean / k
+            total += term
+        return total
+
+    def to_discrete(
+        self, tail_mass: float = 1e-10, *, min_probability: float | None = None
+    ) -> Discrete:
+        """
+        A Discrete approximation that leaves out at most tail_mass from each tail.
+
+        The support grows outwards from the mode and the retained probabilities are
+        rescaled to sum to 1. Results are cached per tail_mass.
+
+        min_probability is a deprecated alias for tail_mass. It used to be the
+        smallest pmf value kept, and is now taken as the tail mass.
+        """
+        if min_probability is not None:
+            warnings.warn(
+                "to_discrete(min_probability=...) is deprecated; use tail_mass, the "
+                "most probability to leave out of each tail",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            tail_mass = min_probability
+        return self._to_discrete(tail_mass)
+
+    @profiled
+    def _to_discrete(self, tail_mass: float) -> Discrete:
+        if tail_mass not in self._discrete:
+            start, cumulative = self._cumulative_table()
+
+            # largest k with P(X < k) <= tail_mass
+            if cumulative[0] > tail_mass:
+                low = start
+                while low > 0 and self.cdf(low - 1) > tail_mass:
+                    low -= 1
+            else:
+                low = start + bisect_right(cumulative, tail_mass)
+
+            # smallest k with P(X > k) <= tail_mass
+            if cumulative[-1] < 1 - tail_mass:
+                high = start + len(cumulative) - 1
+                while self._upper_tail(high) > tail_mass:
+                    high += 1
+            else:
+                high = start + bisect_left(cumulative, 1 - tail_mass)
+
+            probabilities = [self._pmf(k) for k in range(low, high + 1)]
+            total = sum(probabilities)
+            self._discrete[tail_mass] = Discrete._trusted(
+                array("q", range(low, high + 1)),
+                array("d", [p / total for p in probabilities]),
+            )
+        return self._discrete[tail_mass]
+
+    def _probability_below_other(self, other: "Poisson", inclusive: bool) -> float:
+        """
+        P(X < Y), or P(X <= Y) if inclusive, where X is self and Y is other.
+
+        This is the cdf of the Skellam distribution of X - Y, computed as the sum over y
+        of P(Y = y) P(X <= y - shift). Only the window where P(X <= y - shift) is
+        strictly between 0 and 1 is summed term by term, using the cached cdf table.
+        Above that window the rest of the sum is just P(Y >= y), and below it the
+        terms are negligible.
+        """
+        note_path("skellam")
+        shift = 0 if inclusive else 1
+        start, cumulative = self._cumulative_table()
+        other_start, _ = other._cumulative_table()
+
+        # y for which y - shift is past the end of this table
+        beyond = start + len(cumulative) + shift
+        total = 1.0 - other.cdf(beyond - 1)
+
+        first = max(start + shift, other_start)
+        p = other._pmf(first)
+        for y in range(first, beyond):
+            if p == 0.0 and y > other.mean:
+                break
+            total += p * cumulative[y - shift - start]
+            p *= other.mean / (y + 1)
+        return min(total, 1.0)
 
+    @profiled
+    @cached
     def __lt__(self, other):
+        return as_bernoulli(self._prob_lt(other))
+
+    @profiled
+    @cached
+    def __le__(self, other):
+        return as_bernoulli(self._prob_le(other))
+
+    def _prob_lt(self, other) -> float:
+        if isinstance(other, (Poisson, float, int)):
+            approximate = approximate_below(self, other, inclusive=False)
+            if approximate is not None:
+                return approximate
         if isinstance(other, Poisson):
-            return self.to_discrete() < other.to_discrete()
+            return self._probability_below_other(other, inclusive=False)
         if isinstance(other, (float, int)):
-            return Bernoulli(self.cdf(other) - self.pmf(other))
+            return self.cdf(other) - self.pmf(other)
         return NotImplemented
 
-    def __le__(self, other):
+    def _prob_le(self, other) -> float:
+        if isinstance(other, (Poisson, float, int)):
+            approximate = approximate_below(self, other, inclusive=True)
+            if approximate is not None:
+                return approximate
         if isinstance(other, Poisson):
-            return self.to_discrete() <= other.to_discrete()
+            return self._probability_below_other(other, inclusive=True)
         if isinstance(other, (float, int)):
-            return Bernoulli(self.cdf(other))
+            return self.cdf(other)
         return NotImplemented
 
+    @profiled
     def __add__(self, other):
         if isinstance(other, Poisson):
-            return Poisson(self.mean + other.mean)
+            return Poisson._trusted(self.mean + other.mean)
+        elif isinstance(other, (float, int, Discrete)):
+            return self.to_discrete() + other
         return NotImplemented
 
+    @profiled
+    def sum_iid(self, n: int) -> "Poisson":
+        """Distribution of the sum of n independent copies of this distribution."""
+        if n < 1:
+            raise ValueError(f"Number of copies must be at least 1; got {n}")
+        return Poisson._trusted(self.mean * n)
+
     def __radd__(self, other):
         return self.__add__(other)
+
+
+def _search_lower_tail(lower_tail: Callable[[int], float], q: float, high: int) -> int:
+    """
+    The smallest k in [0, high] with lower_tail(k) >= q, for a level q > 0 that
+    lower_tail(high) reaches, by binary search rather than stepping down one value
+    and one tail sum at a time.
+    """
+    low = -1
+    while high - low > 1:
+        middle = (low + high) // 2
+        if lower_tail(middle) >= q:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def _stirling_error(n: int) -> float:
+    """log(n!) minus its Stirling approximation, log(sqrt(2 pi n) (n / e)^n)."""
+    if n <= 15:
+        return math.lgamma(n + 1) - (n + 0.5) * math.log(n) + n - _LOG_SQRT_2_PI
+    # a float, so that huge n gives 0 correction terms rather than OverflowError
+    nn = float(n) * n
+    return (
+        1 / 12 - (1 / 360 - (1 / 1260 - (1 / 1680 - 1 / (1188 * nn)) / nn) / nn) / nn
+    ) / n
+
+
+def _deviance(x: float, mean: float) -> float:
+    """x log(x / mean) + mean - x, accurate even when x is close to the mean."""
+    if abs(x - mean) < 0.1 * (x + mean):
+        v = (x - mean) / (x + mean)
+        total = (x - mean) * v
+        term = 2 * x * v
+        j = 1
+        while True:
+            term *= v * v
+            updated = total + term / (2 * j + 1)
+            if updated == total:
+                return total
+            total = updated
+            j += 1
+    return x * math.log(x / mean) + mean - x
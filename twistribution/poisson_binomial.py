@@ -0,0 +1,260 @@
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from math import ceil, floor, fsum, isfinite
+from typing import Any, Iterable
+
+from twistribution.approximation import Moments, approximate_below
+from twistribution.bernoulli import Bernoulli
+from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
+from twistribution.convolution import convolve
+from twistribution.discrete import Discrete
+from twistribution.distribution import (
+    DiscreteDistribution,
+    as_float_array,
+    check_level,
+    uniform_source,
+)
+from twistribution.profiling import note_path, profiled
+from twistribution.validation import full_validation_enabled
+
+_DIRECT_PRODUCT_LENGTH = 48
+"""Longest pair of pmfs multiplied term by term, rather than by convolution."""
+
+
+class PoissonBinomial(DiscreteDistribution):
+    """
+    The number of successes among independent events with their own probabilities.
+
+    The mean and variance are summed when the distribution is built. The pmf is only
+    computed when first needed, by multiplying the events' generating polynomials in
+    a balanced tree: short products term by term and long ones by fast convolution,
+    so n events take O(n log^2 n) time. The cdf and comparisons then bisect a table of
+    running totals.
+    """
+
+    __slots__ = (
+        "probabilities",
+        "_mean",
+        "_variance",
+        "_third_moment",
+        "_pmf",
+        "_cumulative",
+    )
+
+    def __init__(
+        self,
+        events: Iterable[Bernoulli | float],
+        equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE,
+    ):
+        super().__init__(equality_tolerance)
+        probabilities = array("d")
+        for event in events:
+            p = event.p if isinstance(event, Bernoulli) else event
+            if p < 0:
+                if p < -equality_tolerance:
+                    raise ValueError(
+                        f"Probabilities must be in the range [0, 1]; got {p}"
+                    )
+                p = 0.0
+            elif p > 1:
+                if p > 1 + equality_tolerance:
+                    raise ValueError(
+                        f"Probabilities must be in the range [0, 1]; got {p}"
+                    )
+                p = 1.0
+            probabilities.append(p)
+        if not probabilities:
+            raise ValueError("There must be at least one event")
+        self._set(probabilities)
+
+    @classmethod
+    def _trusted(
+        cls,
+        probabilities: array,
+        equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE,
+    ) -> "PoissonBinomial":
+        """
+        A PoissonBinomial built without validation, for results computed by
+        operations. With full validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(probabilities, equality_tolerance)
+        result = cls.__new__(cls)
+        result.equality_tolerance = equality_tolerance
+        result._set(probabilities)
+        return result
+
+    def _set(self, probabilities: array):
+        self.probabilities = probabilities
+        self._mean = fsum(probabilities)
+        self._variance = fsum(p * (1 - p) for p in probabilities)
+        # each event's third absolute central moment is p q (p^2 + q^2)
+        self._third_moment = fsum(
+            p * (1 - p) * (p * p + (1 - p) * (1 - p)) for p in probabilities
+        )
+        self._pmf = None
+        self._cumulative = None
+
+    def parameters(self) -> tuple[Any, ...]:
+        # the order of the events makes no difference to the distribution
+        return (tuple(sorted(self.probabilities)),)
+
+    def mean(self) -> float:
+        return self._mean
+
+    def variance(self) -> float:
+        return self._variance
+
+    def _clt_moments(self) -> Moments:
+        return Moments(self._mean, self._variance, self._third_moment, True)
+
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        """n independent draws, by inverting the cached cdf table."""
+        uniform = uniform_source(n, rng)
+        cumulative = self._cumulative_probabilities()
+        last = len(cumulative) - 1
+        return array(
+            "d", [min(bisect_right(cumulative, uniform()), last) for _ in range(n)]
+        )
+
+    def pmf(self, x: float | int) -> float:
+        pmf = self._pmf_table()
+        if not float(x).is_integer() or not 0 <= x < len(pmf):
+            return 0.0
+        return pmf[int(x)]
+
+    def cdf(self, x: float | int) -> float:
+        if x < 0:
+            return 0.0
+        cumulative = self._cumulative_probabilities()
+        if x >= len(cumulative) - 1:
+            return 1.0
+        return cumulative[floor(x)]
+
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        return array("d", map(self.cdf, as_float_array(xs)))
+
+    def quantile(self, q: float) -> int:
+        """The smallest k with cdf(k) >= q, by binary search of the running totals."""
+        check_level(q)
+        cumulative = self._cumulative_probabilities()
+        return min(bisect_left(cumulative, q), len(cumulative) - 1)
+
+    def prob_lt_many(self, thresholds: Iterable[float]) -> array:
+        # X < t exactly when X <= ceil(t) - 1
+        return self.cdf_many(
+            [ceil(t) - 1 if isfinite(t) else t for t in as_float_array(thresholds)]
+        )
+
+    def prob_le_many(self, thresholds: Iterable[float]) -> array:
+        return self.cdf_many(thresholds)
+
+    def _pmf_table(self) -> array:
+        """P(X = k) for k from 0 to the number of events, computed once."""
+        if self._pmf is None:
+            note_path("product tree")
+            pmfs = [[1 - p, p] for p in self.probabilities]
+            while len(pmfs) > 1:
+                products = [_multiply(a, b) for a, b in zip(pmfs[::2], pmfs[1::2])]
+                if len(pmfs) % 2:
+                    products.append(pmfs[-1])
+                pmfs = products
+            self._pmf = array("d", pmfs[0])
+        return self._pmf
+
+    def _cumulative_probabilities(self) -> array:
+        """Running totals of the pmf, capped at 1."""
+        if self._cumulative is None:
+            self._cumulative = array(
+                "d", [min(c, 1.0) for c in accumulate(self._pmf_table())]
+            )
+        return self._cumulative
+
+    @profiled
+    def to_discrete(self) -> Discrete:
+        """The same distribution as a Discrete, without the impossible counts."""
+        pmf = self._pmf_table()
+        low = 0
+        high = len(pmf) - 1
+        while pmf[low] == 0:
+            low += 1
+        while pmf[high] == 0:
+            high -= 1
+        return Discrete._trusted(array("q", range(low, high + 1)), pmf[low : high + 1])
+
+    def _probability_below_other(
+        self, other: "PoissonBinomial", inclusive: bool
+    ) -> float:
+        """
+        P(X < Y), or P(X <= Y) if inclusive, where X is self and Y is other: the sum
+        over y of P(Y = y) P(X <= y - shift), read from the cdf table.
+        """
+        note_path("merge")
+        shift = 0 if inclusive else 1
+        cumulative = self._cumulative_probabilities()
+        last = len(cumulative) - 1
+        total = 0.0
+        for y, p in enumerate(other._pmf_table()):
+            k = y - shift
+            if k >= last:
+                total += fsum(other._pmf_table()[y:])
+                break
+            if k >= 0:
+                total += p * cumulative[k]
+        return min(total, 1.0)
+
+    def _prob_lt(self, other) -> float:
+        if isinstance(other, (PoissonBinomial, float, int)):
+            approximate = approximate_below(self, other, inclusive=False)
+            if approximate is not None:
+                return approximate
+        if isinstance(other, (float, int)):
+            return self.cdf(ceil(other) - 1) if isfinite(other) else self.cdf(other)
+        elif isinstance(other, PoissonBinomial):
+            return self._probability_below_other(other, inclusive=False)
+        elif isinstance(other, Discrete):
+            return self.to_discrete()._prob_lt(other)
+        return NotImplemented
+
+    def _prob_le(self, other) -> float:
+        if isinstance(other, (PoissonBinomial, float, int)):
+            approximate = approximate_below(self, other, inclusive=True)
+            if approximate is not None:
+                return approximate
+        if isinstance(other, (float, int)):
+            return self.cdf(other)
+        elif isinstance(other, PoissonBinomial):
+            return self._probability_below_other(other, inclusive=True)
+        elif isinstance(other, Discrete):
+            return self.to_discrete()._prob_le(other)
+        return NotImplemented
+
+    @profiled
+    def __add__(self, other):
+        if isinstance(other, PoissonBinomial):
+            return PoissonBinomial._trusted(
+                self.probabilities + other.probabilities, self.equality_tolerance
+            )
+        elif isinstance(other, Bernoulli):
+            return PoissonBinomial._trusted(
+                self.probabilities + array("d", [min(max(other.p, 0.0), 1.0)]),
+                self.equality_tolerance,
+            )
+        elif isinstance(other, (float, int, Discrete)):
+            return self.to_discrete() + other
+        return NotImplemented
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+def _multiply(a: list[float], b: list[float]) -> list[float]:
+    """Coefficients of the product of two polynomials, lowest power first."""
+    if len(a) + len(b) > 2 * _DIRECT_PRODUCT_LENGTH:
+        return convolve(a, b)
+    result = [0.0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        result[i : i + len(b)] = [r + x * y for r, y in zip(result[i:], b)]
+    return result
@@ -0,0 +1,149 @@
+import json
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+
+class OperationStats:
+    """What was recorded about calls of one operation on one combination of types."""
+
+    __slots__ = ("calls", "seconds", "input_sizes", "output_sizes", "paths")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.input_sizes = Counter()
+        self.output_sizes = Counter()
+        self.paths = Counter()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "input_sizes": _sorted_histogram(self.input_sizes),
+            "output_sizes": _sorted_histogram(self.output_sizes),
+            "paths": dict(self.paths),
+        }
+
+
+class Recording:
+    """
+    Statistics for every profiled operation called while recording.
+
+    Operations are keyed by the operation's name and the types of its operands. Times
+    are wall times and include any nested operations. Support sizes are collected in
+    power-of-two buckets, so 1000 is counted under 512, and operands without a finite
+    support, such as Normal or numbers, aren't counted.
+    """
+
+    def __init__(self):
+        self.operations: dict[tuple[str, ...], OperationStats] = {}
+        self._paths = []
+
+    def _call(self, name: str, operation: Callable, args: tuple, kwargs: dict) -> Any:
+        key = (name, *(type(arg).__name__ for arg in args))
+        stats = self.operations.get(key)
+        if stats is None:
+            stats = self.operations[key] = OperationStats()
+        paths = []
+        self._paths.append(paths)
+        start = perf_counter()
+        try:
+            result = operation(*args, **kwargs)
+        finally:
+            stats.seconds += perf_counter() - start
+            stats.calls += 1
+            stats.paths.update(paths)
+            self._paths.pop()
+        for arg in args:
+            size = _support_size(arg)
+            if size is not None:
+                stats.input_sizes[_bucket(size)] += 1
+        size = _support_size(result)
+        if size is not None:
+            stats.output_sizes[_bucket(size)] += 1
+        return result
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            " ".join(key): stats.as_dict()
+            for key, stats in sorted(
+                self.operations.items(), key=lambda item: -item[1].seconds
+            )
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def table(self) -> str:
+        """The operations as a plain text table, slowest first."""
+        rows = [("operation", "calls", "seconds", "max in", "max out", "paths")]
+        for key, stats in sorted(
+            self.operations.items(), key=lambda item: -item[1].seconds
+        ):
+            rows.append(
+                (
+                    " ".join(key),
+                    str(stats.calls),
+                    f"{stats.seconds:.6f}",
+                    str(max(stats.input_sizes, default="")),
+                    str(max(stats.output_sizes, default="")),
+                    ", ".join(f"{path}={n}" for path, n in stats.paths.most_common()),
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+            for row in rows
+        )
+
+
+_recording = None
+
+
+@contextmanager
+def record() -> Iterator[Recording]:
+    """Record profiled operations within the context, in a new Recording."""
+    global _recording
+    previous = _recording
+    _recording = Recording()
+    try:
+        yield _recording
+    finally:
+        _recording = previous
+
+
+def profiled(operation: Callable) -> Callable:
+    """Record calls of a distribution method while recording is on."""
+    name = operation.__qualname__
+
+    @wraps(operation)
+    def wrapper(*args, **kwargs):
+        recording = _recording
+        if recording is None:
+            return operation(*args, **kwargs)
+        return recording._call(name, operation, args, kwargs)
+
+    return wrapper
+
+
+def note_path(path: str):
+    """Record that the innermost profiled operation took the named code path."""
+    recording = _recording
+    if recording is not None and recording._paths:
+        recording._paths[-1].append(path)
+
+
+def _support_size(value: Any) -> int | None:
+    support = getattr(value, "_support", None)
+    return None if support is None else len(support)
+
+
+def _bucket(size: int) -> int:
+    return 1 << (size.bit_length() - 1) if size else 0
+
+
+def _sorted_histogram(histogram: Counter) -> dict[int, int]:
+    return dict(sorted(histogram.items()))
@@ -1,11 +1,21 @@
-from typing import Any
+import random
+from array import array
+from typing import Any, Iterable
 
-from twistribution.bernoulli import Bernoulli
 from twistribution.constants import DEFAULT_EQUALITY_TOLERANCE
-from twistribution.distribution import ContinuousDistribution
+from twistribution.distribution import (
+    ContinuousDistribution,
+    as_float_array,
+    check_level,
+    uniform_source,
+)
+from twistribution.profiling import profiled
+from twistribution.validation import full_validation_enabled
 
 
 class Uniform(ContinuousDistribution):
+    __slots__ = ("a", "b")
+
     def __init__(
         self, a: float, b: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
     ):
@@ -16,9 +26,45 @@ class Uniform(ContinuousDistribution):
         self.a = a
         self.b = b
 
+    @classmethod
+    def _trusted(
+        cls, a: float, b: float, equality_tolerance: float = DEFAULT_EQUALITY_TOLERANCE
+    ) -> "Uniform":
+        """
+        A Uniform built without validation, for results computed by operations. With
+        full validation on, the public constructor is used instead.
+        """
+        if full_validation_enabled():
+            return cls(a, b, equality_tolerance)
+        result = cls.__new__(cls)
+        result.equality_tolerance = equality_tolerance
+        result._discrete = None
+        result.a = a
+        result.b = b
+        return result
+
     def parameters(self) -> tuple[Any, ...]:
         return self.a, self.b
 
+    def sample(self, n: int, rng: random.Random | None = None) -> array:
+        uniform = uniform_source(n, rng)
+        a = self.a
+        width = self.b - self.a
+        return array("d", [a + width * uniform() for _ in range(n)])
+
+    def quantile(self, q: float) -> float:
+        check_level(q)
+        return self.a + q * (self.b - self.a)
+
+    def quantile_many(self, qs: Iterable[float]) -> array:
+        a = self.a
+        width = self.b - self.a
+        result = array("d")
+        for q in as_float_array(qs):
+            check_level(q)
+            result.append(a + q * width)
+        return result
+
     def pdf(self, x: float) -> float:
         if x < self.a or x > self.b:
             return 0
@@ -31,6 +77,24 @@ class Uniform(ContinuousDistribution):
             return 1
         return (x - self.a) / (self.b - self.a)
 
+    def pdf_many(self, xs: Iterable[float]) -> array:
+        a, b = self.a, self.b
+        density = 1 / (b - a)
+        return array(
+            "d", [0.0 if x < a or x > b else density for x in as_float_array(xs)]
+        )
+
+    def cdf_many(self, xs: Iterable[float]) -> array:
+        a, b = self.a, self.b
+        scale = 1 / (b - a)
+        return array(
+            "d",
+            [
+                0.0 if x < a else 1.0 if x > b else (x - a) * scale
+                for x in as_float_array(xs)
+            ],
+        )
+
     def _prob_first_less_than_second(self, a1, b1, a2, b2):
         """Calculate P(X < Y) where X ~ U(a1,b1) and Y ~ U(a2,b2), assuming a1 <= a2.
 
@@ -51,9 +115,9 @@ class Uniform(ContinuousDistribution):
 
         return area / (b1 - a1)
 
-    def __lt__(self, other):
+    def _prob_lt(self, other) -> float:
         if isinstance(other, (int, float)):
-            return Bernoulli(self.cdf(other))
+            return self.cdf(other)
         elif isinstance(other, Uniform):
             a1, b1 = self.a, self.b
             a2, b2 = other.a, other.b
@@ -63,15 +127,26 @@ class Uniform(ContinuousDistribution):
             else:
                 prob = 1.0 - self._prob_first_less_than_second(a2, b2, a1, b1)
 
-            return Bernoulli(prob)
+            return prob
         return NotImplemented
 
+    @profiled
     def __add__(self, other):
         if isinstance(other, (int, float)):
-            return Uniform(self.a + other, self.b + other)
+            return Uniform._trusted(self.a + other, self.b + other)
+        elif isinstance(other, Uniform):
+            # avoid cyclic dependency by importing here
+            from twistribution.piecewise import PiecewisePolynomial
+
+            return PiecewisePolynomial.from_uniform(self) + other
         return NotImplemented
 
+    @profiled
     def __mul__(self, other):
         if isinstance(other, (int, float)):
-            return Uniform(self.a * other, self.b * other)
+            if other > 0:
+                return Uniform._trusted(self.a * other, self.b * other)
+            if other < 0:
+                return Uniform._trusted(self.b * other, self.a * other)
+            raise ValueError("Cannot scale a Uniform by zero")
         return NotImplemented
@@ -0,0 +1,34 @@
+"""
+Control over how thoroughly the results of operations are checked.
+
+Operators build their results with trusted internal constructors, which skip the checks
+made by the public constructors, because the results are valid by construction. With
+full validation on, results go through the public constructors instead. That is slower
+but catches bugs, so it's meant for testing.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+_full_validation = False
+
+
+def set_full_validation(enabled: bool):
+    """Validate the results of all operations, or stop with False."""
+    global _full_validation
+    _full_validation = enabled
+
+
+def full_validation_enabled() -> bool:
+    return _full_validation
+
+
+@contextmanager
+def full_validation() -> Iterator[None]:
+    """Validate the results of all operations within the context."""
+    previous = _full_validation
+    set_full_validation(True)
+    try:
+        yield
+    finally:
+        set_full_validation(previous)